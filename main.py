@@ -1,25 +1,71 @@
 from pydantic import Field
-from reportlab.platypus import SimpleDocTemplate
-from reportlab.platypus.tables import Table
-from reportlab.lib.pagesizes import letter
 from specklepy.objects import Base
+from specklepy.transports.server import ServerTransport
 from speckle_automate import (
     AutomateBase,
     AutomationContext,
     execute_automate_function,
 )
 
-from typing import Dict, Generator, Any, Iterable
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from src.domain.carbon.databases.enums import (
     SteelDatabase,
     TimberDatabase,
     ConcreteDatabase,
 )
+from src.domain.types import BuildingElement, CarbonResult
 from src.infrastructure.logging import Logging
+from src.infrastructure.speckle_objects import fetch_single_object
+from src.services.calculation_plan import CalculationPlan
 from src.services.carbon_calculator import CarbonCalculator
+from src.services.carbon_rollup import CarbonRollup
 from src.services.element_processor import ElementProcessor
+from src.services.embodied_carbon_schema import (
+    EMBODIED_CARBON_PROPERTY,
+    CompactSchema,
+    EmbodiedCarbonSchema,
+    VerboseSchema,
+)
+from src.services.incremental_index import (
+    IncrementalIndex,
+    RunRecordBuilder,
+    settings_key,
+)
 from src.services.material_processor import MaterialProcessor
+from src.services.model_traversal import ModelTraversal
+from src.services.overlay_output import OutputMode, OverlayBuilder
+from src.services.parallel_analysis import (
+    DEFAULT_PARALLEL_THRESHOLD,
+    ParallelElementAnalysis,
+)
+from src.services.pdf_report import (
+    DEFAULT_REPORT_ROW_LIMIT,
+    rollup_sections,
+    summary_rows,
+    write_pdf_report,
+)
+from src.services.result_attachments import AttachmentDispatcher
+from src.services.result_consumers import (
+    AttachmentPayloadBuilder,
+    PdfRowBuilder,
+    ResultConsumer,
+    SummaryCounter,
+    result_bucket,
+)
+from src.services.results_artifact import ResultsArtifactWriter, ResultsFormat
 
 
 def create_one_of_enum(enum_cls):
@@ -127,6 +173,99 @@ class FunctionInputs(AutomateBase):
         title="Topping Slab Reinforcement (kg/m³)",
     )
 
+    parallel_workers: int = Field(
+        default=1,
+        ge=1,
+        title="Parallel Workers",
+        description="Number of processes used to analyze large models (1 disables "
+        "parallel analysis)",
+    )
+
+    report_row_limit: int = Field(
+        default=DEFAULT_REPORT_ROW_LIMIT,
+        ge=0,
+        title="Report Row Limit",
+        description="Maximum element/material rows in the PDF report (0 writes a "
+        "summary-only report)",
+    )
+
+    results_format: str = Field(
+        default=ResultsFormat.JSONL.value,
+        title="Results Format",
+        description="Format of the per-material results file stored next to the "
+        "report (Parquet needs pyarrow and falls back to CSV without it)",
+        json_schema_extra={"oneOf": create_one_of_enum(ResultsFormat)},
+    )
+
+    output_mode: str = Field(
+        default=OutputMode.FullModel.value,
+        title="Output Mode",
+        description="Upload the full model with the carbon data attached, or a "
+        "results overlay holding only the carbon data of each element",
+        json_schema_extra={
+            "oneOf": [
+                {"const": OutputMode.FullModel.value, "title": "Full Model"},
+                {
+                    "const": OutputMode.ResultsOverlay.value,
+                    "title": "Results Overlay",
+                },
+            ]
+        },
+    )
+
+    concrete_strength_interpolation: bool = Field(
+        default=False,
+        title="Interpolate Concrete Strengths",
+        description="Interpolate concrete emission factors between the strength "
+        "categories of the database instead of using the nearest category",
+    )
+
+    compact_properties: bool = Field(
+        default=False,
+        title="Compact Properties",
+        description="Attach carbon data as flat per-material fields referencing "
+        "shared factor definitions, for smaller uploaded versions",
+    )
+
+    stage_timings: bool = Field(
+        default=False,
+        title="Stage Timings",
+        description="Log the time spent in each stage of the run and store it "
+        "as timings.json",
+    )
+
+    buffered_logging: bool = Field(
+        default=False,
+        title="Buffered Logging",
+        description="Log a count and a sample of each kind of element warning "
+        "and error at the end of the run instead of a line per element, for "
+        "large models",
+    )
+
+    background_log_writer: bool = Field(
+        default=False,
+        title="Background Log Writer",
+        description="Write log lines from a background thread so the analysis "
+        "doesn't wait on log output, dropping lines if it falls far behind",
+    )
+
+    incremental: bool = Field(
+        default=False,
+        title="Incremental Analysis",
+        description="Reuse the results of elements unchanged since the previous "
+        "embodied carbon version, and record the results of this run on the "
+        "new version for the next one",
+    )
+
+
+# Number of elements whose carbon is calculated in one batch
+DEFAULT_BATCH_SIZE = 1024
+
+NEXT_GEN_REQUIRED_MESSAGE = (
+    "Revit model must be sent using the v3 connector (or adapt the "
+    "automation for v2)."
+)
+
 
 class RevitCarbonAnalyzer:
     """Main application for analyzing carbon in Revit models."""
@@ -137,6 +276,8 @@ class RevitCarbonAnalyzer:
         element_processor: ElementProcessor,
         carbon_calculator: CarbonCalculator,
         logger: Logging,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        embodied_carbon_schema: Optional[EmbodiedCarbonSchema] = None,
     ):
         """
         Initialize with injected dependencies.
@@ -146,14 +287,83 @@ class RevitCarbonAnalyzer:
             element_processor: Service for processing Revit elements
             carbon_calculator: Service for calculating carbon emissions
             logger: Logging service
+            batch_size: Number of elements whose carbon is calculated together
+                by the batch engine (1 calculates element by element)
+            embodied_carbon_schema: Layout of the carbon data attached to
+                elements, verbose by default
         """
         self.material_processor = material_processor
         self.element_processor = element_processor
         self.carbon_calculator = carbon_calculator
         self.logger = logger
+        self.batch_size = batch_size
+        self.embodied_carbon_schema = embodied_carbon_schema or VerboseSchema()
+
+    @classmethod
+    def from_settings(
+        cls,
+        calculator_settings: Dict,
+        embodied_carbon_schema: Optional[EmbodiedCarbonSchema] = None,
+        buffered_logging: bool = False,
+        background_log_writer: bool = False,
+    ) -> "RevitCarbonAnalyzer":
+        """Create an analyzer and its dependencies from calculator settings."""
+        return cls.from_plan(
+            CalculationPlan.compile(**calculator_settings),
+            embodied_carbon_schema=embodied_carbon_schema,
+            buffered_logging=buffered_logging,
+            background_log_writer=background_log_writer,
+        )
+
+    @classmethod
+    def from_plan(
+        cls,
+        plan: CalculationPlan,
+        embodied_carbon_schema: Optional[EmbodiedCarbonSchema] = None,
+        buffered_logging: bool = False,
+        background_log_writer: bool = False,
+    ) -> "RevitCarbonAnalyzer":
+        """
+        Create an analyzer and its dependencies from a compiled calculation plan.
+
+        An analyzer with a background log writer must have its logger closed
+        once the run is done.
+        """
+        logger = Logging(
+            buffered=buffered_logging, background_sink=background_log_writer
+        )
+        material_processor = MaterialProcessor()
+        return cls(
+            material_processor=material_processor,
+            element_processor=ElementProcessor(
+                material_processor=material_processor, logger=logger
+            ),
+            carbon_calculator=CarbonCalculator.from_plan(plan, logger=logger),
+            logger=logger,
+            embodied_carbon_schema=embodied_carbon_schema,
+        )
+
+    def analyze_model(
+        self,
+        model_root,
+        consumers: Sequence[ResultConsumer] = (),
+        workers: int = 1,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+        previous: Optional[IncrementalIndex] = None,
+    ) -> dict:
+        """
+        Analyze a Revit model for carbon emissions.
 
-    def analyze_model(self, model_root) -> dict:
-        """Analyze a Revit model for carbon emissions."""
+        Args:
+            model_root: Root object of the received model
+            consumers: Result consumers fed with every element result during
+                the single traversal of the model
+            workers: Number of processes to analyze elements with. Models with
+                fewer than parallel_threshold elements are always analyzed serially
+            parallel_threshold: Minimum number of elements for parallel analysis
+            previous: Results of a previous run; unchanged elements reuse them
+                instead of being analyzed again
+        """
         results = {
             "processed_elements": [],
             "skipped_elements": [],
@@ -164,26 +374,16 @@ class RevitCarbonAnalyzer:
         }
 
         # Process each element
-        for element in self.iterate_elements(model_root):
-            try:
-                element_result = self._process_single_element(element)
-                if element_result["status"] == "processed":
-                    results["processed_elements"].append(element_result)
-                    results["total_carbon"] += element_result["total_carbon"]
-                elif element_result["status"] == "skipped":
-                    results["skipped_elements"].append(element_result)
-                elif element_result["status"] == "warning":
-                    results["warning_elements"].append(element_result)
-                else:
-                    results["errors"].append(element_result)
-            except Exception as e:
-                results["errors"].append(
-                    {
-                        "id": getattr(element, "id", "unknown"),
-                        "error": str(e),
-                        "status": "error",
-                    }
-                )
+        for element, element_result in self._iterate_model_results(
+            model_root, workers, parallel_threshold, previous
+        ):
+            results[result_bucket(element_result)].append(element_result)
+            if element_result["status"] == "processed":
+                results["total_carbon"] += element_result["total_carbon"]
+
+            with self.logger.sampled_span("consume_result"):
+                for consumer in consumers:
+                    consumer.consume(element, element_result)
 
             # Get missing factors
         (
@@ -211,15 +411,189 @@ class RevitCarbonAnalyzer:
             for item in missing_concrete:
                 print(f"  - {item}")
 
+        for consumer in consumers:
+            consumer.finalize(results)
+
         return results
 
-    def _process_single_element(self, element: Dict) -> Dict:
+    def analyze_element(self, element, attach: bool = True) -> Dict:
+        """
+        Analyze a single element, turning unexpected failures into error results.
+
+        Args:
+            element: The element to analyze
+            attach: Whether to attach the carbon data to the element's properties
+        """
+        try:
+            return self._process_single_element(element, attach)
+        except Exception as e:
+            return {
+                "id": getattr(element, "id", "unknown"),
+                "error": str(e),
+                "status": "error",
+            }
+
+    def analyze_elements(self, elements: Sequence, attach: bool = True) -> List[Dict]:
+        """
+        Analyze a group of elements, calculating their carbon in one batch.
+
+        The results are the same as calling analyze_element on each element.
+
+        Args:
+            elements: The elements to analyze
+            attach: Whether to attach the carbon data to the elements' properties
+        """
+        prepared = []
+        for element in elements:
+            try:
+                with self.logger.sampled_span("prepare_element"):
+                    prepared.append(self._prepare_element(element))
+            except Exception as e:
+                prepared.append(
+                    (
+                        None,
+                        {
+                            "id": getattr(element, "id", "unknown"),
+                            "error": str(e),
+                            "status": "error",
+                        },
+                    )
+                )
+
+        processed_elements = [p for p, _ in prepared if p is not None]
+        try:
+            with self.logger.span("calculate_batch"):
+                batch = self.carbon_calculator.calculate_batch(processed_elements)
+        except Exception:
+            # Calculate element by element instead
+            batch = None
+
+        element_results = []
+        batch_index = 0
+        for element, (processed_element, element_result) in zip(elements, prepared):
+            if processed_element is not None:
+                if batch is not None:
+                    calculate = partial(batch.element_results, batch_index)
+                else:
+                    calculate = partial(
+                        self.carbon_calculator.calculate_carbon, processed_element
+                    )
+                batch_index += 1
+                with self.logger.sampled_span("calculate_element"):
+                    element_result = self._calculate_element(
+                        element, processed_element, calculate, attach
+                    )
+            element_results.append(element_result)
+
+        return element_results
+
+    def _iterate_model_results(
+        self,
+        model_root,
+        workers: int,
+        parallel_threshold: int,
+        previous: Optional[IncrementalIndex],
+    ) -> Iterator[Tuple[Base, Dict]]:
+        """Yield each element of the model with its result, in traversal order."""
+        elements = self.logger.timed_iteration(
+            self.iterate_elements(model_root), "iterate_elements"
+        )
+        if not previous:
+            yield from self._iterate_element_results(
+                elements, workers, parallel_threshold
+            )
+            return
+
+        # Only elements without a reusable result are analyzed
+        elements = list(elements)
+        reused = [previous.reuse(element) for element in elements]
+        changed_results = self._iterate_element_results(
+            [e for e, r in zip(elements, reused) if r is None],
+            workers,
+            parallel_threshold,
+        )
+        for element, element_result in zip(elements, reused):
+            if element_result is None:
+                yield next(changed_results)
+            else:
+                self._attach_embodied_carbon(element, element_result["carbon_results"])
+                yield element, element_result
+
+        # Let the analysis finish, e.g. merging missing factors of workers
+        next(changed_results, None)
+
+    def _iterate_element_results(
+        self, elements: Iterable[Base], workers: int, parallel_threshold: int
+    ) -> Iterator[Tuple[Base, Dict]]:
+        """Yield each element with its result, in order."""
+        if workers > 1:
+            elements = list(elements)
+            if len(elements) >= parallel_threshold:
+                yield from self._iterate_parallel_element_results(elements, workers)
+                return
+
+        if self.batch_size <= 1:
+            for element in elements:
+                with self.logger.sampled_span("analyze_element"):
+                    element_result = self.analyze_element(element)
+                yield element, element_result
+            return
+
+        elements = iter(elements)
+        while chunk := list(islice(elements, self.batch_size)):
+            yield from zip(chunk, self.analyze_elements(chunk))
+
+    def _iterate_parallel_element_results(
+        self, elements: List[Base], workers: int
+    ) -> Iterator[Tuple[Base, Dict]]:
+        """Analyze elements in worker processes and merge their partial results."""
+        analysis = ParallelElementAnalysis(
+            analyzer_factory=partial(
+                RevitCarbonAnalyzer.from_plan,
+                self.carbon_calculator.plan,
+                buffered_logging=self.logger.buffered,
+            ),
+            workers=workers,
+            logger=self.logger,
+        )
+        for element, element_result in zip(elements, analysis.analyze(elements)):
+            # Workers only see copies, so the carbon data is attached here
+            if "carbon_results" in element_result:
+                self._attach_embodied_carbon(element, element_result["carbon_results"])
+            yield element, element_result
+
+        self.carbon_calculator.merge_missing_factors(
+            analysis.missing_timber, analysis.missing_steel, analysis.missing_concrete
+        )
+
+    def _process_single_element(self, element: Dict, attach: bool = True) -> Dict:
         """Process a single element and return its results."""
+        processed_element, element_result = self._prepare_element(element)
+        if processed_element is None:
+            return element_result
+
+        return self._calculate_element(
+            element,
+            processed_element,
+            partial(self.carbon_calculator.calculate_carbon, processed_element),
+            attach,
+        )
+
+    def _prepare_element(
+        self, element: Dict
+    ) -> Tuple[Optional[BuildingElement], Optional[Dict]]:
+        """
+        Turn an element into a BuildingElement ready for carbon calculation.
+
+        Returns:
+            The processed element, or None and the final result of an element
+            that is skipped, invalid or failed processing
+        """
         element_id = getattr(element, "id", "unknown")
 
         # Check if this element should be skipped
         if self.element_processor.is_skipped(element):
-            return {
+            return None, {
                 "id": element_id,
                 "status": "skipped",
                 "reason": "Element type or family in skip list",
@@ -227,7 +601,7 @@ class RevitCarbonAnalyzer:
 
         # Check if element is valid - mark as warning if not
         if not self.element_processor.is_valid_element(element):
-            return {
+            return None, {
                 "id": element_id,
                 "status": "warning",
                 "reason": "Missing required properties",
@@ -236,17 +610,35 @@ class RevitCarbonAnalyzer:
         # Process element
         processed_element = self.element_processor.process_element(element)
         if not processed_element:
-            return {
+            return None, {
                 "id": element_id,
                 "status": "error",
                 "reason": "Element processing failed",
             }
 
+        return processed_element, None
+
+    def _calculate_element(
+        self,
+        element: Dict,
+        processed_element: BuildingElement,
+        calculate: Callable[[], Tuple[Dict[str, CarbonResult], List[Dict]]],
+        attach: bool,
+    ) -> Dict:
+        """
+        Calculate the carbon of a processed element and build its result.
+
+        Args:
+            element: The original element
+            processed_element: The element as returned by the element processor
+            calculate: Returns the carbon results and material errors of the element
+            attach: Whether to attach the carbon data to the element's properties
+        """
+        element_id = getattr(element, "id", "unknown")
+
         # Calculate carbon
         try:
-            carbon_results, material_errors = self.carbon_calculator.calculate_carbon(
-                processed_element
-            )
+            carbon_results, material_errors = calculate()
 
             if not carbon_results:
                 error_details = "; ".join(
@@ -258,117 +650,8 @@ class RevitCarbonAnalyzer:
                     "reason": f"No carbon could be calculated: {error_details}",
                 }
 
-            # Initialize Embodied Carbon Calculation dictionary
-            embodied_carbon_data = {}
-
-            for material_name, result in carbon_results.items():
-                # Create a dictionary for each material instead of an array
-                material_data = {}
-
-                if result.category == "Wood":
-                    # For timber - use name/value/units format as dictionary entries
-                    material_data = {
-                        "volume": {
-                            "name": "volume",
-                            "value": result.quantity,
-                            "units": "m³",
-                        },
-                        "database": {
-                            "name": "database",
-                            "value": result.database,
-                            "units": None,
-                        },
-                        "embodiedCarbonFactor": {
-                            "name": "embodiedCarbonFactor",
-                            "value": result.factor,
-                            "units": "kgCO₂e/m³",
-                        },
-                        "embodiedCarbon": {
-                            "name": "embodiedCarbon",
-                            "value": result.total_carbon,
-                            "units": "kgCO₂e",
-                        },
-                    }
-                elif result.category == "Concrete":
-                    # For concrete (include both concrete and reinforcement)
-                    material_data = {
-                        "concreteVolume": {
-                            "name": "concreteVolume",
-                            "value": result.concrete_volume,
-                            "units": "m³",
-                        },
-                        "database": {
-                            "name": "database",
-                            "value": result.database,
-                            "units": None,
-                        },
-                        "concreteEmbodiedCarbonFactor": {
-                            "name": "concreteEmbodiedCarbonFactor",
-                            "value": result.factor,
-                            "units": "kgCO₂e/m³",
-                        },
-                        "concreteEmbodiedCarbon": {
-                            "name": "concreteEmbodiedCarbon",
-                            "value": result.concrete_carbon,
-                            "units": "kgCO₂e",
-                        },
-                        "reinforcementMass": {
-                            "name": "reinforcementMass",
-                            "value": result.reinforcement_mass,
-                            "units": "kg",
-                        },
-                        "reinforcementRate": {
-                            "name": "reinforcementRate",
-                            "value": result.reinforcement_rate,
-                            "units": "kg/m³",
-                        },
-                        "reinforcementEmbodiedCarbonFactor": {
-                            "name": "reinforcementEmbodiedCarbonFactor",
-                            "value": result.reinforcement_factor,
-                            "units": "kgCO₂e/kg",
-                        },
-                        "reinforcementEmbodiedCarbon": {
-                            "name": "reinforcementEmbodiedCarbon",
-                            "value": result.reinforcement_carbon,
-                            "units": "kgCO₂e",
-                        },
-                        "embodiedCarbon": {
-                            "name": "embodiedCarbon",
-                            "value": result.total_carbon,
-                            "units": "kgCO₂e",
-                        },
-                    }
-                elif result.category == "Metal":
-                    # For metal
-                    material_data = {
-                        "mass": {
-                            "name": "mass",
-                            "value": result.quantity,
-                            "units": "kg",
-                        },
-                        "database": {
-                            "name": "database",
-                            "value": result.database,
-                            "units": None,
-                        },
-                        "embodiedCarbonFactor": {
-                            "name": "embodiedCarbonFactor",
-                            "value": result.factor,
-                            "units": "kgCO₂e/kg",
-                        },
-                        "embodiedCarbon": {
-                            "name": "embodiedCarbon",
-                            "value": result.total_carbon,
-                            "units": "kgCO₂e",
-                        },
-                    }
-
-                # Add this material's data to the main dictionary
-                embodied_carbon_data[material_name] = material_data
-
-            # Attach the data to the original element
-            if hasattr(element, "properties"):
-                element.properties["Embodied Carbon Calculation"] = embodied_carbon_data
+            if attach:
+                self._attach_embodied_carbon(element, carbon_results)
 
             element_result = {
                 "id": element_id,
@@ -403,14 +686,19 @@ class RevitCarbonAnalyzer:
                 "reason": f"Carbon calculation failed: {str(e)}",
             }
 
+    def _attach_embodied_carbon(
+        self, element, carbon_results: Dict[str, CarbonResult]
+    ) -> None:
+        """Attach the carbon data of an element to its properties."""
+        if hasattr(element, "properties"):
+            element.properties[
+                EMBODIED_CARBON_PROPERTY
+            ] = self.embodied_carbon_schema.build(carbon_results)
+
     @staticmethod
     def iterate_elements(base: Base) -> Iterable[Base]:
-        """Iterate through all elements in the model."""
-        elements = getattr(base, "elements", getattr(base, "@elements", None))
-        if elements is not None:
-            for element in elements:
-                yield from RevitCarbonAnalyzer.iterate_elements(element)
-        yield base
+        """Iterate through all elements in the model, children before parents."""
+        return ModelTraversal().iterate(base)
 
 
 def automate_function(
@@ -418,6 +706,8 @@ def automate_function(
     function_inputs: FunctionInputs,
 ) -> None:
     """Program entry point."""
+    logger = None
+    results_artifact = None
     try:
         # Get string values from enums if needed
         steel_db = function_inputs.steel_database
@@ -448,87 +738,125 @@ def automate_function(
             "Topping Slabs": function_inputs.reinforcement_topping_slab,
         }
 
-        # Create dependencies with proper DI
-        logger = Logging()
-        material_processor = MaterialProcessor()
-        element_processor = ElementProcessor(
-            material_processor=material_processor, logger=logger
-        )
-        carbon_calculator = CarbonCalculator(
-            steel_database=steel_db,
-            timber_database=timber_db,
-            concrete_database=concrete_db,
-            country=country,
-            custom_reinforcement_rates=custom_reinforcement_rates,
-        )
-
-        # Initialize analyzer with injected dependencies
-        analyzer = RevitCarbonAnalyzer(
-            material_processor=material_processor,
-            element_processor=element_processor,
-            carbon_calculator=carbon_calculator,
-            logger=logger,
+        # Create the analyzer and its dependencies
+        calculator_settings = {
+            "steel_database": steel_db,
+            "timber_database": timber_db,
+            "concrete_database": concrete_db,
+            "country": country,
+            "custom_reinforcement_rates": custom_reinforcement_rates,
+            "interpolate_concrete_strength": (
+                function_inputs.concrete_strength_interpolation
+            ),
+        }
+        analyzer = RevitCarbonAnalyzer.from_settings(
+            calculator_settings,
+            embodied_carbon_schema=(
+                CompactSchema() if function_inputs.compact_properties else None
+            ),
+            buffered_logging=function_inputs.buffered_logging,
+            background_log_writer=function_inputs.background_log_writer,
         )
+        logger = analyzer.logger
+        if function_inputs.stage_timings:
+            logger.enable_timing()
 
         # Get commit root
         version_id = automate_context.automation_run_data.triggers[0].payload.version_id
-        commit_root = automate_context.speckle_client.commit.get(
-            automate_context.automation_run_data.project_id, version_id
-        )
-
-        # Get model root
-        model_root = automate_context.receive_version()
+        with logger.span("fetch_commit"):
+            commit_root = automate_context.speckle_client.commit.get(
+                automate_context.automation_run_data.project_id, version_id
+            )
 
-        # Validate Revit source
+        # Validate Revit source - from the version metadata, before any download
         if not _validate_revit_source(commit_root):
             automate_context.mark_run_failed("Model must be from Revit")
             return
 
-        # Validate Next-Gen
-        if not _validate_next_gen(model_root):
-            automate_context.mark_run_failed(
-                "Revit model must be sent using the v3 connector (or adapt the "
-                "automation for v2)."
-            )
+        # Validate Next-Gen - from the root object only, before the full receive
+        try:
+            with logger.span("fetch_root_object"):
+                root_object = _fetch_root_object(
+                    automate_context, commit_root.referencedObject
+                )
+        except Exception as e:
+            print(f"Could not fetch the root object, validating after receive: {e}")
+            root_object = None
+
+        if root_object is not None and not _validate_next_gen(root_object):
+            automate_context.mark_run_failed(NEXT_GEN_REQUIRED_MESSAGE)
             return
 
-        # Run analysis - convert Speckle model to dict for processing
-        results = analyzer.analyze_model(model_root)
+        # Get model root
+        with logger.span("receive_version"):
+            model_root = automate_context.receive_version()
 
-        # Process results
-        _process_automation_results(automate_context, results)
+        if root_object is None and not _validate_next_gen(model_root):
+            automate_context.mark_run_failed(NEXT_GEN_REQUIRED_MESSAGE)
+            return
+
+        # Results of the previous output computed with the same settings
+        output_model_name = f"{commit_root.branchName}_embodied_carbon"
+        run_settings_key = settings_key(calculator_settings)
+        previous = None
+        if function_inputs.incremental:
+            with logger.span("load_previous_version"):
+                previous = IncrementalIndex.from_previous_version(
+                    automate_context.speckle_client,
+                    automate_context.automation_run_data.project_id,
+                    output_model_name,
+                    run_settings_key,
+                )
+
+        # Run analysis - a single traversal feeds the report, attachments and counters
+        pdf_rows = PdfRowBuilder(max_rows=function_inputs.report_row_limit)
+        attachment_payload = AttachmentPayloadBuilder()
+        rollup = CarbonRollup()
+        results_artifact = ResultsArtifactWriter(
+            "results", ResultsFormat(function_inputs.results_format), logger
+        )
+        consumers = [
+            pdf_rows,
+            attachment_payload,
+            SummaryCounter(),
+            rollup,
+            results_artifact,
+        ]
+        overlay = None
+        if OutputMode(function_inputs.output_mode) == OutputMode.ResultsOverlay:
+            overlay = OverlayBuilder()
+            consumers.append(overlay)
+        # The record of an overlay points to the blocks of its objects
+        run_record = None
+        if function_inputs.incremental:
+            run_record = RunRecordBuilder(keep_blocks=overlay is None)
+            consumers.append(run_record)
+        with logger.span("analyze_model"):
+            results = analyzer.analyze_model(
+                model_root,
+                consumers=consumers,
+                workers=function_inputs.parallel_workers,
+                previous=previous,
+            )
+
+        # Attach the element ids to the run
+        with logger.span("attach_results"):
+            AttachmentDispatcher().dispatch(automate_context, attachment_payload)
 
         # Generate PDF
         file_name = "report.pdf"
-        doc = SimpleDocTemplate(file_name, pagesize=letter)
-
-        pdf_data = [["Element ID", "Material", "Embodied Carbon"]]
-        for element in RevitCarbonAnalyzer.iterate_elements(model_root):
-            if hasattr(element, "properties"):
-                element_properties = element["properties"]
-
-                # elementId became an issue for linked models. don't know why. lazy fix below. hackady-hack
-                if hasattr(element_properties, "elementId"):
-                    element_id = element_properties["elementId"]
-                    if "Embodied Carbon Calculation" in element_properties:
-                        for key, value in element_properties[
-                            "Embodied Carbon Calculation"
-                        ].items():
-                            pdf_data.append(
-                                [
-                                    element_id,
-                                    key,
-                                    "{:0.2f} {}".format(
-                                        value["embodiedCarbon"]["value"],
-                                        value["embodiedCarbon"]["units"],
-                                    ),
-                                ]
-                            )
-
-        table = Table(pdf_data)
-        doc.build([table])
-
-        automate_context.store_file_result(file_name)
+        with logger.span("pdf_report"):
+            write_pdf_report(
+                file_name,
+                pdf_rows.rows,
+                summary=summary_rows(results),
+                sections=rollup_sections(rollup),
+                omitted_rows=pdf_rows.omitted_rows,
+            )
+
+        with logger.span("store_files"):
+            automate_context.store_file_result(file_name)
+            automate_context.store_file_result(results_artifact.file_name)
 
         # Calculate success percentage (successful / (successful + errors))
         total_processed = (
@@ -553,6 +881,15 @@ def automate_function(
             f"\tTotal carbon:\t{results['total_carbon']:.0f} kgCO₂e\n"
         )
 
+        # The chosen format may not be available, e.g. Parquet without pyarrow
+        if results_artifact.results_format != ResultsFormat(
+            function_inputs.results_format
+        ):
+            success_message += (
+                f"\nNOTE: Results were written as {results_artifact.file_name}, "
+                f"{function_inputs.results_format} is not available.\n"
+            )
+
         # Add missing factors to message if any
         missing_timber = results["missing_factors"]["timber"]
         missing_steel = results["missing_factors"]["steel"]
@@ -583,86 +920,70 @@ def automate_function(
                 "\nNOTE: All materials successfully matched with emission factors."
             )
 
-        # Upload mutated model
-        automate_context.create_new_version_in_project(
-            model_root, f"{commit_root.branchName}_embodied_carbon"
-        )
+        # Upload mutated model or the results overlay, recording the run for
+        # incremental analysis
+        output_root = model_root
+        if overlay is not None:
+            output_root = overlay.build(output_model_name, rollup)
+        if run_record is not None:
+            run_record.attach_to(output_root, run_settings_key)
+        with logger.span("create_version"):
+            automate_context.create_new_version_in_project(
+                output_root, output_model_name
+            )
+
+        # One line per failing category rather than one per element, also
+        # counting the lines a background writer had to drop
+        logger.close()
+        if logger.buffered or logger.dropped_events:
+            logger.log_category_summary()
+
+        # Where the run spent its time, in the run log and as a file result
+        if function_inputs.stage_timings:
+            timings_file_name = "timings.json"
+            logger.log_timing_summary(timings_file_name)
+            automate_context.store_file_result(timings_file_name)
 
         # Mark success with detailed message
         automate_context.mark_run_success(success_message)
 
     except Exception as e:
+        # Don't leave a truncated artifact that looks like a finished one
+        if results_artifact is not None:
+            results_artifact.discard()
         automate_context.mark_run_failed(f"Analysis failed: {str(e)}")
         raise
 
+    finally:
+        # Let a background log writer emit what it has queued
+        if logger is not None:
+            logger.close()
+
 
 def _validate_revit_source(commit_root: Any) -> bool:
     """Validate that the model is from Revit."""
-    source_app = getattr(commit_root, "sourceApplication", "").lower()
+    source_app = (getattr(commit_root, "sourceApplication", None) or "").lower()
     return source_app.startswith("revit")
 
 
 def _validate_next_gen(model_root: Any) -> bool:
     """Validate that the model was sent using the v3 connector"""
-    if not getattr(model_root, "version", None) == 3:
+    if isinstance(model_root, dict):
+        version = model_root.get("version")
+    else:
+        version = getattr(model_root, "version", None)
+    if not version == 3:
         return False
     return True
 
 
-def _process_automation_results(
-    automate_context: AutomationContext, results: dict
-) -> None:
-    """Process results and attach them to the automation context."""
-    # Process each category and attach to objects
-
-    # Successes with gradient metadata
-    if results["processed_elements"]:
-        # Create a dictionary mapping element IDs to their total carbon values
-        embodied_carbon_values = {}
-
-        # Extract the total carbon for each element
-        for element in results["processed_elements"]:
-            element_id = element["id"]
-            # The total carbon is already calculated and stored in each element result
-            total_carbon = element["total_carbon"]
-            embodied_carbon_values[element_id] = {"gradientValue": total_carbon}
-
-        automate_context.attach_success_to_objects(
-            category="Carbon Analysis",
-            metadata={"gradient": True, "gradientValues": embodied_carbon_values},
-            object_ids=[e["id"] for e in results["processed_elements"]],
-            message="Carbon calculations completed successfully for these elements!",
-        )
-
-    # Skipped elements (info)
-    if results["skipped_elements"]:
-        automate_context.attach_info_to_objects(
-            category="Skipped Elements",
-            object_ids=[e["id"] for e in results["skipped_elements"]],
-            message="Elements that were intentionally skipped.",
-        )
-
-    # Warnings
-    if results["warning_elements"]:
-        automate_context.attach_warning_to_objects(
-            category="Missing Material Data",
-            object_ids=[e["id"] for e in results["warning_elements"]],
-            message="Elements missing material data required for carbon calculation.",
-        )
-
-    # Errors
-    if results["errors"]:
-        automate_context.attach_error_to_objects(
-            category="Processing Errors",
-            object_ids=[e["id"] for e in results["errors"]],
-            message="Failure processing the following elements.",
-        )
-
-    # Add statistics to results for use in success message
-    results["success_count"] = len(results["processed_elements"])
-    results["warning_count"] = len(results["warning_elements"])
-    results["skipped_count"] = len(results["skipped_elements"])
-    results["error_count"] = len(results["errors"])
+def _fetch_root_object(automate_context: AutomationContext, object_id: str) -> Dict:
+    """Fetch the raw root object of a version, without any of its children."""
+    transport = ServerTransport(
+        stream_id=automate_context.automation_run_data.project_id,
+        client=automate_context.speckle_client,
+    )
+    return fetch_single_object(transport, object_id)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,12 @@ class ConcreteElementType(Enum):
     TOPPING_SLAB = "Topping Slabs"
 
 
+# Element types by their lowercased names
+_TYPES_BY_NAME = {
+    enum_type.value.lower(): enum_type for enum_type in ConcreteElementType
+}
+
+
 class ReinforcementRates:
     """Reinforcement rates for concrete elements by element type."""
 
@@ -24,25 +30,19 @@ class ReinforcementRates:
         """Initialize with rates provided from function inputs."""
         self._rates = {}
 
-        # Convert string keys to enum values
+        # Convert string keys to enum values, storing unknown ones as strings
         for type_str, rate in rates_dict.items():
-            for enum_type in ConcreteElementType:
-                if enum_type.value.lower() == type_str.lower():
-                    self._rates[enum_type] = rate
-                    break
-            # If no match found, store with string key
-            if type_str.lower() not in [e.value.lower() for e in ConcreteElementType]:
-                self._rates[type_str] = rate
+            self._rates[_TYPES_BY_NAME.get(type_str.lower(), type_str)] = rate
 
     def get_rate(self, element_type: str) -> float:
         """Get reinforcement rate for a concrete element type."""
         # Try direct match with enum values
-        for enum_type in ConcreteElementType:
-            if enum_type.value.lower() == element_type.lower():
-                return self._rates.get(enum_type, 100.0)  # Default if missing
+        element_lower = element_type.lower()
+        enum_type = _TYPES_BY_NAME.get(element_lower)
+        if enum_type is not None:
+            return self._rates.get(enum_type, 100.0)  # Default if missing
 
         # Try fuzzy matching with string keys
-        element_lower = element_type.lower()
         if "beam" in element_lower and "grade" in element_lower:
             return self.get_rate_by_type(ConcreteElementType.GRADE_BEAM)
         elif "slab" in element_lower and "grade" in element_lower:
@@ -1,20 +1,49 @@
+import sys
 from abc import ABC
-from typing import Optional, Dict
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping
 from src.domain.carbon.schema import EmissionFactor
 
 
+def normalize_key(name: str) -> str:
+    """Case-fold a material name and collapse its whitespace."""
+    return " ".join(name.casefold().split())
+
+
 class EmissionFactorDatabase(ABC):
     """Base class for emission factor databases"""
 
     def __init__(self):
         self._factors: Dict[str, EmissionFactor] = {}
 
+    @property
+    def _factors(self) -> Mapping[str, EmissionFactor]:
+        return self.__factors
+
+    @_factors.setter
+    def _factors(self, factors: Dict[str, EmissionFactor]) -> None:
+        # Subclasses assign and fill their factors in __init__; the index is
+        # built from them on the first lookup
+        self.__factors = factors
+        self.__index: Optional[Mapping[str, EmissionFactor]] = None
+
+    def _get_index(self) -> Mapping[str, EmissionFactor]:
+        """Return the normalized name index, building and freezing it once."""
+        if self.__index is None:
+            index = {}
+            for name, factor in self.__factors.items():
+                # The first of several names normalizing alike wins
+                index.setdefault(sys.intern(normalize_key(name)), factor)
+
+            self.__factors = MappingProxyType(self.__factors)
+            self.__index = MappingProxyType(index)
+        return self.__index
+
+    def compile(self) -> "EmissionFactorDatabase":
+        """Build and freeze the index now instead of on the first lookup."""
+        self._get_index()
+        return self
+
     def get_factor(self, material_name: str) -> Optional[EmissionFactor]:
         """Get emission factor for a material name"""
-        material_name = material_name.lower()
-        for name, factor in self._factors.items():
-            if name.lower() == material_name:
-                return factor
-
-        # If no direct match, return None
-        return None
+        return self._get_index().get(normalize_key(material_name))
@@ -1,4 +1,5 @@
-from typing import Dict, Type
+import importlib
+from typing import Callable, Dict, Tuple, Type
 
 from src.domain.carbon.databases.base import EmissionFactorDatabase
 from src.domain.carbon.databases.enums import (
@@ -7,45 +8,42 @@ from src.domain.carbon.databases.enums import (
     ConcreteDatabase,
 )
 
-# Import timber databases
-from src.domain.carbon.databases.timber.athena import Athena
-from src.domain.carbon.databases.timber.structurlam import Structurlam
-from src.domain.carbon.databases.timber.awc_cwc import AwcCwc
-from src.domain.carbon.databases.timber.katerra import Katerra
-from src.domain.carbon.databases.timber.nordic_structures import NordicStructures
-from src.domain.carbon.databases.timber.binderholz import Binderholz
-from src.domain.carbon.databases.timber.structuralam_abbotsford import (
-    StructuralamAbbotsford,
-)
-from src.domain.carbon.databases.timber.clf_baseline_document import CLFBaselineDocument
-from src.domain.carbon.databases.timber.industry_average import IndustryAverage
 
-# Import steel databases
-from src.domain.carbon.databases.steel.steel_350_mpa import Steel350MPa
+class DatabaseFactory:
+    """
+    Factory for emission factor database instances.
 
-# Import concrete databases
-from src.domain.carbon.databases.concrete.metric import ConcreteEmissionDatabase
+    Databases are immutable once compiled, so each one is built once per
+    process and the same handle is returned to every registry.
+    """
 
+    _instances: Dict[Tuple[str, str], EmissionFactorDatabase] = {}
 
-class DatabaseFactory:
-    """Factory for creating emission factor database instances."""
-
-    _timber_database_classes: Dict[str, Type[EmissionFactorDatabase]] = {
-        TimberDatabase.Athena2021.value: Athena,
-        TimberDatabase.Structurlam2020.value: Structurlam,
-        TimberDatabase.AwcCwc2018.value: AwcCwc,
-        TimberDatabase.Katerra2020.value: Katerra,
-        TimberDatabase.NordicStructures2018.value: NordicStructures,
-        TimberDatabase.Binderholz2019.value: Binderholz,
-        TimberDatabase.StructuralamAbbotsford.value: StructuralamAbbotsford,
-        TimberDatabase.CLFBaselineDocument.value: CLFBaselineDocument,
-        TimberDatabase.IndustryAverage.value: IndustryAverage,
+    # Database classes by name, as "module:Class" paths imported on first use
+    _timber_database_classes: Dict[str, str] = {
+        TimberDatabase.Athena2021.value: "timber.athena:Athena",
+        TimberDatabase.Structurlam2020.value: "timber.structurlam:Structurlam",
+        TimberDatabase.AwcCwc2018.value: "timber.awc_cwc:AwcCwc",
+        TimberDatabase.Katerra2020.value: "timber.katerra:Katerra",
+        TimberDatabase.NordicStructures2018.value: (
+            "timber.nordic_structures:NordicStructures"
+        ),
+        TimberDatabase.Binderholz2019.value: "timber.binderholz:Binderholz",
+        TimberDatabase.StructuralamAbbotsford.value: (
+            "timber.structuralam_abbotsford:StructuralamAbbotsford"
+        ),
+        TimberDatabase.CLFBaselineDocument.value: (
+            "timber.clf_baseline_document:CLFBaselineDocument"
+        ),
+        TimberDatabase.IndustryAverage.value: "timber.industry_average:IndustryAverage",
     }
 
-    _steel_database_classes: Dict[str, Type[EmissionFactorDatabase]] = {
-        SteelDatabase.Type350MPa.value: Steel350MPa,
+    _steel_database_classes: Dict[str, str] = {
+        SteelDatabase.Type350MPa.value: "steel.steel_350_mpa:Steel350MPa",
     }
 
+    _concrete_database_class = "concrete.metric:ConcreteEmissionDatabase"
+
     @classmethod
     def create_timber_database(cls, database_name: str) -> EmissionFactorDatabase:
         """Create a timber database instance by name."""
@@ -54,7 +52,11 @@ class DatabaseFactory:
                 f"Unknown timber database: '{database_name}'. "
                 f"Available databases: {', '.join(cls._timber_database_classes.keys())}"
             )
-        return cls._timber_database_classes[database_name]()
+        return cls._get_or_create(
+            "timber",
+            database_name,
+            lambda: cls._load_class(cls._timber_database_classes[database_name])(),
+        )
 
     @classmethod
     def create_steel_database(cls, database_name: str) -> EmissionFactorDatabase:
@@ -64,14 +66,22 @@ class DatabaseFactory:
                 f"Unknown steel database: '{database_name}'. "
                 f"Available databases: {', '.join(cls._steel_database_classes.keys())}"
             )
-        return cls._steel_database_classes[database_name]()
+        return cls._get_or_create(
+            "steel",
+            database_name,
+            lambda: cls._load_class(cls._steel_database_classes[database_name])(),
+        )
 
     @classmethod
     def create_concrete_database(cls, database_name: str) -> EmissionFactorDatabase:
         """Create a concrete database instance by name."""
         # For concrete, we create a new instance with the database name
         try:
-            return ConcreteEmissionDatabase(database_name)
+            return cls._get_or_create(
+                "concrete",
+                database_name,
+                lambda: cls._load_class(cls._concrete_database_class)(database_name),
+            )
         except ValueError as e:
             # Re-raise with more context
             available_databases = [db.value for db in ConcreteDatabase]
@@ -79,3 +89,25 @@ class DatabaseFactory:
                 f"Error creating concrete database: {str(e)}. "
                 f"Available databases: {', '.join(available_databases)}"
             )
+
+    @classmethod
+    def _get_or_create(
+        cls,
+        kind: str,
+        database_name: str,
+        create: Callable[[], EmissionFactorDatabase],
+    ) -> EmissionFactorDatabase:
+        """Return the shared handle of a database, compiling it on first use."""
+        key = (kind, database_name)
+        database = cls._instances.get(key)
+        if database is None:
+            database = create().compile()
+            cls._instances[key] = database
+        return database
+
+    @staticmethod
+    def _load_class(path: str) -> Type[EmissionFactorDatabase]:
+        """Import a database class from its "module:Class" path."""
+        module_name, class_name = path.split(":")
+        module = importlib.import_module(f"{__package__}.{module_name}")
+        return getattr(module, class_name)
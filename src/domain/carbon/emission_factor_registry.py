@@ -1,8 +1,6 @@
-from functools import lru_cache
-from typing import Optional, Dict, List, cast
+from typing import Optional, Dict, List, TYPE_CHECKING, cast
 
 from src.domain.carbon.databases.base import EmissionFactorDatabase
-from src.domain.carbon.databases.concrete.metric import ConcreteEmissionDatabase
 from src.domain.carbon.databases.enums import (
     TimberDatabase,
     SteelDatabase,
@@ -11,20 +9,45 @@ from src.domain.carbon.databases.enums import (
 from src.domain.carbon.schema import EmissionFactor
 from src.domain.carbon.material_alias_service import MaterialAliasService
 from src.domain.carbon.databases.database_factory import DatabaseFactory
+from src.infrastructure.cache import BoundedCache, DEFAULT_CACHE_SIZE, EvictionPolicy
+
+if TYPE_CHECKING:
+    # Database modules are only imported once a database is selected
+    from src.domain.carbon.databases.concrete.metric import ConcreteEmissionDatabase
 
 
 class EmissionFactorRegistry:
     """Registry of available emission factor databases with lazy loading."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+        cache_policy: EvictionPolicy = EvictionPolicy.LRU,
+    ):
+        """
+        Args:
+            cache_size: Maximum number of cached lookups per material type, or
+                None for unbounded caches
+            cache_policy: Eviction policy of the lookup caches
+        """
         self._timber_databases: Dict[str, EmissionFactorDatabase] = {}
         self._steel_databases: Dict[str, EmissionFactorDatabase] = {}
-        self._concrete_databases: Dict[str, ConcreteEmissionDatabase] = {}
+        self._concrete_databases: Dict[str, "ConcreteEmissionDatabase"] = {}
 
         # Create the alias service
         self._alias_service = MaterialAliasService()
 
-    def _get_timber_database(self, database_name: str) -> EmissionFactorDatabase:
+        # Lookup caches, including lookups that found no factor
+        self._timber_cache = BoundedCache(cache_size, cache_policy)
+        self._steel_cache = BoundedCache(cache_size, cache_policy)
+        self._concrete_cache = BoundedCache(cache_size, cache_policy)
+
+    @property
+    def alias_service(self) -> MaterialAliasService:
+        """Service normalizing the material names factors are looked up by."""
+        return self._alias_service
+
+    def get_timber_database(self, database_name: str) -> EmissionFactorDatabase:
         """Get or create a timber database instance."""
         if database_name not in self._timber_databases:
             self._timber_databases[
@@ -32,7 +55,7 @@ class EmissionFactorRegistry:
             ] = DatabaseFactory.create_timber_database(database_name)
         return self._timber_databases[database_name]
 
-    def _get_steel_database(self, database_name: str) -> EmissionFactorDatabase:
+    def get_steel_database(self, database_name: str) -> EmissionFactorDatabase:
         """Get or create a steel database instance."""
         if database_name not in self._steel_databases:
             self._steel_databases[
@@ -40,23 +63,56 @@ class EmissionFactorRegistry:
             ] = DatabaseFactory.create_steel_database(database_name)
         return self._steel_databases[database_name]
 
-    def _get_concrete_database(self, database_name: str) -> ConcreteEmissionDatabase:
-        """Get or create a concrete database instance."""
+    def get_concrete_database(self, database_name: str) -> "ConcreteEmissionDatabase":
+        """Get or create a concrete database instance, e.g. for its factor table."""
         if database_name not in self._concrete_databases:
             # We need to cast here because the factory returns the base type
             concrete_db = cast(
-                ConcreteEmissionDatabase,
+                "ConcreteEmissionDatabase",
                 DatabaseFactory.create_concrete_database(database_name),
             )
             self._concrete_databases[database_name] = concrete_db
         return self._concrete_databases[database_name]
 
-    @lru_cache(maxsize=128)
     def get_timber_factor(
         self, material_name: str, database: str
     ) -> Optional[EmissionFactor]:
         """Get emission factor for timber from specified database with name normalization."""
-        db = self._get_timber_database(database)
+        return self._timber_cache.get_or_compute(
+            (material_name, database),
+            lambda: self._find_timber_factor(material_name, database),
+        )
+
+    def get_steel_factor(
+        self, material_name: str, database: str
+    ) -> Optional[EmissionFactor]:
+        """Get emission factor for steel from specified database with name normalization."""
+        return self._steel_cache.get_or_compute(
+            (material_name, database),
+            lambda: self._find_steel_factor(material_name, database),
+        )
+
+    def get_concrete_factor(
+        self, strength: str, element_type: str, database: str
+    ) -> Optional[EmissionFactor]:
+        """Get emission factor for concrete from specified database based on strength and element type."""
+        return self._concrete_cache.get_or_compute(
+            (strength, element_type, database),
+            lambda: self._find_concrete_factor(strength, element_type, database),
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Optional[int]]]:
+        """Return the hit, miss and eviction counters of the lookup caches."""
+        return {
+            "timber": self._timber_cache.stats(),
+            "steel": self._steel_cache.stats(),
+            "concrete": self._concrete_cache.stats(),
+        }
+
+    def _find_timber_factor(
+        self, material_name: str, database: str
+    ) -> Optional[EmissionFactor]:
+        db = self.get_timber_database(database)
 
         # Try direct lookup first
         factor = db.get_factor(material_name)
@@ -67,12 +123,10 @@ class EmissionFactorRegistry:
         normalized_name = self._alias_service.normalize_timber_name(material_name)
         return db.get_factor(normalized_name)
 
-    @lru_cache(maxsize=128)
-    def get_steel_factor(
+    def _find_steel_factor(
         self, material_name: str, database: str
     ) -> Optional[EmissionFactor]:
-        """Get emission factor for steel from specified database with name normalization."""
-        db = self._get_steel_database(database)
+        db = self.get_steel_database(database)
 
         # Try direct lookup first
         factor = db.get_factor(material_name)
@@ -83,12 +137,10 @@ class EmissionFactorRegistry:
         normalized_name = self._alias_service.normalize_steel_name(material_name)
         return db.get_factor(normalized_name)
 
-    @lru_cache(maxsize=128)
-    def get_concrete_factor(
+    def _find_concrete_factor(
         self, strength: str, element_type: str, database: str
     ) -> Optional[EmissionFactor]:
-        """Get emission factor for concrete from specified database based on strength and element type."""
-        db = self._get_concrete_database(database)
+        db = self.get_concrete_database(database)
 
         # Now we can safely call this method since we've ensured the correct type
         return db.get_factor_by_strength_and_element(strength, element_type)
@@ -1,5 +1,72 @@
+import re
 from typing import Dict, List, Optional
 
+# Names mapped to Hot Rolled steel regardless of the alias table
+HOT_ROLLED_NAMES = [
+    "345 mpa",
+    "350w",
+    "steel 345",
+    "default_steel",
+    "steel astm a500b-42",
+]
+HOT_ROLLED = "Hot Rolled"
+
+
+class AliasMatcher:
+    """
+    Resolves material names against an alias table in a single scan.
+
+    Every pattern is compiled into one regex of lookahead alternatives ordered
+    by priority, so each position of a name reports the best pattern starting
+    there and the best over all positions wins. Priorities, from highest:
+    the Hot Rolled names, an exact standard name, standard names appearing in
+    the name, then variations appearing in the name, each in table order.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]]):
+        self._exact = {}
+        for standard_name in aliases:
+            self._exact.setdefault(standard_name.lower(), standard_name)
+
+        patterns = [(name, HOT_ROLLED) for name in HOT_ROLLED_NAMES]
+        patterns += [(name.lower(), name) for name in aliases]
+        patterns += [
+            (variation.lower(), standard_name)
+            for standard_name, variations in aliases.items()
+            for variation in variations
+        ]
+
+        # Later duplicates of a pattern can never win
+        self._canonical: List[str] = []
+        seen = set()
+        alternatives = []
+        for pattern, canonical in patterns:
+            if pattern in seen:
+                continue
+            seen.add(pattern)
+            self._canonical.append(canonical)
+            alternatives.append(f"({re.escape(pattern)})")
+        self._special_count = len(HOT_ROLLED_NAMES)
+        self._regex = re.compile(f"(?=(?:{'|'.join(alternatives)}))")
+
+    def normalize(self, name: str) -> str:
+        """Return the standard name of a material, or the cleaned name."""
+        name = name.lower().strip()
+
+        best = len(self._canonical)
+        for match in self._regex.finditer(name):
+            best = min(best, match.lastindex - 1)
+            if best == 0:
+                break
+
+        if best < self._special_count:
+            return self._canonical[best]
+        if name in self._exact:
+            return self._exact[name]
+        if best < len(self._canonical):
+            return self._canonical[best]
+        return name
+
 
 class MaterialAliasService:
     """Service for managing and resolving material name aliases"""
@@ -66,49 +133,16 @@ class MaterialAliasService:
             # To be added when concrete implementation is needed
         }
 
+        # Alias tables compiled once into single-scan matchers
+        self._timber_matcher = AliasMatcher(self._timber_aliases)
+        self._steel_matcher = AliasMatcher(self._steel_aliases)
+        self._concrete_matcher = AliasMatcher(self._concrete_aliases)
+
     def normalize_timber_name(self, name: str) -> str:
-        return self._normalize_material_name(name, self._timber_aliases)
+        return self._timber_matcher.normalize(name)
 
     def normalize_steel_name(self, name: str) -> str:
-        return self._normalize_material_name(name, self._steel_aliases)
+        return self._steel_matcher.normalize(name)
 
     def normalize_concrete_name(self, name: str) -> str:
-        return self._normalize_material_name(name, self._concrete_aliases)
-
-    @staticmethod
-    def _normalize_material_name(name: str, aliases: Dict[str, List[str]]) -> str:
-        """Normalize material name using centralized aliases with enhanced matching."""
-
-        # Convert to lowercase for case-insensitive comparison
-        name = name.lower().strip()
-
-        # Special case handling
-        if any(
-            steel_name in name
-            for steel_name in [
-                "345 mpa",
-                "350w",
-                "steel 345",
-                "default_steel",
-                "Steel ASTM A500B-42",
-            ]
-        ):
-            return "Hot Rolled"  # Map all these variants to Hot Rolled steel
-
-        # Check for direct match with standard names
-        for standard_name in aliases.keys():
-            if standard_name.lower() == name:
-                return standard_name
-
-        # Check for standard name appearing as substring
-        for standard_name in aliases.keys():
-            if standard_name.lower() in name:
-                return standard_name
-
-        # Check aliases
-        for standard_name, variations in aliases.items():
-            for variation in variations:
-                if variation.lower() == name or variation.lower() in name:
-                    return standard_name
-
-        return name
+        return self._concrete_matcher.normalize(name)
@@ -2,9 +2,9 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EmissionFactor:
-    """Emission factor with metadata"""
+    """Emission factor with metadata, shared by every database handle"""
 
     value: float
     unit: str  # e.g., "kgCO2e/kg" or "kgCO2e/m3"
@@ -1,6 +1,12 @@
+import sys
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List
+
+
+def intern_string(value: Any) -> Any:
+    """Intern strings repeated across many elements, e.g. levels and material names."""
+    return sys.intern(value) if type(value) is str else value
 
 class MaterialType(Enum):
     CONCRETE = "Concrete"
@@ -14,7 +20,7 @@ class ElementCategory(Enum):
     BEAM = "Beams"
     FOUNDATION = "Foundations"
 
-@dataclass
+@dataclass(slots=True)
 class MaterialProperties:
     name: str
     volume: float
@@ -22,14 +28,14 @@ class MaterialProperties:
     structural_asset: Optional[str] = None
     compressive_strength: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class Material:
     type: MaterialType
     properties: MaterialProperties
     grade: Optional[str] = None
     mass: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class BuildingElement:
     id: str
     level: str
@@ -38,7 +44,7 @@ class BuildingElement:
     carbon_data: Optional[Dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CarbonResult:
     factor: float  # kgCO2e/kg for metals, kgCO2e/m3 for wood
     total_carbon: float  # kgCO2e
@@ -48,10 +54,21 @@ class CarbonResult:
     quantity: float = None  # volume (m³) for concrete/wood, mass (kg) for metal
     database: str = None  # database source
 
-    # Concrete-specific fields
+    # Concrete-specific fields only exist on ConcreteCarbonResult; other
+    # results read them as None
+    concrete_volume = None
+    concrete_carbon = None
+    reinforcement_mass = None
+    reinforcement_rate = None
+    reinforcement_factor = None
+    reinforcement_carbon = None
+
+
+@dataclass(slots=True)
+class ConcreteCarbonResult(CarbonResult):
     concrete_volume: float = None  # m³
     concrete_carbon: float = None  # kgCO2e
     reinforcement_mass: float = None  # kg
     reinforcement_rate: float = None  # kg/m³
     reinforcement_factor: float = None  # kgCO2e/kg
-    reinforcement_carbon: float = None  # kgCO2e
\ No newline at end of file
+    reinforcement_carbon: float = None  # kgCO2e
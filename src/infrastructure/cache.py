@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_CACHE_SIZE = 1024
+
+_MISSING = object()
+
+
+class EvictionPolicy(Enum):
+    LRU = "lru"  # Evict the least recently used entry
+    FIFO = "fifo"  # Evict the oldest entry
+
+
+class BoundedCache:
+    """
+    Bounded key/value cache with hit, miss and eviction counters.
+
+    None is stored like any other value, so lookups that found nothing are
+    cached as negative entries instead of being repeated.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = DEFAULT_CACHE_SIZE,
+        policy: EvictionPolicy = EvictionPolicy.LRU,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of entries, or None for an unbounded cache
+            policy: Which entry to evict once the cache is full
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"Cache size must be at least 1, got {maxsize}")
+
+        self.maxsize = maxsize
+        self.policy = EvictionPolicy(policy)
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value of a key, counting the hit or miss."""
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        if self.policy == EvictionPolicy.LRU:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting an entry if the cache is full."""
+        if key in self._entries:
+            self._entries[key] = value
+            if self.policy == EvictionPolicy.LRU:
+                self._entries.move_to_end(key)
+            return
+
+        if self.maxsize is not None and len(self._entries) >= self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._entries[key] = value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value of a key, computing and caching it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries, keeping the counters."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        """Return the counters and current size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
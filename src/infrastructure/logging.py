@@ -1,83 +1,407 @@
+import json
+import queue
+import random
+import threading
 import structlog
-from typing import Dict, Set, Optional
+from contextlib import nullcontext
+from dataclasses import dataclass
+from time import perf_counter
+from typing import ContextManager, Dict, Iterable, Iterator, List, Set, Optional, Tuple
 from collections import defaultdict
+from itertools import islice
+
+# structlog method of each log level
+_STRUCTLOG_METHODS = {
+    "error": "error",
+    "warning": "warning",
+    "success": "info",
+    "info": "info",
+}
+
+# Sample ids and messages kept per category by buffered logging
+DEFAULT_LOG_SAMPLE_SIZE = 20
+
+# Events the background sink may queue before further events are dropped
+DEFAULT_SINK_QUEUE_SIZE = 10_000
+
+# Per-element spans time one call in this many by default
+DEFAULT_TIMING_SAMPLE_EVERY = 100
+
+# Returned by spans while timing is disabled, entering it does nothing
+_NO_SPAN = nullcontext()
+
+
+@dataclass(slots=True)
+class SpanStats:
+    """Accumulated timing of a span."""
+
+    calls: int = 0
+    timed: int = 0
+    total: float = 0.0  # seconds, of the timed calls only
+    max: float = 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Return the stats, estimating the total of sampled spans."""
+        mean = self.total / self.timed if self.timed else 0.0
+        return {
+            "calls": self.calls,
+            "timed": self.timed,
+            "total_s": round(mean * self.calls, 6),
+            "mean_ms": round(mean * 1000, 6),
+            "max_ms": round(self.max * 1000, 6),
+        }
+
+
+class _Span:
+    """Times the block it wraps into a SpanStats."""
+
+    __slots__ = ("_stats", "_start")
+
+    def __init__(self, stats: SpanStats):
+        self._stats = stats
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = perf_counter() - self._start
+        self._stats.timed += 1
+        self._stats.total += elapsed
+        if elapsed > self._stats.max:
+            self._stats.max = elapsed
+
+
+class CategoryLog:
+    """Event count of a log category and a bounded reservoir of its events."""
+
+    __slots__ = ("count", "samples", "_sample_size", "_random")
+
+    def __init__(self, sample_size: int, rng: random.Random):
+        self.count = 0
+        self.samples: List[Tuple[str, str]] = []
+        self._sample_size = sample_size
+        self._random = rng
+
+    def add(self, object_id: str, message: str) -> None:
+        """Count an event, keeping it with equal chance as every other"""
+        self.count += 1
+        if len(self.samples) < self._sample_size:
+            self.samples.append((object_id, message))
+            return
+        slot = self._random.randrange(self.count)
+        if slot < self._sample_size:
+            self.samples[slot] = (object_id, message)
+
+    def merge(self, count: int, samples: List[Tuple[str, str]]) -> None:
+        """Merge the count and reservoir of the same category from another log"""
+        total = self.count + count
+        if len(self.samples) + len(samples) <= self._sample_size:
+            self.samples.extend(samples)
+            self.count = total
+            return
+
+        # Split the reservoir between both logs as a uniform draw over all of
+        # their events would
+        remaining, from_self = self.count, 0
+        for drawn in range(self._sample_size):
+            if self._random.randrange(total - drawn) < remaining:
+                from_self += 1
+                remaining -= 1
+        self.samples = self._random.sample(self.samples, from_self) + (
+            self._random.sample(samples, self._sample_size - from_self)
+        )
+        self.count = total
+
+    def sample_ids(self) -> List[str]:
+        """Distinct object ids of the sampled events"""
+        return list(dict.fromkeys(object_id for object_id, _ in self.samples))
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "sample_ids": self.sample_ids(),
+            "sample_messages": list(
+                dict.fromkeys(message for _, message in self.samples)
+            ),
+        }
 
 
 class Logging:
     """Implements Logger interface with category-based logging"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        buffered: bool = False,
+        sample_size: int = DEFAULT_LOG_SAMPLE_SIZE,
+        background_sink: bool = False,
+        sink_queue_size: int = DEFAULT_SINK_QUEUE_SIZE,
+    ):
+        """
+        Initialize the logger.
+
+        Args:
+            buffered: Only count events and keep a sample of each category,
+                instead of writing every event and keeping every object id
+            sample_size: Number of sample ids and messages kept per category
+            background_sink: Write every event to structlog from a background
+                thread, dropping events while sink_queue_size are waiting
+            sink_queue_size: Number of events the background sink may queue
+        """
         self._structlog = structlog.get_logger()
-        self._errors: Dict[str, Set[str]] = defaultdict(set)
-        self._warnings: Dict[str, Set[str]] = defaultdict(set)
-        self._successes: Dict[str, Set[str]] = defaultdict(set)
-        self._info: Dict[str, Set[str]] = defaultdict(set)
+        self.buffered = buffered
+        self._sample_size = sample_size
+        self._random = random.Random(0)
+        self._categories: Dict[str, Dict[str, CategoryLog]] = {
+            level: {} for level in _STRUCTLOG_METHODS
+        }
+        self._objects: Dict[str, Dict[str, Set[str]]] = {
+            level: defaultdict(set) for level in _STRUCTLOG_METHODS
+        }
+        self._counts: Dict[str, Dict[str, int]] = {
+            level: defaultdict(int) for level in _STRUCTLOG_METHODS
+        }
+        self.dropped_events = 0
+        self._sink: Optional[queue.Queue] = None
+        self._sink_thread: Optional[threading.Thread] = None
+        if background_sink:
+            self._sink = queue.Queue(maxsize=sink_queue_size)
+            self._sink_thread = threading.Thread(
+                target=self._drain_sink, name="log-sink", daemon=True
+            )
+            self._sink_thread.start()
+        self._timing = False
+        self._sample_every = DEFAULT_TIMING_SAMPLE_EVERY
+        self._spans: Dict[str, SpanStats] = {}
+
+    def enable_timing(self, sample_every: int = DEFAULT_TIMING_SAMPLE_EVERY) -> None:
+        """Start recording spans, sampled spans timing one call in sample_every"""
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self._timing = True
+        self._sample_every = sample_every
+
+    def span(self, name: str) -> ContextManager:
+        """Time every execution of a block under a span name"""
+        if not self._timing:
+            return _NO_SPAN
+        stats = self._spans.get(name)
+        if stats is None:
+            stats = self._spans[name] = SpanStats()
+        stats.calls += 1
+        return _Span(stats)
+
+    def sampled_span(self, name: str) -> ContextManager:
+        """Time one in sample_every executions of a hot block, counting all"""
+        if not self._timing:
+            return _NO_SPAN
+        stats = self._spans.get(name)
+        if stats is None:
+            stats = self._spans[name] = SpanStats()
+        stats.calls += 1
+        if (stats.calls - 1) % self._sample_every:
+            return _NO_SPAN
+        return _Span(stats)
 
     def log_error(
         self, object_id: str, category: str, message: Optional[str] = None
     ) -> None:
         """Log an error for a specific object under a category"""
-        self._errors[category].add(object_id)
-        if message:
-            self._structlog.error(message, object_id=object_id, category=category)
-        else:
-            self._structlog.error(
-                "Error logged", object_id=object_id, category=category
-            )
+        self._log("error", object_id, category, message or "Error logged")
 
     def log_warning(
         self, object_id: str, category: str, message: Optional[str] = None
     ) -> None:
         """Log a warning for a specific object under a category"""
-        self._warnings[category].add(object_id)
-        if message:
-            self._structlog.warning(message, object_id=object_id, category=category)
-        else:
-            self._structlog.warning(
-                "Warning logged", object_id=object_id, category=category
-            )
+        self._log("warning", object_id, category, message or "Warning logged")
 
     def log_success(
         self, object_id: str, category: str, message: Optional[str] = None
     ) -> None:
         """Log a success for a specific object under a category"""
-        self._successes[category].add(object_id)
-        if message:
-            self._structlog.info(message, object_id=object_id, category=category)
-        else:
-            self._structlog.info(
-                "Success logged", object_id=object_id, category=category
-            )
+        self._log("success", object_id, category, message or "Success logged")
 
     def log_info(
         self, object_id: str, category: str, message: Optional[str] = None
     ) -> None:
         """Log information for a specific object under a category"""
-        self._info[category].add(object_id)
-        if message:
-            self._structlog.info(message, object_id=object_id, category=category)
+        self._log("info", object_id, category, message or "Information logged")
+
+    def _log(self, level: str, object_id: str, category: str, message: str) -> None:
+        if self.buffered:
+            categories = self._categories[level]
+            category_log = categories.get(category)
+            if category_log is None:
+                category_log = categories[category] = CategoryLog(
+                    self._sample_size, self._random
+                )
+            category_log.add(object_id, message)
         else:
-            self._structlog.info(
-                "Information logged", object_id=object_id, category=category
-            )
+            self._counts[level][category] += 1
+            self._objects[level][category].add(object_id)
+
+        if self._sink is not None:
+            try:
+                self._sink.put_nowait((level, object_id, category, message))
+            except queue.Full:
+                self.dropped_events += 1
+        elif not self.buffered:
+            self._emit(level, message, object_id=object_id, category=category)
+
+    def _emit(self, level: str, message: str, **fields) -> None:
+        getattr(self._structlog, _STRUCTLOG_METHODS[level])(message, **fields)
 
-    @staticmethod
-    def _convert_sets_to_lists(data: Dict[str, Set[str]]) -> Dict[str, list]:
-        """Convert set values to lists in dictionary"""
-        return {category: list(objects) for category, objects in data.items()}
+    def _drain_sink(self) -> None:
+        while True:
+            event = self._sink.get()
+            if event is None:
+                return
+            level, object_id, category, message = event
+            self._emit(level, message, object_id=object_id, category=category)
+
+    def close(self) -> None:
+        """Stop the background sink once it has emitted the queued events"""
+        if self._sink_thread is None:
+            return
+        self._sink.put(None)
+        self._sink_thread.join()
+        self._sink_thread = None
+
+    def take_events(self) -> Dict:
+        """
+        Return the logged events and forget them, e.g. to send the events of
+        a worker process to the logger of the run with merge_events.
+        """
+        events = {
+            "categories": {
+                level: {
+                    category: (category_log.count, category_log.samples)
+                    for category, category_log in categories.items()
+                }
+                for level, categories in self._categories.items()
+            },
+            "counts": {level: dict(counts) for level, counts in self._counts.items()},
+            "objects": {
+                level: dict(objects) for level, objects in self._objects.items()
+            },
+            "dropped_events": self.dropped_events,
+        }
+        for level in _STRUCTLOG_METHODS:
+            self._categories[level] = {}
+            self._counts[level] = defaultdict(int)
+            self._objects[level] = defaultdict(set)
+        self.dropped_events = 0
+        return events
+
+    def merge_events(self, events: Dict) -> None:
+        """Add the events taken from another logger of the same mode"""
+        for level, categories in events["categories"].items():
+            for category, (count, samples) in categories.items():
+                category_log = self._categories[level].get(category)
+                if category_log is None:
+                    category_log = self._categories[level][category] = CategoryLog(
+                        self._sample_size, self._random
+                    )
+                category_log.merge(count, samples)
+        for level, counts in events["counts"].items():
+            for category, count in counts.items():
+                self._counts[level][category] += count
+        for level, objects in events["objects"].items():
+            for category, object_ids in objects.items():
+                self._objects[level][category].update(object_ids)
+        self.dropped_events += events["dropped_events"]
+
+    def _summary(self, level: str) -> Dict[str, list]:
+        if self.buffered:
+            return {
+                category: category_log.sample_ids()
+                for category, category_log in self._categories[level].items()
+            }
+        return {
+            category: list(objects)
+            for category, objects in self._objects[level].items()
+        }
 
     def get_warnings_summary(self) -> Dict[str, list]:
-        """Get all warnings grouped by category"""
-        return self._convert_sets_to_lists(self._warnings)
+        """Get all warnings grouped by category, sampled when buffered"""
+        return self._summary("warning")
 
     def get_errors_summary(self) -> Dict[str, list]:
-        """Get all errors grouped by category"""
-        return self._convert_sets_to_lists(self._errors)
+        """Get all errors grouped by category, sampled when buffered"""
+        return self._summary("error")
 
     def get_success_summary(self) -> Dict[str, list]:
-        """Get all successes grouped by category"""
-        return self._convert_sets_to_lists(self._successes)
+        """Get all successes grouped by category, sampled when buffered"""
+        return self._summary("success")
 
     def get_info_summary(self) -> Dict[str, list]:
-        """Get all info logs grouped by category"""
-        return self._convert_sets_to_lists(self._info)
+        """Get all info logs grouped by category, sampled when buffered"""
+        return self._summary("info")
+
+    def get_category_summary(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Get the event count and samples of every category of every level.
+
+        Unbuffered logging keeps no messages, its samples are the first
+        sample_size object ids of each category.
+        """
+        if self.buffered:
+            return {
+                level: {
+                    category: category_log.summary()
+                    for category, category_log in categories.items()
+                }
+                for level, categories in self._categories.items()
+                if categories
+            }
+        return {
+            level: {
+                category: {
+                    "count": count,
+                    "sample_ids": list(
+                        islice(self._objects[level][category], self._sample_size)
+                    ),
+                    "sample_messages": [],
+                }
+                for category, count in counts.items()
+            }
+            for level, counts in self._counts.items()
+            if counts
+        }
+
+    def log_category_summary(self) -> None:
+        """Log one aggregated line per category, and the events the sink dropped"""
+        for level, categories in self.get_category_summary().items():
+            for category, summary in categories.items():
+                self._emit(level, "Log summary", category=category, **summary)
+        if self.dropped_events:
+            self._structlog.warning(
+                "Log events dropped", dropped_events=self.dropped_events
+            )
+
+    def timed_iteration(self, iterable: Iterable, name: str) -> Iterable:
+        """Time the production of the items of an iterable as a sampled span"""
+        if not self._timing:
+            return iterable
+        return self._timed_iteration(iter(iterable), name)
+
+    def _timed_iteration(self, iterator: Iterator, name: str) -> Iterator:
+        done = object()
+        while True:
+            with self.sampled_span(name):
+                item = next(iterator, done)
+            if item is done:
+                return
+            yield item
+
+    def get_timing_summary(self) -> Dict[str, Dict[str, float]]:
+        """Get the timing of every span, in the order they were first entered"""
+        return {name: stats.summary() for name, stats in self._spans.items()}
+
+    def log_timing_summary(self, file_name: Optional[str] = None) -> None:
+        """Log the timing of every span, also writing it to a JSON file if given"""
+        summary = self.get_timing_summary()
+        for name, stats in summary.items():
+            self._structlog.info("Timing", span=name, **stats)
+        if file_name:
+            with open(file_name, "w", encoding="utf-8") as file:
+                json.dump(summary, file, indent=2)
@@ -0,0 +1,13 @@
+import json
+from typing import Dict
+
+from specklepy.transports.server import ServerTransport
+
+
+def fetch_single_object(transport: ServerTransport, object_id: str) -> Dict:
+    """Fetch the raw JSON of an object, without any of its children."""
+    response = transport.session.get(
+        f"{transport.url}/objects/{transport.stream_id}/{object_id}/single"
+    )
+    response.raise_for_status()
+    return json.loads(response.text)
@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.domain.carbon.concrete_reinforcement import ReinforcementRates
+from src.domain.carbon.databases.base import EmissionFactorDatabase
+from src.domain.carbon.emission_factor_registry import EmissionFactorRegistry
+from src.domain.carbon.material_alias_service import MaterialAliasService
+from src.domain.carbon.schema import EmissionFactor
+from src.domain.types import ElementCategory
+
+if TYPE_CHECKING:
+    from src.domain.carbon.databases.concrete.metric import ConcreteEmissionDatabase
+
+PSI_PER_MPA = 145.038
+
+# Concrete element type used for database lookup, per element category
+CONCRETE_ELEMENT_TYPES = {
+    ElementCategory.SLAB: "Slab",
+    ElementCategory.WALL: "Wall",
+    ElementCategory.COLUMN: "Column",
+    ElementCategory.BEAM: "Beam",
+    ElementCategory.FOUNDATION: "Foundation",
+}
+
+# Concrete element type of categories without one
+DEFAULT_CONCRETE_TYPE = "Beam"
+
+# Concrete element types in the order of their codes in a CarbonBatch
+CONCRETE_TYPES = list(dict.fromkeys(CONCRETE_ELEMENT_TYPES.values()))
+CONCRETE_TYPE_CODES = {
+    element_type: code for code, element_type in enumerate(CONCRETE_TYPES)
+}
+
+
+class ConcreteTypePlan(NamedTuple):
+    """What the calculation of a concrete element type needs, resolved once."""
+
+    element_type: str
+    code: int  # in CONCRETE_TYPES
+    column: int  # in the factor table of the concrete database
+    factors: Tuple[Optional[EmissionFactor], ...]  # per strength bin
+    reinforcement_rate: float  # kg/m³
+    rebar_factor: Optional[EmissionFactor]
+
+
+@dataclass(frozen=True)
+class CalculationPlan:
+    """
+    Calculator settings compiled into the tables of the carbon calculation.
+
+    The timber, steel and concrete databases are resolved, and every element
+    category maps to its concrete type plan, so calculating a material only
+    indexes tables. Plans are pickled as their settings and compiled again on
+    the receiving side, which resolves the shared database handles of that
+    process.
+    """
+
+    settings: Mapping
+    timber_table: EmissionFactorDatabase
+    steel_table: EmissionFactorDatabase
+    aliases: MaterialAliasService
+    concrete_table: "ConcreteEmissionDatabase"
+    concrete_types: Tuple[ConcreteTypePlan, ...]  # by code
+    concrete_categories: Mapping[ElementCategory, ConcreteTypePlan]
+    type_columns: np.ndarray  # factor table column of each concrete type code
+    rebar_factor: Optional[EmissionFactor]
+    # Strengths above 100 are taken as PSI and divided by this, if set
+    psi_per_mpa: Optional[float]
+    interpolate_concrete_strength: bool
+
+    @classmethod
+    def compile(
+        cls,
+        steel_database: str,
+        timber_database: str,
+        concrete_database: str,
+        country: str,
+        custom_reinforcement_rates: Dict[str, float],
+        interpolate_concrete_strength: bool = False,
+        registry: Optional[EmissionFactorRegistry] = None,
+    ) -> "CalculationPlan":
+        """
+        Compile a plan from calculator settings.
+
+        Args:
+            registry: Registry to resolve the databases with, a new one if None
+        """
+        registry = registry or EmissionFactorRegistry()
+        settings = {
+            "steel_database": steel_database,
+            "timber_database": timber_database,
+            "concrete_database": concrete_database,
+            "country": country,
+            "custom_reinforcement_rates": dict(custom_reinforcement_rates),
+            "interpolate_concrete_strength": interpolate_concrete_strength,
+        }
+
+        concrete_table = registry.get_concrete_database(concrete_database)
+        rebar_factor = registry.get_steel_factor("Rebar", steel_database)
+        reinforcement_rates = ReinforcementRates(custom_reinforcement_rates)
+        concrete_types = []
+        for code, element_type in enumerate(CONCRETE_TYPES):
+            column = concrete_table.element_type_indices[element_type]
+            concrete_types.append(
+                ConcreteTypePlan(
+                    element_type=element_type,
+                    code=code,
+                    column=column,
+                    factors=tuple(
+                        concrete_table.factor_at(strength_index, column)
+                        for strength_index in range(len(concrete_table.strength_bins))
+                    ),
+                    reinforcement_rate=reinforcement_rates.get_rate(element_type),
+                    rebar_factor=rebar_factor,
+                )
+            )
+
+        type_columns = np.asarray(
+            [concrete_type.column for concrete_type in concrete_types], dtype=np.int64
+        )
+        type_columns.flags.writeable = False
+        return cls(
+            settings=MappingProxyType(settings),
+            timber_table=registry.get_timber_database(timber_database),
+            steel_table=registry.get_steel_database(steel_database),
+            aliases=registry.alias_service,
+            concrete_table=concrete_table,
+            concrete_types=tuple(concrete_types),
+            concrete_categories=MappingProxyType(
+                {
+                    category: concrete_types[
+                        CONCRETE_TYPE_CODES[
+                            CONCRETE_ELEMENT_TYPES.get(category, DEFAULT_CONCRETE_TYPE)
+                        ]
+                    ]
+                    for category in ElementCategory
+                }
+            ),
+            type_columns=type_columns,
+            rebar_factor=rebar_factor,
+            psi_per_mpa=PSI_PER_MPA if country == "USA" else None,
+            interpolate_concrete_strength=interpolate_concrete_strength,
+        )
+
+    def __reduce__(self):
+        return _compile_plan, (dict(self.settings),)
+
+    def timber_factor(self, material_name: str) -> Optional[EmissionFactor]:
+        """Timber factor of a material name, trying its normalized name next."""
+        factor = self.timber_table.get_factor(material_name)
+        if factor:
+            return factor
+        return self.timber_table.get_factor(
+            self.aliases.normalize_timber_name(material_name)
+        )
+
+    def steel_factor(self, grade: str) -> Optional[EmissionFactor]:
+        """Steel factor of a grade, trying its normalized name next."""
+        factor = self.steel_table.get_factor(grade)
+        if factor:
+            return factor
+        return self.steel_table.get_factor(self.aliases.normalize_steel_name(grade))
+
+    def concrete_type(self, element_category: ElementCategory) -> ConcreteTypePlan:
+        """Concrete type plan of an element category, Beam if it has none."""
+        plan = self.concrete_categories.get(element_category)
+        if plan is None:
+            plan = self.concrete_types[CONCRETE_TYPE_CODES[DEFAULT_CONCRETE_TYPE]]
+        return plan
+
+    def strength_mpa(self, strength: float) -> float:
+        """Strength in MPa, converting PSI values of US models."""
+        if self.psi_per_mpa and strength > 100:
+            return strength / self.psi_per_mpa
+        return strength
+
+
+def _compile_plan(settings: Dict) -> CalculationPlan:
+    return CalculationPlan.compile(**settings)
@@ -0,0 +1,247 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.carbon.schema import EmissionFactor
+from src.domain.types import (
+    BuildingElement,
+    CarbonResult,
+    ConcreteCarbonResult,
+    ElementCategory,
+    Material,
+)
+
+# Category codes of the material rows
+WOOD = 0
+METAL = 1
+CONCRETE = 2
+FALLBACK = 3
+
+
+class CarbonBatch:
+    """
+    Column store of the materials of many elements and their carbon.
+
+    Rows are the materials of all elements in order. Quantities, strengths,
+    category codes and factor indices are kept as columns so the carbon of
+    every row is computed with a handful of array operations. Rows that
+    cannot take that path are marked FALLBACK and carry the outcome of the
+    regular per-material calculation instead.
+    """
+
+    def __init__(
+        self,
+        elements: Sequence[BuildingElement],
+        timber_database: str,
+        steel_database: str,
+        concrete_database: str,
+    ):
+        self._timber_database = timber_database
+        self._steel_database = steel_database
+        self._concrete_database = concrete_database
+
+        self._materials: List[Material] = []
+        self._element_categories: List[ElementCategory] = []
+        self._offsets = [0]
+        for element in elements:
+            self._materials.extend(element.materials)
+            self._element_categories.extend([element.category] * len(element.materials))
+            self._offsets.append(len(self._materials))
+
+        # Columns are filled as plain lists and converted to arrays once extracted
+        row_count = len(self._materials)
+        self._category = [FALLBACK] * row_count
+        self._volume = [0.0] * row_count
+        self._mass = [0.0] * row_count
+        self._strength = [0.0] * row_count
+        self._concrete_type = [0] * row_count
+        self._factor_index = [-1] * row_count
+        self._concrete_factor = [0.0] * row_count
+
+        self.factors: List[EmissionFactor] = []
+        self._factor_indices: Dict[int, int] = {}
+
+        self._fallback: Dict[int, Tuple[Optional[CarbonResult], List[Dict]]] = {}
+        self._reinforcement_rates: List[float] = []
+        self._rebar_factor: Optional[EmissionFactor] = None
+        self._total: List[float] = []
+        self._concrete_carbon: List[float] = []
+        self._reinforcement_mass: List[float] = []
+        self._reinforcement_carbon: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def iter_materials(self) -> Iterator[Tuple[Material, ElementCategory]]:
+        """Yield every material row with the category of its element."""
+        return zip(self._materials, self._element_categories)
+
+    def _add_factor(self, factor: EmissionFactor) -> int:
+        """Return the index of a factor in the factor table, adding it if needed."""
+        index = self._factor_indices.get(id(factor))
+        if index is None:
+            index = len(self.factors)
+            self.factors.append(factor)
+            self._factor_indices[id(factor)] = index
+        return index
+
+    def set_wood(self, row: int, volume: float, factor: EmissionFactor) -> None:
+        self._category[row] = WOOD
+        self._volume[row] = volume
+        self._factor_index[row] = self._add_factor(factor)
+
+    def set_metal(self, row: int, mass: float, factor: EmissionFactor) -> None:
+        self._category[row] = METAL
+        self._mass[row] = mass
+        self._factor_index[row] = self._add_factor(factor)
+
+    def set_concrete(
+        self, row: int, volume: float, strength: float, concrete_type: int
+    ) -> None:
+        self._category[row] = CONCRETE
+        self._volume[row] = volume
+        self._strength[row] = strength
+        self._concrete_type[row] = concrete_type
+
+    def concrete_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the row numbers, strengths and element type codes of concrete rows."""
+        rows = np.flatnonzero(np.asarray(self._category, dtype=np.int8) == CONCRETE)
+        return (
+            rows,
+            np.asarray(self._strength, dtype=np.float64)[rows],
+            np.asarray(self._concrete_type, dtype=np.int64)[rows],
+        )
+
+    def set_concrete_factors(
+        self,
+        rows: np.ndarray,
+        factor_values: np.ndarray,
+        reinforcement_rates: Sequence[float],
+        rebar_factor: Optional[EmissionFactor],
+    ) -> None:
+        """
+        Assign the resolved concrete factor value of each concrete row.
+
+        Rows without a concrete factor (zero or NaN), or all rows if there is
+        no rebar factor, are moved to the fallback path.
+        """
+        self._reinforcement_rates = list(reinforcement_rates)
+        self._rebar_factor = rebar_factor
+        resolved = np.nan_to_num(factor_values, nan=0.0) != 0
+        if not rebar_factor:
+            resolved[:] = False
+        for row, value, is_resolved in zip(
+            rows.tolist(), factor_values.tolist(), resolved.tolist()
+        ):
+            if is_resolved:
+                self._concrete_factor[row] = value
+            else:
+                self._category[row] = FALLBACK
+
+    def fallback_materials(self) -> Iterator[Tuple[int, Material, ElementCategory]]:
+        """Yield the rows that need the regular per-material calculation."""
+        for row, category in enumerate(self._category):
+            if category == FALLBACK:
+                yield row, self._materials[row], self._element_categories[row]
+
+    def set_fallback_outcome(
+        self, row: int, result: Optional[CarbonResult], errors: List[Dict]
+    ) -> None:
+        self._fallback[row] = (result, errors)
+
+    def compute(self) -> None:
+        """Compute the carbon of every fast-path row with array operations."""
+        category = np.asarray(self._category, dtype=np.int8)
+        volume = np.asarray(self._volume, dtype=np.float64)
+        mass = np.asarray(self._mass, dtype=np.float64)
+        factor_index = np.asarray(self._factor_index, dtype=np.int64)
+        factor_values = np.asarray(
+            [factor.value for factor in self.factors] + [0.0], dtype=np.float64
+        )
+        concrete = category == CONCRETE
+        # Rows without a factor index -1 point at the trailing zero
+        factor = np.where(
+            concrete,
+            np.asarray(self._concrete_factor, dtype=np.float64),
+            factor_values[factor_index],
+        )
+        concrete_carbon = volume * factor
+        if self._reinforcement_rates:
+            rate = np.asarray(self._reinforcement_rates, dtype=np.float64)[
+                np.asarray(self._concrete_type, dtype=np.int64)
+            ]
+        else:
+            rate = np.zeros(len(category))
+        reinforcement_mass = volume * rate / 1000
+        rebar_value = self._rebar_factor.value if self._rebar_factor else 0.0
+        reinforcement_carbon = reinforcement_mass * rebar_value
+
+        total = np.where(
+            category == WOOD,
+            volume * factor,
+            np.where(
+                category == METAL,
+                mass * factor,
+                np.where(concrete, concrete_carbon + reinforcement_carbon, 0.0),
+            ),
+        )
+
+        self._total = total.tolist()
+        self._concrete_carbon = concrete_carbon.tolist()
+        self._reinforcement_mass = reinforcement_mass.tolist()
+        self._reinforcement_carbon = reinforcement_carbon.tolist()
+
+    def element_results(
+        self, index: int
+    ) -> Tuple[Dict[str, CarbonResult], List[Dict[str, str]]]:
+        """Materialize the results and errors of one element, as calculate_carbon would."""
+        results: Dict[str, CarbonResult] = {}
+        errors: List[Dict[str, str]] = []
+        for row in range(self._offsets[index], self._offsets[index + 1]):
+            material = self._materials[row]
+            category = self._category[row]
+            if category == FALLBACK:
+                result, row_errors = self._fallback[row]
+                if result is not None:
+                    results[material.properties.name] = result
+                errors.extend(row_errors)
+                continue
+
+            if category == CONCRETE:
+                results[material.properties.name] = ConcreteCarbonResult(
+                    factor=self._concrete_factor[row],
+                    total_carbon=self._total[row],
+                    category="Concrete",
+                    quantity=material.properties.volume,
+                    database=self._concrete_database,
+                    concrete_volume=material.properties.volume,
+                    concrete_carbon=self._concrete_carbon[row],
+                    reinforcement_mass=self._reinforcement_mass[row],
+                    reinforcement_rate=self._reinforcement_rates[
+                        self._concrete_type[row]
+                    ],
+                    reinforcement_factor=self._rebar_factor.value,
+                    reinforcement_carbon=self._reinforcement_carbon[row],
+                )
+                continue
+
+            factor = self.factors[self._factor_index[row]]
+            if category == WOOD:
+                result = CarbonResult(
+                    factor=factor.value,
+                    total_carbon=self._total[row],
+                    category="Wood",
+                    quantity=material.properties.volume,
+                    database=self._timber_database,
+                )
+            else:
+                result = CarbonResult(
+                    factor=factor.value,
+                    total_carbon=self._total[row],
+                    category="Metal",
+                    quantity=material.mass,
+                    database=self._steel_database,
+                )
+            results[material.properties.name] = result
+
+        return results, errors
@@ -1,14 +1,49 @@
-from typing import Dict, Optional, Tuple, List
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Set, Tuple, List
 
-from src.domain.carbon.concrete_reinforcement import ReinforcementRates
-from src.domain.carbon.emission_factor_registry import EmissionFactorRegistry
+import numpy as np
+
+from src.domain.carbon.schema import EmissionFactor
 from src.domain.types import (
     BuildingElement,
     CarbonResult,
+    ConcreteCarbonResult,
     Material,
     MaterialType,
     ElementCategory,
 )
+from src.infrastructure.cache import BoundedCache
+from src.infrastructure.logging import Logging
+from src.services.calculation_plan import CalculationPlan
+from src.services.carbon_batch import CarbonBatch
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class CalculationStatus(Enum):
+    OK = "ok"
+    MISSING_FACTOR = "missing_factor"
+    MISSING_INPUT = "missing_input"
+
+
+@dataclass(slots=True)
+class MaterialCalculation:
+    """
+    Outcome of the carbon calculation of a single material.
+
+    A material without an emission factor or a required input has no result,
+    and a message instead. Missing factors also carry the kind ("timber",
+    "steel" or "concrete") and key of the factor that was looked up.
+    """
+
+    status: CalculationStatus
+    result: Optional[CarbonResult] = None
+    message: Optional[str] = None
+    factor_kind: Optional[str] = None
+    factor_key: Optional[str] = None
 
 
 class CarbonCalculator:
@@ -21,29 +56,52 @@ class CarbonCalculator:
         concrete_database: str,
         country: str,
         custom_reinforcement_rates: Dict[str, float],
+        interpolate_concrete_strength: bool = False,
+        logger: Optional[Logging] = None,
     ):
-        # Store database selections
-        self._steel_database = steel_database
-        self._timber_database = timber_database
-        self._concrete_database = concrete_database
-        self._country = country
-
-        # Initialize registry
-        self._registry = EmissionFactorRegistry()
+        self._init_from_plan(
+            CalculationPlan.compile(
+                steel_database=steel_database,
+                timber_database=timber_database,
+                concrete_database=concrete_database,
+                country=country,
+                custom_reinforcement_rates=custom_reinforcement_rates,
+                interpolate_concrete_strength=interpolate_concrete_strength,
+            ),
+            logger,
+        )
 
-        # Initialize reinforcement rates with the provided dictionary
-        # TODO: Validate inputs (e.g. C# int.TryParse()? )
-        self._reinforcement_rates = ReinforcementRates(custom_reinforcement_rates)
+    @classmethod
+    def from_plan(
+        cls, plan: CalculationPlan, logger: Optional[Logging] = None
+    ) -> "CarbonCalculator":
+        """Create a calculator from a compiled plan, e.g. one sent to a worker."""
+        calculator = cls.__new__(cls)
+        calculator._init_from_plan(plan, logger)
+        return calculator
 
-        # Cache common material factors to avoid repeated lookups
-        self._steel_factors_cache = {}
-        self._timber_factors_cache = {}
-        self._concrete_factors_cache = {}
+    def _init_from_plan(self, plan: CalculationPlan, logger: Optional[Logging]) -> None:
+        self._plan = plan
+        # Times the factor lookups once timing is enabled on it
+        self.logger = logger or Logging()
 
-        # Track missing factors
-        self._missing_timber_factors = set()
-        self._missing_steel_factors = set()
-        self._missing_concrete_factors = set()
+        # Store database selections
+        self._steel_database = plan.settings["steel_database"]
+        self._timber_database = plan.settings["timber_database"]
+        self._concrete_database = plan.settings["concrete_database"]
+
+        # Cache material factors to avoid repeated lookups, including names
+        # without a factor. The set of names in a model is bounded by the model
+        self._steel_factors_cache = BoundedCache(maxsize=None)
+        self._timber_factors_cache = BoundedCache(maxsize=None)
+
+        # Track missing factors by kind, and share the outcome of each miss
+        self._missing_factors: Dict[str, Set[str]] = {
+            "timber": set(),
+            "steel": set(),
+            "concrete": set(),
+        }
+        self._missing_outcomes: Dict[Tuple[str, str], MaterialCalculation] = {}
 
     def calculate_carbon(
         self, element: BuildingElement
@@ -53,45 +111,149 @@ class CarbonCalculator:
         errors = []
 
         for material in element.materials:
-            try:
-                if material.type == MaterialType.CONCRETE:
-                    result = self._calculate_concrete_carbon(material, element.category)
-                else:
-                    result = self._calculate_material_carbon(material)
-                results[material.properties.name] = result
-            except Exception as e:
-                # Track missing factors
-                if "No emission factor found" in str(e):
-                    if material.type == MaterialType.WOOD:
-                        material_key = (
-                            material.properties.structural_asset
-                            or material.properties.name
-                        )
-                        self._missing_timber_factors.add(material_key)
-                    elif material.type == MaterialType.METAL:
-                        self._missing_steel_factors.add(
-                            material.grade or material.properties.name
-                        )
-                    elif material.type == MaterialType.CONCRETE:
-                        # Track missing concrete factors
-                        strength = str(int(material.properties.compressive_strength))
-                        element_type = self._map_element_category_to_concrete_type(
-                            element.category
-                        )
-                        self._missing_concrete_factors.add(f"{strength}_{element_type}")
-
-                # Store error with material name instead of just printing
-                error_msg = (
-                    f"No emission factor found for {material.properties.name}: {str(e)}"
-                )
-                errors.append({"material": material.properties.name, "error": str(e)})
+            self._calculate_material_into(material, element.category, results, errors)
 
         return results, errors
 
-    def _calculate_material_carbon(
+    def calculate_batch(self, elements: Sequence[BuildingElement]) -> CarbonBatch:
+        """
+        Calculate carbon emissions for many elements at once.
+
+        Quantities are extracted into columns and the carbon of all concrete,
+        reinforcement, steel and timber materials is computed with array
+        operations. Per-element results are materialized on demand with
+        CarbonBatch.element_results and match calculate_carbon exactly.
+        Materials that cannot take the fast path (missing factors or
+        quantities) go through the regular calculation, so errors and
+        missing-factor tracking are unchanged.
+        """
+        batch = CarbonBatch(
+            elements,
+            timber_database=self._timber_database,
+            steel_database=self._steel_database,
+            concrete_database=self._concrete_database,
+        )
+
+        for row, (material, element_category) in enumerate(batch.iter_materials()):
+            if material.type == MaterialType.WOOD:
+                self._add_wood_to_batch(batch, row, material)
+            elif material.type == MaterialType.METAL:
+                self._add_metal_to_batch(batch, row, material)
+            elif (
+                material.type == MaterialType.CONCRETE
+                and isinstance(material.properties.volume, float)
+                and _is_number(material.properties.compressive_strength)
+                and material.properties.compressive_strength
+            ):
+                batch.set_concrete(
+                    row,
+                    material.properties.volume,
+                    material.properties.compressive_strength,
+                    self._plan.concrete_type(element_category).code,
+                )
+
+        with self.logger.sampled_span("factor_lookup"):
+            self._resolve_batch_concrete_factors(batch)
+        batch.compute()
+
+        # Materials off the fast path run through the regular calculation
+        for row, material, element_category in batch.fallback_materials():
+            results: Dict[str, CarbonResult] = {}
+            errors: List[Dict[str, str]] = []
+            self._calculate_material_into(material, element_category, results, errors)
+            batch.set_fallback_outcome(
+                row, results.get(material.properties.name), errors
+            )
+
+        return batch
+
+    def _add_wood_to_batch(
+        self, batch: CarbonBatch, row: int, material: Material
+    ) -> None:
+        """Put a timber material on the fast path if its factor and volume are known."""
+        if not isinstance(material.properties.volume, float):
+            return
+        material_name = material.properties.structural_asset
+        if material_name is None:
+            material_name = material.properties.name
+        try:
+            factor = self._lookup_timber_factor(material_name)
+        except Exception:
+            return
+        if factor:
+            batch.set_wood(row, material.properties.volume, factor)
+
+    def _add_metal_to_batch(
+        self, batch: CarbonBatch, row: int, material: Material
+    ) -> None:
+        """Put a metal material on the fast path if its factor and mass are known."""
+        if not isinstance(material.mass, float):
+            return
+        try:
+            factor = self._lookup_steel_factor(material.grade)
+        except Exception:
+            return
+        if factor:
+            batch.set_metal(row, material.mass, factor)
+
+    def _resolve_batch_concrete_factors(self, batch: CarbonBatch) -> None:
+        """Resolve the concrete factors of all concrete rows from the factor table."""
+        rows, strength_mpa, concrete_types = batch.concrete_columns()
+        if not len(rows):
+            return
+
+        # Handle unit conversion based on country
+        plan = self._plan
+        if plan.psi_per_mpa:
+            strength_mpa = np.where(
+                strength_mpa > 100, strength_mpa / plan.psi_per_mpa, strength_mpa
+            )
+
+        # Snap or interpolate every strength at once
+        factor_values = plan.concrete_table.factor_values(
+            strength_mpa,
+            plan.type_columns[concrete_types],
+            interpolate=plan.interpolate_concrete_strength,
+        )
+
+        batch.set_concrete_factors(
+            rows,
+            factor_values,
+            [concrete_type.reinforcement_rate for concrete_type in plan.concrete_types],
+            plan.rebar_factor,
+        )
+
+    def _calculate_material_into(
+        self,
+        material: Material,
+        element_category: ElementCategory,
+        results: Dict[str, CarbonResult],
+        errors: List[Dict[str, str]],
+    ) -> None:
+        """Calculate a single material, adding its result or error to the collections."""
+        try:
+            outcome = self.calculate_material(material, element_category)
+        except Exception as e:
+            # Store error with material name instead of just printing
+            errors.append({"material": material.properties.name, "error": str(e)})
+            return
+
+        if outcome.status is CalculationStatus.OK:
+            results[material.properties.name] = outcome.result
+            return
+        if outcome.status is CalculationStatus.MISSING_FACTOR:
+            self._missing_factors[outcome.factor_kind].add(outcome.factor_key)
+        errors.append({"material": material.properties.name, "error": outcome.message})
+
+    def calculate_material(
         self, material: Material, element_category: Optional[ElementCategory] = None
-    ) -> CarbonResult:
-        """Calculate carbon emissions for a single material."""
+    ) -> MaterialCalculation:
+        """
+        Calculate carbon emissions for a single material.
+
+        Missing emission factors and inputs are returned as a status rather
+        than raised, exceptions only signal unexpected failures.
+        """
         if material.type == MaterialType.METAL:
             return self._calculate_metal_carbon(material)
         elif material.type == MaterialType.WOOD:
@@ -105,30 +267,56 @@ class CarbonCalculator:
         else:
             raise ValueError(f"Unsupported material type: {material.type}")
 
-    def _calculate_metal_carbon(self, material: Material) -> CarbonResult:
+    def _missing_factor(self, kind: str, key: str, message: str) -> MaterialCalculation:
+        """Return the outcome of a missing factor, shared by every miss of its key."""
+        outcome = self._missing_outcomes.get((kind, key))
+        if outcome is None:
+            outcome = self._missing_outcomes[(kind, key)] = MaterialCalculation(
+                CalculationStatus.MISSING_FACTOR,
+                message=message,
+                factor_kind=kind,
+                factor_key=key,
+            )
+        return outcome
+
+    def _lookup_timber_factor(self, material_name: str) -> Optional[EmissionFactor]:
+        """Get a timber factor from cache or the plan's timber database."""
+        with self.logger.sampled_span("factor_lookup"):
+            return self._timber_factors_cache.get_or_compute(
+                material_name, lambda: self._plan.timber_factor(material_name)
+            )
+
+    def _lookup_steel_factor(self, grade: str) -> Optional[EmissionFactor]:
+        """Get a steel factor from cache or the plan's steel database."""
+        with self.logger.sampled_span("factor_lookup"):
+            return self._steel_factors_cache.get_or_compute(
+                grade, lambda: self._plan.steel_factor(grade)
+            )
+
+    def _calculate_metal_carbon(self, material: Material) -> MaterialCalculation:
         """Calculate carbon emissions for metal."""
 
-        # Get factor from cache or registry
-        if material.grade not in self._steel_factors_cache:
-            factor = self._registry.get_steel_factor(
-                material.grade, self._steel_database
+        # Get factor from cache or the plan
+        factor = self._lookup_steel_factor(material.grade)
+        if not factor:
+            return self._missing_factor(
+                "steel",
+                material.grade or material.properties.name,
+                f"No emission factor found for metal grade: {material.grade}",
             )
-            if not factor:
-                raise ValueError(
-                    f"No emission factor found for metal grade: {material.grade}"
-                )
-            self._steel_factors_cache[material.grade] = factor
-
-        factor = self._steel_factors_cache[material.grade]
-        return CarbonResult(
-            factor=factor.value,
-            total_carbon=material.mass * factor.value,
-            category="Metal",
-            quantity=material.mass,
-            database=self._steel_database,
+
+        return MaterialCalculation(
+            CalculationStatus.OK,
+            CarbonResult(
+                factor=factor.value,
+                total_carbon=material.mass * factor.value,
+                category="Metal",
+                quantity=material.mass,
+                database=self._steel_database,
+            ),
         )
 
-    def _calculate_wood_carbon(self, material: Material) -> CarbonResult:
+    def _calculate_wood_carbon(self, material: Material) -> MaterialCalculation:
         """Calculate carbon emissions for wood."""
         material_name = material.properties.structural_asset
 
@@ -137,132 +325,135 @@ class CarbonCalculator:
             # Extract material type from name
             material_name = material.properties.name
 
-        # Get factor from cache or registry
-        if material_name not in self._timber_factors_cache:
-            factor = self._registry.get_timber_factor(
-                material_name, self._timber_database
+        # Get factor from cache or the plan
+        factor = self._lookup_timber_factor(material_name)
+        if not factor:
+            return self._missing_factor(
+                "timber",
+                material_name,
+                f"No emission factor found for wood type: {material_name}",
             )
-            if not factor:
-                raise ValueError(
-                    f"No emission factor found for wood type: {material_name}"
-                )
-            self._timber_factors_cache[material_name] = factor
-
-        factor = self._timber_factors_cache[material_name]
-        return CarbonResult(
-            factor=factor.value,
-            total_carbon=material.properties.volume * factor.value,
-            category="Wood",
-            quantity=material.properties.volume,
-            database=self._timber_database,
+
+        return MaterialCalculation(
+            CalculationStatus.OK,
+            CarbonResult(
+                factor=factor.value,
+                total_carbon=material.properties.volume * factor.value,
+                category="Wood",
+                quantity=material.properties.volume,
+                database=self._timber_database,
+            ),
         )
 
     def _calculate_concrete_carbon(
         self, material: Material, element_category: ElementCategory
-    ) -> CarbonResult:
+    ) -> MaterialCalculation:
         """Calculate carbon emissions for concrete, including reinforcement."""
         if not material.properties.compressive_strength:
-            raise ValueError(
-                "Compressive strength required for concrete carbon calculation"
+            return MaterialCalculation(
+                CalculationStatus.MISSING_INPUT,
+                message="Compressive strength required for concrete carbon calculation",
             )
 
         # Handle unit conversion based on country
-        # For US, convert PSI to MPa if needed
-        strength_value = material.properties.compressive_strength
-        if self._country == "USA":
-            # Check if value is in PSI (typically large numbers)
-            if strength_value > 100:  # Assume PSI
-                strength_value = strength_value / 145.038  # Convert PSI to MPa
-
-        # Round to nearest valid strength category (25, 30, 35, 40, 45, 50)
-        valid_strengths = [25, 30, 35, 40, 45, 50]
-        strength_mpa = min(valid_strengths, key=lambda x: abs(x - strength_value))
-        strength = str(strength_mpa)
-
-        # Map element category to concrete element type for the database
-        element_type = self._map_element_category_to_concrete_type(element_category)
-
-        # Create cache key for concrete factors
-        concrete_cache_key = f"{strength}_{element_type}"
-
-        # Get concrete factor
-        if concrete_cache_key not in self._concrete_factors_cache:
-            try:
-                factor = self._registry.get_concrete_factor(
-                    strength, element_type, self._concrete_database
+        plan = self._plan
+        strength_value = plan.strength_mpa(material.properties.compressive_strength)
+
+        # Concrete element type of the element category, with its factors
+        concrete_type = plan.concrete_type(element_category)
+        element_type = concrete_type.element_type
+
+        # Interpolate between strength bins, or take the nearest one
+        # (25, 30, 35, 40, 45, 50)
+        with self.logger.sampled_span("factor_lookup"):
+            if plan.interpolate_concrete_strength:
+                strength = f"{strength_value:g}"
+                concrete_factor = plan.concrete_table.interpolated_value(
+                    strength_value, concrete_type.column
                 )
-                if not factor:
-                    self._missing_concrete_factors.add(concrete_cache_key)
-                    raise ValueError(
-                        f"No emission factor found for concrete: strength={strength}, element={element_type}"
-                    )
-                self._concrete_factors_cache[concrete_cache_key] = factor
-            except Exception as e:
-                self._missing_concrete_factors.add(concrete_cache_key)
-                raise ValueError(f"Error getting concrete factor: {str(e)}")
-
-        concrete_factor = self._concrete_factors_cache[concrete_cache_key]
+                if concrete_factor != concrete_factor:  # NaN
+                    concrete_factor = None
+            else:
+                strength_index = plan.concrete_table.strength_index(strength_value)
+                strength = plan.concrete_table.strength_labels[strength_index]
+                factor = concrete_type.factors[strength_index]
+                concrete_factor = factor.value if factor else None
+
+        if not concrete_factor:
+            return self._missing_factor(
+                "concrete",
+                f"{strength}_{element_type}",
+                f"No emission factor found for concrete: strength={strength}, "
+                f"element={element_type}",
+            )
+
+        rebar_factor = concrete_type.rebar_factor
+        if not rebar_factor:
+            return self._missing_factor(
+                "steel", "Rebar", "No emission factor found for rebar"
+            )
+
         concrete_volume = material.properties.volume
-        concrete_carbon = concrete_volume * concrete_factor.value
+        concrete_carbon = concrete_volume * concrete_factor
 
         # Calculate reinforcement carbon
-        reinforcement_rate = self._reinforcement_rates.get_rate(element_type)
+        reinforcement_rate = concrete_type.reinforcement_rate
         reinforcement_mass = (
             concrete_volume * reinforcement_rate / 1000
         )  # Convert kg to tons if needed
 
-        # Get rebar factor from steel database
-        if "Rebar" not in self._steel_factors_cache:
-            rebar_factor = self._registry.get_steel_factor(
-                "Rebar", self._steel_database
-            )
-            if not rebar_factor:
-                raise ValueError("No emission factor found for rebar")
-            self._steel_factors_cache["Rebar"] = rebar_factor
-
-        rebar_factor = self._steel_factors_cache["Rebar"]
         reinforcement_carbon = reinforcement_mass * rebar_factor.value
 
         # Total carbon is concrete + reinforcement
         total_carbon = concrete_carbon + reinforcement_carbon
 
         # Create result with additional metadata
-        return CarbonResult(
-            factor=concrete_factor.value,
-            total_carbon=total_carbon,
-            category="Concrete",
-            quantity=concrete_volume,
-            database=self._concrete_database,
-            concrete_volume=concrete_volume,
-            concrete_carbon=concrete_carbon,
-            reinforcement_mass=reinforcement_mass,
-            reinforcement_rate=reinforcement_rate,
-            reinforcement_factor=rebar_factor.value,
-            reinforcement_carbon=reinforcement_carbon,
+        return MaterialCalculation(
+            CalculationStatus.OK,
+            ConcreteCarbonResult(
+                factor=concrete_factor,
+                total_carbon=total_carbon,
+                category="Concrete",
+                quantity=concrete_volume,
+                database=self._concrete_database,
+                concrete_volume=concrete_volume,
+                concrete_carbon=concrete_carbon,
+                reinforcement_mass=reinforcement_mass,
+                reinforcement_rate=reinforcement_rate,
+                reinforcement_factor=rebar_factor.value,
+                reinforcement_carbon=reinforcement_carbon,
+            ),
         )
 
-    @staticmethod
-    def _map_element_category_to_concrete_type(
-        element_category: ElementCategory,
-    ) -> str:
-        """Map BuildingElement category to concrete element type for database lookup."""
-
-        # Default mappings
-        category_mapping = {
-            ElementCategory.SLAB: "Slab",
-            ElementCategory.WALL: "Wall",
-            ElementCategory.COLUMN: "Column",
-            ElementCategory.BEAM: "Beam",
-            ElementCategory.FOUNDATION: "Foundation",
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Return the counters of the factor caches."""
+        return {
+            "timber": self._timber_factors_cache.stats(),
+            "steel": self._steel_factors_cache.stats(),
         }
 
-        # Return the mapped type or default to "Beam" if unknown
-        return category_mapping.get(element_category, "Beam")
+    @property
+    def settings(self) -> Mapping:
+        """Constructor arguments of this calculator."""
+        return self._plan.settings
+
+    @property
+    def plan(self) -> CalculationPlan:
+        """Compiled plan of this calculator, picklable for worker processes."""
+        return self._plan
+
+    def merge_missing_factors(
+        self, timber: Iterable[str], steel: Iterable[str], concrete: Iterable[str]
+    ) -> None:
+        """Add missing factors tracked by another calculator, e.g. in a worker."""
+        self._missing_factors["timber"].update(timber)
+        self._missing_factors["steel"].update(steel)
+        self._missing_factors["concrete"].update(concrete)
 
     def get_missing_factors(self) -> Tuple[List[str], List[str], List[str]]:
         """Return lists of materials that had no emission factor."""
         return (
-            sorted(list(self._missing_timber_factors)),
-            sorted(list(self._missing_steel_factors)),
-            sorted(list(self._missing_concrete_factors)),
+            sorted(list(self._missing_factors["timber"])),
+            sorted(list(self._missing_factors["steel"])),
+            sorted(list(self._missing_factors["concrete"])),
         )
@@ -0,0 +1,122 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, NamedTuple, Sequence, Tuple
+
+from src.services.result_consumers import ResultConsumer
+
+
+class RollupKey(NamedTuple):
+    """The finest group results are rolled up into."""
+
+    level: str
+    category: str
+    material_type: str
+    database: str
+
+
+# Fields results can be grouped by
+ROLLUP_FIELDS = RollupKey._fields
+
+# Fields every material of an element shares
+ELEMENT_FIELDS = ("level", "category")
+
+
+@dataclass(slots=True)
+class RollupTotals:
+    # An element with materials in several groups is counted in each of them
+    elements: int = 0
+    materials: int = 0
+    volume: float = 0.0  # m³ of wood and concrete
+    mass: float = 0.0  # kg of metal
+    reinforcement_mass: float = 0.0  # kg of concrete reinforcement
+    total_carbon: float = 0.0  # kgCO2e
+
+    def add(self, other: "RollupTotals") -> None:
+        """Add the totals of another group to these."""
+        self.elements += other.elements
+        self.materials += other.materials
+        self.volume += other.volume
+        self.mass += other.mass
+        self.reinforcement_mass += other.reinforcement_mass
+        self.total_carbon += other.total_carbon
+
+
+class CarbonRollup(ResultConsumer):
+    """
+    Rolls processed results up by level, category, material type and database.
+
+    Only processed elements are rolled up, so the grand total matches the
+    total carbon of the run. Coarser groupings are derived from the finest
+    groups collected during the traversal.
+    """
+
+    def __init__(self):
+        self.groups: Dict[RollupKey, RollupTotals] = {}
+        self._element_counts: Counter = Counter()
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        if element_result.get("status") != "processed":
+            return
+
+        category = element_result["category"]
+        category = getattr(category, "value", category)
+        self._element_counts[(element_result["level"], category)] += 1
+        counted = set()
+        for result in element_result["carbon_results"].values():
+            key = RollupKey(
+                element_result["level"], category, result.category, result.database
+            )
+            totals = self.groups.get(key)
+            if totals is None:
+                totals = self.groups[key] = RollupTotals()
+
+            if key not in counted:
+                counted.add(key)
+                totals.elements += 1
+            totals.materials += 1
+            if result.category == "Metal":
+                totals.mass += result.quantity or 0.0
+            else:
+                totals.volume += result.quantity or 0.0
+            totals.reinforcement_mass += result.reinforcement_mass or 0.0
+            totals.total_carbon += result.total_carbon
+
+    def finalize(self, results: Dict) -> None:
+        results["rollup"] = self
+
+    def by(self, *fields: str) -> Dict[Tuple, RollupTotals]:
+        """
+        Return the totals grouped by some of the rollup fields.
+
+        Args:
+            fields: Names of ROLLUP_FIELDS, no fields gives the grand total
+                under the empty tuple
+        """
+        unknown = set(fields) - set(ROLLUP_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown rollup fields: {', '.join(sorted(unknown))}")
+
+        grouped: Dict[Tuple, RollupTotals] = {}
+        for key, totals in self.groups.items():
+            group = tuple(getattr(key, field) for field in fields)
+            if group not in grouped:
+                grouped[group] = RollupTotals()
+            grouped[group].add(totals)
+
+        # Elements are counted exactly when grouping by what they share
+        if set(fields) <= set(ELEMENT_FIELDS):
+            for totals in grouped.values():
+                totals.elements = 0
+            for (level, category), count in self._element_counts.items():
+                values = {"level": level, "category": category}
+                grouped[tuple(values[field] for field in fields)].elements += count
+        return dict(sorted(grouped.items(), key=lambda item: _sort_key(item[0])))
+
+    def total(self) -> RollupTotals:
+        """Return the totals of every processed element."""
+        return self.by().get((), RollupTotals())
+
+
+def _sort_key(group: Sequence) -> Tuple:
+    # Levels and databases may be missing, which can't be compared to strings
+    return tuple((value is None, str(value)) for value in group)
@@ -1,6 +1,11 @@
 from typing import Optional, List, Union
 
-from src.domain.types import BuildingElement, ElementCategory, Material
+from src.domain.types import (
+    BuildingElement,
+    ElementCategory,
+    Material,
+    intern_string,
+)
 from src.infrastructure.logging import Logging
 from src.services.material_processor import MaterialProcessor
 
@@ -78,7 +83,7 @@ class ElementProcessor:
     @staticmethod
     def _get_element_level(element) -> str:
         """Extract element level."""
-        return getattr(element, "level", "Unknown")
+        return intern_string(getattr(element, "level", "Unknown"))
 
     @staticmethod
     def _determine_category(element: dict) -> ElementCategory:
@@ -0,0 +1,277 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple
+
+from specklepy.objects import Base
+
+from src.domain.types import CarbonResult, ConcreteCarbonResult
+
+# Element property the carbon data of an element is attached as
+EMBODIED_CARBON_PROPERTY = "Embodied Carbon Calculation"
+
+
+class EmbodiedCarbonSchema(ABC):
+    """Layout of the "Embodied Carbon Calculation" property of an element."""
+
+    @abstractmethod
+    def build(self, carbon_results: Dict[str, CarbonResult]) -> Any:
+        """Build the property from the carbon results of an element."""
+
+    @abstractmethod
+    def parse(self, block: Any) -> Dict[str, CarbonResult]:
+        """Rebuild the carbon results a property was built from."""
+
+
+class VerboseSchema(EmbodiedCarbonSchema):
+    """Every value as a {name, value, units} entry, repeated per material."""
+
+    def build(self, carbon_results: Dict[str, CarbonResult]) -> Dict:
+        # Initialize Embodied Carbon Calculation dictionary
+        embodied_carbon_data = {}
+
+        for material_name, result in carbon_results.items():
+            # Create a dictionary for each material instead of an array
+            material_data = {}
+
+            if result.category == "Wood":
+                # For timber - use name/value/units format as dictionary entries
+                material_data = {
+                    "volume": {
+                        "name": "volume",
+                        "value": result.quantity,
+                        "units": "m³",
+                    },
+                    "database": {
+                        "name": "database",
+                        "value": result.database,
+                        "units": None,
+                    },
+                    "embodiedCarbonFactor": {
+                        "name": "embodiedCarbonFactor",
+                        "value": result.factor,
+                        "units": "kgCO₂e/m³",
+                    },
+                    "embodiedCarbon": {
+                        "name": "embodiedCarbon",
+                        "value": result.total_carbon,
+                        "units": "kgCO₂e",
+                    },
+                }
+            elif result.category == "Concrete":
+                # For concrete (include both concrete and reinforcement)
+                material_data = {
+                    "concreteVolume": {
+                        "name": "concreteVolume",
+                        "value": result.concrete_volume,
+                        "units": "m³",
+                    },
+                    "database": {
+                        "name": "database",
+                        "value": result.database,
+                        "units": None,
+                    },
+                    "concreteEmbodiedCarbonFactor": {
+                        "name": "concreteEmbodiedCarbonFactor",
+                        "value": result.factor,
+                        "units": "kgCO₂e/m³",
+                    },
+                    "concreteEmbodiedCarbon": {
+                        "name": "concreteEmbodiedCarbon",
+                        "value": result.concrete_carbon,
+                        "units": "kgCO₂e",
+                    },
+                    "reinforcementMass": {
+                        "name": "reinforcementMass",
+                        "value": result.reinforcement_mass,
+                        "units": "kg",
+                    },
+                    "reinforcementRate": {
+                        "name": "reinforcementRate",
+                        "value": result.reinforcement_rate,
+                        "units": "kg/m³",
+                    },
+                    "reinforcementEmbodiedCarbonFactor": {
+                        "name": "reinforcementEmbodiedCarbonFactor",
+                        "value": result.reinforcement_factor,
+                        "units": "kgCO₂e/kg",
+                    },
+                    "reinforcementEmbodiedCarbon": {
+                        "name": "reinforcementEmbodiedCarbon",
+                        "value": result.reinforcement_carbon,
+                        "units": "kgCO₂e",
+                    },
+                    "embodiedCarbon": {
+                        "name": "embodiedCarbon",
+                        "value": result.total_carbon,
+                        "units": "kgCO₂e",
+                    },
+                }
+            elif result.category == "Metal":
+                # For metal
+                material_data = {
+                    "mass": {
+                        "name": "mass",
+                        "value": result.quantity,
+                        "units": "kg",
+                    },
+                    "database": {
+                        "name": "database",
+                        "value": result.database,
+                        "units": None,
+                    },
+                    "embodiedCarbonFactor": {
+                        "name": "embodiedCarbonFactor",
+                        "value": result.factor,
+                        "units": "kgCO₂e/kg",
+                    },
+                    "embodiedCarbon": {
+                        "name": "embodiedCarbon",
+                        "value": result.total_carbon,
+                        "units": "kgCO₂e",
+                    },
+                }
+
+            # Add this material's data to the main dictionary
+            embodied_carbon_data[material_name] = material_data
+
+        return embodied_carbon_data
+
+    def parse(self, block: Dict) -> Dict[str, CarbonResult]:
+        carbon_results = {}
+        for material_name, data in block.items():
+            if "concreteVolume" in data:
+                carbon_results[material_name] = ConcreteCarbonResult(
+                    factor=data["concreteEmbodiedCarbonFactor"]["value"],
+                    total_carbon=data["embodiedCarbon"]["value"],
+                    category="Concrete",
+                    quantity=data["concreteVolume"]["value"],
+                    database=data["database"]["value"],
+                    concrete_volume=data["concreteVolume"]["value"],
+                    concrete_carbon=data["concreteEmbodiedCarbon"]["value"],
+                    reinforcement_mass=data["reinforcementMass"]["value"],
+                    reinforcement_rate=data["reinforcementRate"]["value"],
+                    reinforcement_factor=data["reinforcementEmbodiedCarbonFactor"][
+                        "value"
+                    ],
+                    reinforcement_carbon=data["reinforcementEmbodiedCarbon"]["value"],
+                )
+            elif "mass" in data:
+                carbon_results[material_name] = CarbonResult(
+                    factor=data["embodiedCarbonFactor"]["value"],
+                    total_carbon=data["embodiedCarbon"]["value"],
+                    category="Metal",
+                    quantity=data["mass"]["value"],
+                    database=data["database"]["value"],
+                )
+            else:
+                carbon_results[material_name] = CarbonResult(
+                    factor=data["embodiedCarbonFactor"]["value"],
+                    total_carbon=data["embodiedCarbon"]["value"],
+                    category="Wood",
+                    quantity=data["volume"]["value"],
+                    database=data["database"]["value"],
+                )
+        return carbon_results
+
+
+# Quantity field and units of each material category in the compact schema
+COMPACT_QUANTITIES = {
+    "Wood": ("volume", "m³", "kgCO₂e/m³"),
+    "Metal": ("mass", "kg", "kgCO₂e/kg"),
+    "Concrete": ("concreteVolume", "m³", "kgCO₂e/m³"),
+}
+
+
+class CompactSchema(EmbodiedCarbonSchema):
+    """
+    Per-material values as flat fields, sharing one factor definition each.
+
+    The database, factors, reinforcement rate and units of a material are
+    stored in a definition object under the detached "@definition" field.
+    Identical definitions hash to the same object id, so each unique
+    combination is uploaded once however many elements reference it. The
+    builder also reuses the same definition instance in memory.
+    """
+
+    def __init__(self):
+        self._definitions: Dict[Tuple, Base] = {}
+
+    def build(self, carbon_results: Dict[str, CarbonResult]) -> Dict[str, Base]:
+        block = {}
+        for material_name, result in carbon_results.items():
+            quantity_field = COMPACT_QUANTITIES[result.category][0]
+            material = Base()
+            material[quantity_field] = result.quantity
+            material.embodiedCarbon = result.total_carbon
+            if result.category == "Concrete":
+                material.concreteEmbodiedCarbon = result.concrete_carbon
+                material.reinforcementMass = result.reinforcement_mass
+                material.reinforcementEmbodiedCarbon = result.reinforcement_carbon
+            material["@definition"] = self._definition(result)
+            block[material_name] = material
+        return block
+
+    def parse(self, block: Dict[str, Base]) -> Dict[str, CarbonResult]:
+        carbon_results = {}
+        for material_name, material in block.items():
+            definition = material["@definition"]
+            category = definition.category
+            quantity = material[COMPACT_QUANTITIES[category][0]]
+            if category == "Concrete":
+                carbon_results[material_name] = ConcreteCarbonResult(
+                    factor=definition.embodiedCarbonFactor,
+                    total_carbon=material.embodiedCarbon,
+                    category=category,
+                    quantity=quantity,
+                    database=definition.database,
+                    concrete_volume=quantity,
+                    concrete_carbon=material.concreteEmbodiedCarbon,
+                    reinforcement_mass=material.reinforcementMass,
+                    reinforcement_rate=definition.reinforcementRate,
+                    reinforcement_factor=definition.reinforcementEmbodiedCarbonFactor,
+                    reinforcement_carbon=material.reinforcementEmbodiedCarbon,
+                )
+            else:
+                carbon_results[material_name] = CarbonResult(
+                    factor=definition.embodiedCarbonFactor,
+                    total_carbon=material.embodiedCarbon,
+                    category=category,
+                    quantity=quantity,
+                    database=definition.database,
+                )
+        return carbon_results
+
+    def _definition(self, result: CarbonResult) -> Base:
+        """Return the shared factor definition of a result."""
+        key = (
+            result.category,
+            result.database,
+            result.factor,
+            result.reinforcement_rate,
+            result.reinforcement_factor,
+        )
+        definition = self._definitions.get(key)
+        if definition is None:
+            _, quantity_units, factor_units = COMPACT_QUANTITIES[result.category]
+            definition = Base()
+            definition.category = result.category
+            definition.database = result.database
+            definition.embodiedCarbonFactor = result.factor
+            definition.quantityUnits = quantity_units
+            definition.factorUnits = factor_units
+            definition.carbonUnits = "kgCO₂e"
+            if result.category == "Concrete":
+                definition.reinforcementRate = result.reinforcement_rate
+                definition.reinforcementRateUnits = "kg/m³"
+                definition.reinforcementEmbodiedCarbonFactor = (
+                    result.reinforcement_factor
+                )
+                definition.reinforcementFactorUnits = "kgCO₂e/kg"
+            self._definitions[key] = definition
+        return definition
+
+
+def parse_embodied_carbon(block: Dict) -> Dict[str, CarbonResult]:
+    """Rebuild the carbon results of a property in either schema."""
+    if any(isinstance(data, Base) for data in block.values()):
+        return CompactSchema().parse(block)
+    return VerboseSchema().parse(block)
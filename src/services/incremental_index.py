@@ -0,0 +1,244 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from specklepy.api import operations
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects import Base
+from specklepy.transports.server import ServerTransport
+
+from src.domain.types import ElementCategory
+from src.infrastructure.speckle_objects import fetch_single_object
+from src.services.embodied_carbon_schema import (
+    EMBODIED_CARBON_PROPERTY,
+    parse_embodied_carbon,
+)
+from src.services.result_consumers import ResultConsumer
+
+# Root attribute of an output version describing the run that produced it
+RUN_RECORD_KEY = "@embodiedCarbonRun"
+# Bumped whenever stored results can no longer be reused by newer code
+RUN_RECORD_VERSION = 3
+
+
+def settings_key(calculator_settings: Dict) -> str:
+    """Return a key identifying the calculator settings results depend on."""
+    payload = json.dumps(
+        {"version": RUN_RECORD_VERSION, "settings": calculator_settings},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def embodied_carbon_block(element: Any) -> Optional[Dict]:
+    """Return the "Embodied Carbon Calculation" property of an element, if any."""
+    properties = getattr(element, "properties", None)
+    try:
+        return properties[EMBODIED_CARBON_PROPERTY]
+    except (KeyError, AttributeError, TypeError):
+        return None
+
+
+def block_hash(block: Any) -> str:
+    """Return a content hash of a carbon block, stable across a send and receive."""
+    payload = json.dumps(block, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=10).hexdigest()
+
+
+def blocks_by_hash(elements: Iterable[Any]) -> Dict[str, Dict]:
+    """Index the carbon blocks of elements by their hash."""
+    blocks = {}
+    for element in elements or []:
+        block = embodied_carbon_block(element)
+        if block is not None:
+            blocks[block_hash(block)] = block
+    return blocks
+
+
+class RunRecordBuilder(ResultConsumer):
+    """
+    Records the source id and carbon block hash of every processed element.
+
+    Object ids change once the carbon block is attached, so the record keeps
+    the source id of each element with the hash of its block. It is stored
+    as a detached child of the output root, so a later run can receive it
+    without the model.
+
+    Args:
+        keep_blocks: Whether the record stores each distinct block itself.
+            Off for results overlays, whose objects already carry the blocks.
+    """
+
+    def __init__(self, keep_blocks: bool = True):
+        self.keep_blocks = keep_blocks
+        self.elements: List[Dict] = []
+        self.blocks: Dict[str, Dict] = {}
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        if element_result["status"] != "processed" or (
+            "carbon_results" not in element_result
+        ):
+            return
+        block = embodied_carbon_block(element)
+        if block is None:
+            return
+
+        key = block_hash(block)
+        if self.keep_blocks:
+            self.blocks[key] = block
+        self.elements.append(
+            {
+                "id": element_result["id"],
+                "level": element_result["level"],
+                "category": element_result["category"].value,
+                "materials": element_result["materials"],
+                "hash": key,
+            }
+        )
+
+    def attach_to(self, model_root: Base, calculator_settings_key: str) -> None:
+        """Store the run record on the root of the output model."""
+        record = Base()
+        record.settingsKey = calculator_settings_key
+        record.elements = self.elements
+        if self.keep_blocks:
+            record.blocks = self.blocks
+        model_root[RUN_RECORD_KEY] = record
+
+
+class IncrementalIndex:
+    """
+    Results of elements analyzed by a previous run, keyed by source object id.
+
+    Speckle object ids are content hashes, so an element whose id is in the
+    index is unchanged and its stored result can be reused as is.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict]] = None):
+        self._entries = entries or {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, element_id: str) -> bool:
+        return element_id in self._entries
+
+    @classmethod
+    def from_run_record(
+        cls,
+        record: Optional[Base],
+        calculator_settings_key: str,
+        blocks: Optional[Dict[str, Dict]] = None,
+    ) -> "IncrementalIndex":
+        """
+        Build the index from the run record of a previous output version.
+
+        The index is empty if there is no record or it was computed with
+        other settings. Elements whose block can't be found are left out.
+
+        Args:
+            blocks: Carbon blocks by hash, those stored in the record if None
+        """
+        if record is None or (
+            getattr(record, "settingsKey", None) != calculator_settings_key
+        ):
+            return cls()
+
+        if blocks is None:
+            blocks = getattr(record, "blocks", None) or {}
+        entries = {}
+        for entry in getattr(record, "elements", None) or []:
+            block = blocks.get(entry.get("hash"))
+            if entry.get("id") and block is not None:
+                entries[entry["id"]] = {**entry, "block": block}
+        return cls(entries)
+
+    @classmethod
+    def from_output_root(
+        cls, output_root: Base, calculator_settings_key: str
+    ) -> "IncrementalIndex":
+        """
+        Build the index from the run record on the root of an output version.
+
+        A record without blocks belongs to a results overlay, whose first
+        collection holds the objects carrying them.
+        """
+        record = getattr(output_root, RUN_RECORD_KEY, None)
+        blocks = None
+        if record is not None and getattr(record, "blocks", None) is None:
+            collections = getattr(output_root, "@elements", None) or []
+            blocks = blocks_by_hash(
+                getattr(collections[0], "@elements", None) if collections else None
+            )
+        return cls.from_run_record(record, calculator_settings_key, blocks)
+
+    @classmethod
+    def from_previous_version(
+        cls,
+        speckle_client: Any,
+        project_id: str,
+        model_name: str,
+        calculator_settings_key: str,
+    ) -> "IncrementalIndex":
+        """
+        Load the index from the latest version of an output model, if any.
+
+        Only the run record is received: its id is read from the raw root
+        object, so none of the output model itself is downloaded. The record
+        of a results overlay points to the blocks of its element objects, so
+        those are received as well.
+        """
+        try:
+            branch = speckle_client.branch.get(project_id, model_name, 1)
+            commits = getattr(getattr(branch, "commits", None), "items", None)
+            if not commits or not commits[0].referencedObject:
+                print(f"No previous version of {model_name} to reuse")
+                return cls()
+
+            transport = ServerTransport(stream_id=project_id, client=speckle_client)
+            root = fetch_single_object(transport, commits[0].referencedObject)
+            reference = root.get(RUN_RECORD_KEY)
+            if not isinstance(reference, dict) or not reference.get("referencedId"):
+                print(f"Previous version of {model_name} has no run record")
+                return cls()
+            record = operations.receive(reference["referencedId"], transport)
+
+            blocks = None
+            if getattr(record, "blocks", None) is None:
+                collections = root.get("@elements") or [{}]
+                blocks = blocks_by_hash(
+                    _received_elements(collections[0].get("referencedId"), transport)
+                )
+        except (SpeckleException, requests.RequestException, ValueError) as e:
+            print(f"Could not load previous version of {model_name}: {str(e)}")
+            return cls()
+
+        index = cls.from_run_record(record, calculator_settings_key, blocks)
+        print(f"Reusing results of up to {len(index)} elements from {model_name}")
+        return index
+
+    def reuse(self, element: Any) -> Optional[Dict]:
+        """Return the stored result of an unchanged element, or None."""
+        entry = self._entries.get(getattr(element, "id", None))
+        if entry is None:
+            return None
+
+        carbon_results = parse_embodied_carbon(entry["block"])
+        return {
+            "id": entry["id"],
+            "status": "processed",
+            "level": entry["level"],
+            "category": ElementCategory(entry["category"]),
+            "materials": entry["materials"],
+            "carbon_results": carbon_results,
+            "total_carbon": sum(r.total_carbon for r in carbon_results.values()),
+        }
+
+
+def _received_elements(object_id: Optional[str], transport: ServerTransport) -> List:
+    """Receive a collection and return its elements, none without an id."""
+    if not object_id:
+        return []
+    return getattr(operations.receive(object_id, transport), "@elements", None) or []
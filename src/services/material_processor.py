@@ -1,6 +1,20 @@
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple, Optional, Tuple, Union
 
-from src.domain.types import MaterialProperties, Material, MaterialType
+from src.domain.types import (
+    MaterialProperties,
+    Material,
+    MaterialType,
+    intern_string,
+)
+
+
+class _MaterialClass(NamedTuple):
+    """Classification of a material signature, shared by all its entries."""
+
+    type: MaterialType
+    grade: Optional[str] = None
+    # Multiplied with the volume of an entry to get its mass
+    mass_per_volume: Optional[float] = None
 
 
 class MaterialProcessor:
@@ -9,29 +23,82 @@ class MaterialProcessor:
     DEFAULT_CONCRETE_GRADE = "35"
     DEFAULT_STEEL_DENSITY = 7851.81483993  # kg/m3
 
+    def __init__(self):
+        # Classification per material signature; failed classifications are
+        # stored as their error message
+        self._classes: Dict[Tuple, Union[_MaterialClass, str]] = {}
+        self._hits = 0
+        self._misses = 0
+
     def process_material(self, raw_material: Dict[str, Any]) -> Material:
         """Process raw material data from Revit into domain model."""
         properties = MaterialProperties(
-            name=raw_material["materialName"],
+            name=intern_string(raw_material["materialName"]),
             volume=raw_material["volume"]["value"],
             density=raw_material.get("density", {}).get("value"),
-            structural_asset=raw_material.get("structuralAsset"),
+            structural_asset=intern_string(raw_material.get("structuralAsset")),
             compressive_strength=raw_material.get("compressiveStrength", {}).get(
                 "value"
             ),
         )
+        is_high_grade = self._is_high_grade_material(raw_material)
 
-        # Determine material type and create material
-        if self._is_high_grade_material(raw_material):
-            return self._process_high_grade_material(properties)
+        # Entries of the same material only differ by volume, so the
+        # classification is keyed on the identity fields
+        signature = (
+            properties.name,
+            is_high_grade,
+            properties.structural_asset,
+            properties.density,
+            properties.compressive_strength,
+        )
+        try:
+            material_class = self._classes.get(signature)
+        except TypeError:
+            # Unhashable identity fields can't be memoized
+            material_class = self._classify(properties, is_high_grade)
         else:
-            return self._process_low_grade_material(properties)
+            if material_class is None:
+                self._misses += 1
+                try:
+                    material_class = self._classify(properties, is_high_grade)
+                except ValueError as e:
+                    material_class = str(e)
+                self._classes[signature] = material_class
+            else:
+                self._hits += 1
+
+        if isinstance(material_class, str):
+            raise ValueError(material_class)
+
+        mass = None
+        if material_class.mass_per_volume is not None:
+            mass = properties.volume * material_class.mass_per_volume
+        return Material(
+            type=material_class.type,
+            properties=properties,
+            grade=material_class.grade,
+            mass=mass,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counts of the material classification memo."""
+        return {"hits": self._hits, "misses": self._misses, "size": len(self._classes)}
+
+    def _classify(
+        self, props: MaterialProperties, is_high_grade: bool
+    ) -> _MaterialClass:
+        """Determine material type, grade and density of a material signature."""
+        if is_high_grade:
+            return self._process_high_grade_material(props)
+        else:
+            return self._process_low_grade_material(props)
 
     @staticmethod
     def _is_high_grade_material(raw_material: Dict[str, Any]) -> bool:
         return "structuralAsset" in raw_material
 
-    def _process_high_grade_material(self, props: MaterialProperties) -> Material:
+    def _process_high_grade_material(self, props: MaterialProperties) -> _MaterialClass:
         """Process materials with structural assets."""
         if "concrete" in props.name.lower():
             return self._process_concrete(props)
@@ -42,52 +109,47 @@ class MaterialProcessor:
             or "timber" in props.name.lower()
             or "glulam" in props.name.lower()
         ):
-            return Material(type=MaterialType.WOOD, properties=props)
+            return _MaterialClass(type=MaterialType.WOOD)
         else:
             raise ValueError(f"Unknown high-grade material: {props.name}")
 
-    def _process_low_grade_material(self, props: MaterialProperties) -> Material:
+    def _process_low_grade_material(self, props: MaterialProperties) -> _MaterialClass:
         """Process materials without structural assets."""
         name = props.name.lower()
 
         if "concrete" in name:
-            return Material(
+            return _MaterialClass(
                 type=MaterialType.CONCRETE,
-                properties=props,
                 grade=self.DEFAULT_CONCRETE_GRADE,
             )
         elif "steel" in name:
-            mass = props.volume * self.DEFAULT_STEEL_DENSITY
-            return Material(
+            return _MaterialClass(
                 type=MaterialType.METAL,
-                properties=props,
-                mass=mass,
                 grade="default_steel",
+                mass_per_volume=self.DEFAULT_STEEL_DENSITY,
             )
         elif "clt" in name or "timber" in name or "wood" in name:
-            return Material(type=MaterialType.WOOD, properties=props)
+            return _MaterialClass(type=MaterialType.WOOD)
         else:
             raise ValueError(f"Unknown material type: {props.name}")
 
     @staticmethod
-    def _process_concrete(props: MaterialProperties) -> Material:
+    def _process_concrete(props: MaterialProperties) -> _MaterialClass:
         """Process concrete-specific properties."""
         if not props.compressive_strength:
             raise ValueError("Missing compressive strength for concrete")
 
         grade = str(props.compressive_strength * 0.001)  # Convert to MPa
-        return Material(type=MaterialType.CONCRETE, properties=props, grade=grade)
+        return _MaterialClass(type=MaterialType.CONCRETE, grade=grade)
 
     @staticmethod
-    def _process_steel(props: MaterialProperties) -> Material:
+    def _process_steel(props: MaterialProperties) -> _MaterialClass:
         """Process steel-specific properties."""
         if not props.density:
             raise ValueError("Missing density for steel")
 
-        mass = props.volume * props.density
-        return Material(
+        return _MaterialClass(
             type=MaterialType.METAL,
-            properties=props,
-            mass=mass,
             grade=props.structural_asset,
+            mass_per_volume=props.density,
         )
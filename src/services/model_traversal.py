@@ -0,0 +1,78 @@
+from enum import Enum
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+
+from specklepy.objects import Base
+
+
+class TraversalOrder(Enum):
+    PRE = "pre"
+    POST = "post"
+
+
+class TraversalNode(NamedTuple):
+    """An element visited during traversal, with its position in the tree."""
+
+    element: Base
+    depth: int
+    parent: Optional[Base]
+
+
+class ModelTraversal:
+    """Walks a Speckle object tree with an explicit stack instead of recursion."""
+
+    def __init__(self, order: TraversalOrder = TraversalOrder.POST):
+        """
+        Initialize the traversal.
+
+        Args:
+            order: POST yields children before their parent (the order the
+                analyzer has always used), PRE yields parents first
+        """
+        self.order = order
+
+    def iterate(self, root: Base) -> Iterator[Base]:
+        """Yield every element in the tree."""
+        for node in self.iterate_with_context(root):
+            yield node.element
+
+    def iterate_with_context(self, root: Base) -> Iterator[TraversalNode]:
+        """Yield every element in the tree together with its depth and parent."""
+        if self.order == TraversalOrder.PRE:
+            return self._iterate_pre_order(root)
+        return self._iterate_post_order(root)
+
+    @staticmethod
+    def get_children(base: Any) -> Optional[List[Base]]:
+        """Return the child elements of an object, if it has any."""
+        return getattr(base, "elements", getattr(base, "@elements", None))
+
+    def _iterate_pre_order(self, root: Base) -> Iterator[TraversalNode]:
+        stack: List[TraversalNode] = [TraversalNode(root, 0, None)]
+        while stack:
+            node = stack.pop()
+            yield node
+
+            children = self.get_children(node.element)
+            if children:
+                depth = node.depth + 1
+                # Push in reverse so the first child is visited first
+                for child in reversed(children):
+                    stack.append(TraversalNode(child, depth, node.element))
+
+    def _iterate_post_order(self, root: Base) -> Iterator[TraversalNode]:
+        # Each entry carries a flag telling whether its children were already pushed
+        stack: List[Tuple[TraversalNode, bool]] = [
+            (TraversalNode(root, 0, None), False)
+        ]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+                continue
+
+            stack.append((node, True))
+            children = self.get_children(node.element)
+            if children:
+                depth = node.depth + 1
+                for child in reversed(children):
+                    stack.append((TraversalNode(child, depth, node.element), False))
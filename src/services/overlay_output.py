@@ -0,0 +1,100 @@
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from specklepy.objects import Base
+
+from src.services.carbon_rollup import ROLLUP_FIELDS, CarbonRollup
+from src.services.embodied_carbon_schema import EMBODIED_CARBON_PROPERTY
+from src.services.incremental_index import embodied_carbon_block
+from src.services.result_consumers import ResultConsumer
+
+OVERLAY_COLLECTION_TYPE = "Embodied Carbon Overlay"
+
+# Titles and grouping fields of the rollup collections of an overlay
+OVERLAY_ROLLUPS = [
+    ("By Level", ("level",)),
+    ("By Category", ("category",)),
+    ("By Material", ("material_type", "database")),
+    ("By Level, Category and Material", ROLLUP_FIELDS),
+]
+
+
+class OutputMode(Enum):
+    FullModel = "full"
+    ResultsOverlay = "overlay"
+
+
+def _collection(name: str, elements: List[Base]) -> Base:
+    """A collection like object, its elements detached."""
+    collection = Base()
+    collection.name = name
+    collection.collectionType = OVERLAY_COLLECTION_TYPE
+    collection["@elements"] = elements
+    return collection
+
+
+class OverlayBuilder(ResultConsumer):
+    """
+    Collects a small results object per element for a results-only version.
+
+    Each overlay object references its source element by id and applicationId
+    and carries the carbon block attached to it, so the uploaded version
+    scales with the results rather than the geometry of the model.
+    """
+
+    def __init__(self):
+        self.elements: List[Base] = []
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        if "carbon_results" not in element_result or not hasattr(element, "properties"):
+            return
+
+        overlay = Base()
+        overlay.applicationId = getattr(element, "applicationId", None)
+        overlay.sourceId = element_result["id"]
+        overlay.status = element_result["status"]
+        overlay.totalCarbon = element_result["total_carbon"]
+        overlay.properties = {EMBODIED_CARBON_PROPERTY: embodied_carbon_block(element)}
+        self.elements.append(overlay)
+
+    def build(self, name: str, rollup: Optional[CarbonRollup] = None) -> Base:
+        """
+        Build the root of the overlay version.
+
+        Args:
+            name: Name of the root collection
+            rollup: Rollup of the run, added as collections of group totals
+        """
+        collections = [_collection("Elements", self.elements)]
+        if rollup is not None:
+            collections.append(
+                _collection(
+                    "Rollups",
+                    [
+                        _collection(title, _rollup_groups(rollup, fields))
+                        for title, fields in OVERLAY_ROLLUPS
+                    ],
+                )
+            )
+        return _collection(name, collections)
+
+
+def _rollup_groups(rollup: CarbonRollup, fields) -> List[Base]:
+    groups = []
+    for group, totals in rollup.by(*fields).items():
+        base = Base()
+        for field, value in zip(fields, group):
+            base[_camel_case(field)] = value
+        base.elementCount = totals.elements
+        base.materialCount = totals.materials
+        base.volume = totals.volume
+        base.mass = totals.mass
+        base.reinforcementMass = totals.reinforcement_mass
+        base.totalCarbon = totals.total_carbon
+        groups.append(base)
+    return groups
+
+
+def _camel_case(field: str) -> str:
+    head, *rest = field.split("_")
+    return head + "".join(word.title() for word in rest)
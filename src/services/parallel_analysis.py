@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.infrastructure.logging import Logging
+
+# Below this many elements the cost of starting workers outweighs the gain
+DEFAULT_PARALLEL_THRESHOLD = 5000
+
+# Upper bound for the number of elements sent to a worker in one task
+MAX_CHUNK_SIZE = 2000
+
+_SNAPSHOT_ATTRIBUTES = ("id", "speckle_type", "family", "name", "level")
+
+# Analyzer of the current worker process, created once by _init_worker
+_worker_analyzer: Optional[Any] = None
+
+
+class ElementSnapshot:
+    """Picklable copy of the element attributes the analysis reads."""
+
+    def __init__(self, element: Any):
+        for attribute in _SNAPSHOT_ATTRIBUTES:
+            value = getattr(element, attribute, None)
+            if value is not None:
+                setattr(self, attribute, value)
+
+        # Only ship the material quantities, not the full parameter set
+        if hasattr(element, "properties"):
+            properties = getattr(element, "properties")
+            self.properties = (
+                {"Material Quantities": properties["Material Quantities"]}
+                if "Material Quantities" in properties
+                else {}
+            )
+
+
+def _init_worker(analyzer_factory: Callable[[], Any]) -> None:
+    """Build the analyzer of a worker process once, so its caches stay warm."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer_factory()
+
+
+def _analyze_chunk(
+    snapshots: List[ElementSnapshot],
+) -> Tuple[List[Dict], Tuple[List[str], List[str], List[str]], Dict]:
+    """Analyze a chunk of elements in a worker process."""
+    element_results = _worker_analyzer.analyze_elements(snapshots, attach=False)
+    return (
+        element_results,
+        _worker_analyzer.carbon_calculator.get_missing_factors(),
+        # Only the events of this chunk, the worker analyzes several
+        _worker_analyzer.logger.take_events(),
+    )
+
+
+class ParallelElementAnalysis:
+    """Shards elements across a process pool and merges the partial results."""
+
+    def __init__(
+        self,
+        analyzer_factory: Callable[[], Any],
+        workers: int,
+        logger: Optional[Logging] = None,
+    ):
+        """
+        Initialize the parallel analysis.
+
+        Args:
+            analyzer_factory: Picklable callable creating the analyzer of a worker
+            workers: Number of worker processes
+            logger: Logger the events logged by workers are merged into
+        """
+        self.analyzer_factory = analyzer_factory
+        self.workers = workers
+        self.logger = logger
+        self.missing_timber: set = set()
+        self.missing_steel: set = set()
+        self.missing_concrete: set = set()
+
+    def chunk_size(self, element_count: int) -> int:
+        """Size of the chunks sent to workers, aiming at a few tasks per worker."""
+        return max(1, min(MAX_CHUNK_SIZE, element_count // (self.workers * 4)))
+
+    def analyze(self, elements: Sequence[Any]) -> Iterator[Dict]:
+        """Yield the element results in the same order as the elements."""
+        size = self.chunk_size(len(elements))
+        chunks = (
+            [ElementSnapshot(e) for e in elements[start : start + size]]
+            for start in range(0, len(elements), size)
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.analyzer_factory,),
+        ) as executor:
+            for element_results, missing, events in executor.map(
+                _analyze_chunk, chunks
+            ):
+                timber, steel, concrete = missing
+                self.missing_timber.update(timber)
+                self.missing_steel.update(steel)
+                self.missing_concrete.update(concrete)
+                if self.logger is not None:
+                    self.logger.merge_events(events)
+                yield from element_results
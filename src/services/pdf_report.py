@@ -0,0 +1,133 @@
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.services.carbon_rollup import CarbonRollup
+from src.services.result_consumers import EMBODIED_CARBON_UNITS
+
+# Element rows drawn per table, so that a table and its header fill one letter page
+ROWS_PER_TABLE = 34
+
+# Element rows kept for the report by default (0 gives a summary-only report)
+DEFAULT_REPORT_ROW_LIMIT = 50_000
+
+# Titles and grouping fields of the rollup tables of the report
+ROLLUP_SECTIONS = [
+    ("By Level", ("level",)),
+    ("By Material", ("material_type", "database")),
+    ("By Level, Category and Material", ("level", "category", "material_type")),
+]
+
+ROLLUP_COLUMNS = {
+    "level": "Level",
+    "category": "Category",
+    "material_type": "Material",
+    "database": "Database",
+}
+
+
+def summary_rows(results: Dict) -> List[List[str]]:
+    """Return the run summary table of the report."""
+    return [
+        ["Processed elements", str(results["success_count"])],
+        ["Skipped elements", str(results["skipped_count"])],
+        ["Warnings", str(results["warning_count"])],
+        ["Errors", str(results["error_count"])],
+        [
+            "Total embodied carbon",
+            "{:0.2f} {}".format(results["total_carbon"], EMBODIED_CARBON_UNITS),
+        ],
+    ]
+
+
+def rollup_sections(rollup: CarbonRollup) -> List[Tuple[str, List[List[str]]]]:
+    """Return the titled rollup tables of the report."""
+    sections = []
+    for title, fields in ROLLUP_SECTIONS:
+        rows = [
+            [ROLLUP_COLUMNS[field] for field in fields]
+            + [
+                "Elements",
+                "Volume (m³)",
+                "Mass (kg)",
+                f"Carbon ({EMBODIED_CARBON_UNITS})",
+            ]
+        ]
+        for group, totals in rollup.by(*fields).items():
+            rows.append(
+                [str(value) for value in group]
+                + [
+                    str(totals.elements),
+                    "{:0.2f}".format(totals.volume),
+                    "{:0.0f}".format(totals.mass + totals.reinforcement_mass),
+                    "{:0.2f}".format(totals.total_carbon),
+                ]
+            )
+        sections.append((title, rows))
+    return sections
+
+
+def write_pdf_report(
+    file_name: str,
+    rows: Iterable[Sequence[str]],
+    summary: Optional[List[List[str]]] = None,
+    omitted_rows: int = 0,
+    sections: Sequence[Tuple[str, List[List[str]]]] = (),
+    rows_per_table: int = ROWS_PER_TABLE,
+) -> None:
+    """
+    Write the report to a PDF file, the element rows in page-sized tables.
+
+    Memory is bounded by the number of rows passed in, see report_row_limit.
+
+    Args:
+        file_name: Path of the PDF file
+        rows: Header row followed by the element rows
+        summary: Summary table drawn before the element rows
+        sections: Titled tables drawn after the summary, e.g. rollup_sections
+        omitted_rows: Number of element rows left out of the report
+        rows_per_table: Element rows per table, each repeating the header
+    """
+    # reportlab is slow to import, so it's only loaded for runs reaching this stage
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import (
+        LongTable,
+        PageBreak,
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+    )
+
+    styles = getSampleStyleSheet()
+    rows = iter(rows)
+    header = next(rows, None)
+
+    def flowables():
+        if summary:
+            yield Paragraph("Summary", styles["Heading2"])
+            yield LongTable(summary)
+            yield Spacer(0, 12)
+        for title, section_rows in sections:
+            yield Paragraph(title, styles["Heading2"])
+            yield LongTable(section_rows, repeatRows=1)
+            yield Spacer(0, 12)
+        if omitted_rows:
+            yield Paragraph(
+                f"{omitted_rows} element rows were left out of this report.",
+                styles["Normal"],
+            )
+            yield Spacer(0, 12)
+        chunk = list(islice(rows, rows_per_table))
+        # An empty report without other tables still shows the table header
+        if header is None or (not chunk and (summary or sections)):
+            return
+        if summary or sections or omitted_rows:
+            yield PageBreak()
+        while True:
+            yield LongTable([header, *chunk], repeatRows=1)
+            chunk = list(islice(rows, rows_per_table))
+            if not chunk:
+                break
+
+    doc = SimpleDocTemplate(file_name, pagesize=letter)
+    doc.build(list(flowables()))
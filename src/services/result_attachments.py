@@ -0,0 +1,94 @@
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+
+from src.services.result_consumers import AttachmentPayloadBuilder
+
+# Significant digits of the gradient values, plenty for coloring the viewer
+GRADIENT_DIGITS = 6
+
+
+class AttachmentCategory(NamedTuple):
+    """How the elements of one result bucket are attached to the run."""
+
+    bucket: str
+    method: str  # name of the AutomationContext attach method
+    category: str
+    message: str
+    gradient: bool = False
+
+
+ATTACHMENT_CATEGORIES = [
+    AttachmentCategory(
+        "processed_elements",
+        "attach_success_to_objects",
+        "Carbon Analysis",
+        "Carbon calculations completed successfully for these elements!",
+        gradient=True,
+    ),
+    AttachmentCategory(
+        "skipped_elements",
+        "attach_info_to_objects",
+        "Skipped Elements",
+        "Elements that were intentionally skipped.",
+    ),
+    AttachmentCategory(
+        "warning_elements",
+        "attach_warning_to_objects",
+        "Missing Material Data",
+        "Elements missing material data required for carbon calculation.",
+    ),
+    AttachmentCategory(
+        "errors",
+        "attach_error_to_objects",
+        "Processing Errors",
+        "Failure processing the following elements.",
+    ),
+]
+
+
+def _compact(value: float) -> float:
+    return float(f"{value:.{GRADIENT_DIGITS}g}")
+
+
+def gradient_metadata(
+    object_ids: Sequence[str], values: Sequence[float]
+) -> Dict[str, Any]:
+    """The gradient metadata of processed elements, with compact values."""
+    return {
+        "gradient": True,
+        "gradientValues": {
+            object_id: {"gradientValue": _compact(value)}
+            for object_id, value in zip(object_ids, values)
+        },
+    }
+
+
+class AttachmentDispatcher:
+    """
+    Attaches the collected element ids to the automation context.
+
+    Each non-empty result bucket becomes a single result case. The context
+    only collects the cases and reports them all together when the run is
+    marked, so splitting a bucket would not make any request smaller, it
+    would only repeat the message and metadata. The size of the report is
+    kept down by the payload itself: the id lists are passed as collected
+    and the gradient values are rounded to a few significant digits.
+    """
+
+    def dispatch(self, automate_context: Any, payload: AttachmentPayloadBuilder) -> int:
+        """Attach the payload to the context and return the number of result cases."""
+        count = 0
+        for category in ATTACHMENT_CATEGORIES:
+            object_ids = payload.object_ids[category.bucket]
+            if not object_ids:
+                continue
+            metadata: Optional[Dict] = None
+            if category.gradient:
+                metadata = gradient_metadata(object_ids, payload.processed_carbon)
+            getattr(automate_context, category.method)(
+                category=category.category,
+                object_ids=object_ids,
+                message=category.message,
+                metadata=metadata,
+            )
+            count += 1
+        return count
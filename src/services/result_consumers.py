@@ -0,0 +1,116 @@
+from abc import ABC
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Maps an element result status to the list it is collected in
+RESULT_BUCKETS = {
+    "processed": "processed_elements",
+    "skipped": "skipped_elements",
+    "warning": "warning_elements",
+}
+ERROR_BUCKET = "errors"
+
+EMBODIED_CARBON_UNITS = "kgCO₂e"
+
+
+def result_bucket(element_result: Dict) -> str:
+    """Return the results list an element result belongs to."""
+    return RESULT_BUCKETS.get(element_result.get("status"), ERROR_BUCKET)
+
+
+class ResultConsumer(ABC):
+    """Receives every element result while the model is traversed once."""
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        """Handle the result of a single element."""
+
+    def finalize(self, results: Dict) -> None:
+        """Called once after the traversal with the aggregated results."""
+
+
+class SummaryCounter(ResultConsumer):
+    """Counts elements per result bucket for the run summary."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        self.counts[result_bucket(element_result)] += 1
+
+    def finalize(self, results: Dict) -> None:
+        results["success_count"] = self.counts["processed_elements"]
+        results["warning_count"] = self.counts["warning_elements"]
+        results["skipped_count"] = self.counts["skipped_elements"]
+        results["error_count"] = self.counts[ERROR_BUCKET]
+
+
+class PdfRowBuilder(ResultConsumer):
+    """Collects the element/material rows of the PDF report."""
+
+    HEADER = ["Element ID", "Material", "Embodied Carbon"]
+
+    def __init__(self, max_rows: Optional[int] = None):
+        """
+        Initialize the builder.
+
+        Args:
+            max_rows: Element rows to keep (None keeps every row), further
+                rows are only counted in omitted_rows
+        """
+        self.rows: List[List[str]] = [list(self.HEADER)]
+        self.max_rows = max_rows
+        self.omitted_rows = 0
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        carbon_results = element_result.get("carbon_results")
+        if not carbon_results or not hasattr(element, "properties"):
+            return
+
+        # elementId became an issue for linked models. don't know why. lazy fix below. hackady-hack
+        element_properties = element["properties"]
+        if not hasattr(element_properties, "elementId"):
+            return
+
+        element_id = element_properties["elementId"]
+        for material_name, result in carbon_results.items():
+            if self.max_rows is not None and len(self.rows) > self.max_rows:
+                self.omitted_rows += 1
+                continue
+            self.rows.append(
+                [
+                    element_id,
+                    material_name,
+                    "{:0.2f} {}".format(result.total_carbon, EMBODIED_CARBON_UNITS),
+                ]
+            )
+
+
+class AttachmentPayloadBuilder(ResultConsumer):
+    """
+    Builds the object id lists and gradient values attached to the run.
+
+    The carbon of processed elements is kept as a list aligned with their ids,
+    the attachment stage builds the gradient metadata from it once.
+    """
+
+    def __init__(self):
+        self.object_ids: Dict[str, List[str]] = {
+            bucket: [] for bucket in (*RESULT_BUCKETS.values(), ERROR_BUCKET)
+        }
+        self.processed_carbon: List[float] = []
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        bucket = result_bucket(element_result)
+        self.object_ids[bucket].append(element_result["id"])
+        if bucket == "processed_elements":
+            self.processed_carbon.append(element_result["total_carbon"])
+
+    @property
+    def gradient_values(self) -> Dict[str, Dict[str, float]]:
+        """The gradient metadata of every processed element."""
+        return {
+            element_id: {"gradientValue": carbon}
+            for element_id, carbon in zip(
+                self.object_ids["processed_elements"], self.processed_carbon
+            )
+        }
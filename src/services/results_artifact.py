@@ -0,0 +1,212 @@
+import csv
+import json
+import os
+from enum import Enum
+from typing import IO, Any, Dict, List, Optional
+
+from src.infrastructure.logging import Logging
+from src.services.result_consumers import ResultConsumer
+
+# Columns of the results artifact, one row per element material
+ARTIFACT_COLUMNS = [
+    "element_id",
+    "status",
+    "level",
+    "category",
+    "material",
+    "material_type",
+    "database",
+    "quantity",
+    "quantity_units",
+    "factor",
+    "factor_units",
+    "embodied_carbon",
+    "concrete_volume",
+    "concrete_carbon",
+    "reinforcement_mass",
+    "reinforcement_rate",
+    "reinforcement_factor",
+    "reinforcement_carbon",
+]
+
+# Units of the quantity and factor of each material type
+ARTIFACT_UNITS = {
+    "Wood": ("m³", "kgCO₂e/m³"),
+    "Metal": ("kg", "kgCO₂e/kg"),
+    "Concrete": ("m³", "kgCO₂e/m³"),
+}
+
+# Rows buffered per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+
+class ResultsFormat(Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+def parquet_available() -> bool:
+    """Whether the optional pyarrow dependency is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def artifact_rows(element_result: Dict) -> List[Dict[str, Any]]:
+    """Return the artifact rows of an element result."""
+    category = element_result.get("category")
+    rows = []
+    for material_name, result in (element_result.get("carbon_results") or {}).items():
+        quantity_units, factor_units = ARTIFACT_UNITS.get(result.category, (None, None))
+        rows.append(
+            {
+                "element_id": element_result["id"],
+                "status": element_result["status"],
+                "level": element_result.get("level"),
+                "category": getattr(category, "value", category),
+                "material": material_name,
+                "material_type": result.category,
+                "database": result.database,
+                "quantity": result.quantity,
+                "quantity_units": quantity_units,
+                "factor": result.factor,
+                "factor_units": factor_units,
+                "embodied_carbon": result.total_carbon,
+                "concrete_volume": result.concrete_volume,
+                "concrete_carbon": result.concrete_carbon,
+                "reinforcement_mass": result.reinforcement_mass,
+                "reinforcement_rate": result.reinforcement_rate,
+                "reinforcement_factor": result.reinforcement_factor,
+                "reinforcement_carbon": result.reinforcement_carbon,
+            }
+        )
+    return rows
+
+
+class ResultsArtifactWriter(ResultConsumer):
+    """
+    Writes a row per element material to a file while the model is traversed.
+
+    Rows are written as they are consumed, so memory doesn't grow with the
+    model. The file is opened on the first row, or when the traversal ends
+    without any. Parquet needs the optional pyarrow package and falls back to
+    CSV without it.
+    """
+
+    def __init__(
+        self,
+        file_stem: str,
+        results_format: ResultsFormat,
+        logger: Optional[Logging] = None,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            file_stem: Path of the artifact without its extension
+            results_format: Format of the artifact
+            logger: Logger the Parquet fallback is reported to
+        """
+        if results_format == ResultsFormat.PARQUET and not parquet_available():
+            if logger is not None:
+                logger.log_warning(
+                    file_stem,
+                    "Results Artifact",
+                    "pyarrow is not installed, writing the results as CSV instead",
+                )
+            results_format = ResultsFormat.CSV
+
+        self.results_format = results_format
+        self.file_name = f"{file_stem}.{results_format.value}"
+        self.row_count = 0
+        self._file: Optional[IO] = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._parquet_rows: List[Dict[str, Any]] = []
+
+    def consume(self, element: Any, element_result: Dict) -> None:
+        for row in artifact_rows(element_result):
+            self._write(row)
+
+    def finalize(self, results: Dict) -> None:
+        self._open()
+        self.close()
+
+    def close(self) -> None:
+        """Flush the remaining rows and close the file, if it was opened."""
+        if self._parquet_writer is not None:
+            self._flush_parquet()
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Close the file and remove it, e.g. after the analysis failed."""
+        self.close()
+        if os.path.exists(self.file_name):
+            os.remove(self.file_name)
+
+    def _open(self) -> None:
+        """Open the file and write its header, unless already open."""
+        if self._file is not None or self._parquet_writer is not None:
+            return
+        if self.results_format == ResultsFormat.PARQUET:
+            import pyarrow.parquet as pq
+
+            self._parquet_writer = pq.ParquetWriter(self.file_name, _parquet_schema())
+        else:
+            self._file = open(self.file_name, "w", encoding="utf-8", newline="")
+            if self.results_format == ResultsFormat.CSV:
+                self._csv_writer = csv.DictWriter(self._file, ARTIFACT_COLUMNS)
+                self._csv_writer.writeheader()
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        if not self.row_count:
+            self._open()
+        self.row_count += 1
+        if self.results_format == ResultsFormat.JSONL:
+            self._file.write(json.dumps(row, ensure_ascii=False))
+            self._file.write("\n")
+        elif self.results_format == ResultsFormat.CSV:
+            self._csv_writer.writerow(row)
+        else:
+            self._parquet_rows.append(row)
+            if len(self._parquet_rows) >= PARQUET_ROW_GROUP_SIZE:
+                self._flush_parquet()
+
+    def _flush_parquet(self) -> None:
+        """Write the buffered rows as one Parquet row group."""
+        if not self._parquet_rows:
+            return
+        import pyarrow as pa
+
+        table = pa.Table.from_pylist(self._parquet_rows, schema=_parquet_schema())
+        self._parquet_writer.write_table(table)
+        self._parquet_rows = []
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    text_columns = {
+        "element_id",
+        "status",
+        "level",
+        "category",
+        "material",
+        "material_type",
+        "database",
+        "quantity_units",
+        "factor_units",
+    }
+    return pa.schema(
+        [
+            (column, pa.string() if column in text_columns else pa.float64())
+            for column in ARTIFACT_COLUMNS
+        ]
+    )
@@ -0,0 +1,182 @@
+"""
+Memory per element of the domain types, before and after slots and interning.
+
+Run with: python -m tests.benchmarks.memory_per_element [element count]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.domain.types import (
+    BuildingElement,
+    CarbonResult,
+    ConcreteCarbonResult,
+    ElementCategory,
+    Material,
+    MaterialProperties,
+    MaterialType,
+    intern_string,
+)
+
+DATABASE = "GUL Cement, Low Air"
+LEVELS = [f"Level {i}" for i in range(20)]
+MATERIAL_NAMES = ["Concrete - Cast-in-Place", "Steel - 350W", "CLT Panel"]
+
+
+# The domain types as they were before, without slots and with every
+# concrete field on every result
+@dataclass
+class LegacyMaterialProperties:
+    name: str
+    volume: float
+    density: Optional[float] = None
+    structural_asset: Optional[str] = None
+    compressive_strength: Optional[float] = None
+
+
+@dataclass
+class LegacyMaterial:
+    type: MaterialType
+    properties: LegacyMaterialProperties
+    grade: Optional[str] = None
+    mass: Optional[float] = None
+
+
+@dataclass
+class LegacyBuildingElement:
+    id: str
+    level: str
+    category: ElementCategory
+    materials: List[LegacyMaterial]
+    carbon_data: Optional[Dict] = None
+
+
+@dataclass
+class LegacyCarbonResult:
+    factor: float
+    total_carbon: float
+    category: str
+    quantity: float = None
+    database: str = None
+    concrete_volume: float = None
+    concrete_carbon: float = None
+    reinforcement_mass: float = None
+    reinforcement_rate: float = None
+    reinforcement_factor: float = None
+    reinforcement_carbon: float = None
+
+
+def _text(value: str) -> str:
+    """A fresh copy of a string, as deserializing a model produces."""
+    return "".join(list(value))
+
+
+def build_legacy(index: int):
+    materials = [
+        LegacyMaterial(
+            type=MaterialType.CONCRETE,
+            properties=LegacyMaterialProperties(
+                name=_text(name), volume=float(index), compressive_strength=35.0
+            ),
+            grade="35",
+        )
+        for name in MATERIAL_NAMES
+    ]
+    results = {
+        m.properties.name: LegacyCarbonResult(
+            factor=250.0,
+            total_carbon=float(index),
+            category="Concrete" if i == 0 else "Wood",
+            quantity=1.0,
+            database=_text(DATABASE),
+            **(
+                dict(
+                    concrete_volume=1.0,
+                    concrete_carbon=1.0,
+                    reinforcement_mass=1.0,
+                    reinforcement_rate=1.0,
+                    reinforcement_factor=1.0,
+                    reinforcement_carbon=1.0,
+                )
+                if i == 0
+                else {}
+            ),
+        )
+        for i, m in enumerate(materials)
+    }
+    element = LegacyBuildingElement(
+        id=str(index),
+        level=_text(LEVELS[index % len(LEVELS)]),
+        category=ElementCategory.SLAB,
+        materials=materials,
+    )
+    return element, results
+
+
+def build_compact(index: int):
+    materials = [
+        Material(
+            type=MaterialType.CONCRETE,
+            properties=MaterialProperties(
+                name=intern_string(_text(name)),
+                volume=float(index),
+                compressive_strength=35.0,
+            ),
+            grade="35",
+        )
+        for name in MATERIAL_NAMES
+    ]
+    results = {
+        materials[0].properties.name: ConcreteCarbonResult(
+            factor=250.0,
+            total_carbon=float(index),
+            category="Concrete",
+            quantity=1.0,
+            database=intern_string(_text(DATABASE)),
+            concrete_volume=1.0,
+            concrete_carbon=1.0,
+            reinforcement_mass=1.0,
+            reinforcement_rate=1.0,
+            reinforcement_factor=1.0,
+            reinforcement_carbon=1.0,
+        )
+    }
+    for m in materials[1:]:
+        results[m.properties.name] = CarbonResult(
+            factor=250.0,
+            total_carbon=float(index),
+            category="Wood",
+            quantity=1.0,
+            database=intern_string(_text(DATABASE)),
+        )
+    element = BuildingElement(
+        id=str(index),
+        level=intern_string(_text(LEVELS[index % len(LEVELS)])),
+        category=ElementCategory.SLAB,
+        materials=materials,
+    )
+    return element, results
+
+
+def bytes_per_element(build: Callable, count: int) -> float:
+    """Traced allocations per element of count built elements and results."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    elements = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del elements
+    return (after - before) / count
+
+
+def main(count: int = 100_000) -> None:
+    legacy = bytes_per_element(build_legacy, count)
+    compact = bytes_per_element(build_compact, count)
+    print(f"Elements: {count}, materials per element: {len(MATERIAL_NAMES)}")
+    print(f"  before: {legacy:8.0f} bytes per element")
+    print(f"  after:  {compact:8.0f} bytes per element ({compact / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,66 @@
+"""
+PDF report generation time and peak memory against the number of rows, for
+the single table the report used to be and the chunked page-sized tables.
+
+Run with: python -m tests.benchmarks.pdf_report [largest row count]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List
+
+from src.services.pdf_report import write_pdf_report
+from src.services.result_consumers import PdfRowBuilder
+
+ROW_COUNTS = [1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000]
+
+
+def build_rows(count: int) -> List[List[str]]:
+    return [list(PdfRowBuilder.HEADER)] + [
+        [str(100000 + i), "Concrete - Cast-in-Place", f"{i * 0.37:0.2f} kgCO₂e"]
+        for i in range(count)
+    ]
+
+
+def write_single_table(file_name: str, rows: List[List[str]]) -> None:
+    """The report as it used to be written, one table for every row."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+    from reportlab.platypus.tables import Table
+
+    SimpleDocTemplate(file_name, pagesize=letter).build([Table(rows)])
+
+
+def measure(write: Callable, rows: List[List[str]]):
+    """Seconds and peak traced MB of writing the rows to a temporary PDF."""
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "report.pdf")
+        tracemalloc.start()
+        start = time.perf_counter()
+        write(file_name, rows)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main(largest: int = 10_000) -> None:
+    # Warm up the reportlab imports so they aren't timed
+    measure(write_pdf_report, build_rows(1))
+    print(f"{'rows':>8} {'single s':>9} {'single MB':>10} {'chunked s':>11} {'MB':>7}")
+    for count in ROW_COUNTS:
+        if count > largest:
+            break
+        rows = build_rows(count)
+        single = measure(write_single_table, rows)
+        chunked = measure(write_pdf_report, rows)
+        print(
+            f"{count:8d} {single[0]:9.2f} {single[1]:10.1f} "
+            f"{chunked[0]:11.2f} {chunked[1]:7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,151 @@
+"""
+Synthetic Revit v3 style models for benchmarking the analysis pipeline.
+
+Elements carry the same "Material Quantities" properties the v3 connector
+sends, nested in level collections like a received model.
+"""
+import random
+from typing import Dict, List, Optional
+
+from specklepy.objects import Base
+
+# Raw material templates per material type: name, structural asset, density
+# (kg/m³) and compressive strength (kPa)
+MATERIAL_TEMPLATES = {
+    "Concrete": [
+        ("Concrete - Cast-in-Place", "Concrete", 2400.0, 32000.0),
+        ("Concrete - Precast", "Concrete", 2400.0, 40000.0),
+    ],
+    "Metal": [
+        ("Steel", "350W", 7850.0, None),
+        ("Metal - Steel 345 MPa", "350W", 7850.0, None),
+    ],
+    "Wood": [
+        ("CLT Panel", "CLT", None, None),
+        ("Glulam", "Glulam", None, None),
+        ("Timber Stud", "Stud", None, None),
+    ],
+}
+
+DEFAULT_MATERIAL_MIX = {"Concrete": 0.5, "Metal": 0.3, "Wood": 0.2}
+
+ELEMENT_NAMES = ["Floor", "Basic Wall", "Structural Column", "Structural Framing"]
+
+
+class _Properties(dict):
+    """Properties dict exposing elementId as an attribute, as received models do."""
+
+    @property
+    def elementId(self):
+        return self["elementId"]
+
+
+def _raw_material(template, volume: float, variant: int) -> Dict:
+    name, structural_asset, density, strength = template
+    if variant:
+        name = f"{name} ({variant})"
+    material = {
+        "materialName": name,
+        "volume": {"value": volume},
+        "structuralAsset": structural_asset,
+    }
+    if density is not None:
+        material["density"] = {"value": density}
+    if strength is not None:
+        material["compressiveStrength"] = {"value": strength}
+    return material
+
+
+def generate_model(
+    element_count: int,
+    depth: int = 2,
+    material_mix: Optional[Dict[str, float]] = None,
+    invalid_share: float = 0.05,
+    skipped_share: float = 0.05,
+    name_diversity: int = 1,
+    levels: int = 10,
+    seed: int = 0,
+) -> Base:
+    """
+    Generate a synthetic model.
+
+    Args:
+        element_count: Number of elements in the model
+        depth: Nesting depth of the elements below the root (at least 1), the
+            first level groups elements by level
+        material_mix: Share of each material type, defaults to DEFAULT_MATERIAL_MIX
+        invalid_share: Share of elements with an unknown material or without
+            material quantities
+        skipped_share: Share of grid elements, which are skipped
+        name_diversity: Number of name variants of each material template
+        levels: Number of building levels
+        seed: Seed of the random generator
+    """
+    rng = random.Random(seed)
+    material_mix = material_mix or DEFAULT_MATERIAL_MIX
+    material_types = list(material_mix)
+    weights = [material_mix[t] for t in material_types]
+
+    elements = []
+    for index in range(element_count):
+        element = Base()
+        element.id = f"element-{index}"
+        element.applicationId = f"revit-{index}"
+        element.level = f"Level {index % levels}"
+        element.properties = _Properties(elementId=str(index))
+        roll = rng.random()
+        if roll < skipped_share:
+            element.family = "Grid"
+        elif roll < skipped_share + invalid_share / 2:
+            element.name = rng.choice(ELEMENT_NAMES)
+        elif roll < skipped_share + invalid_share:
+            element.name = rng.choice(ELEMENT_NAMES)
+            element.properties["Material Quantities"] = {
+                "0": {"materialName": "Gypsum Board", "volume": {"value": 1.0}}
+            }
+        else:
+            element.name = rng.choice(ELEMENT_NAMES)
+            material_count = rng.randint(1, 3)
+            element.properties["Material Quantities"] = {
+                str(i): _raw_material(
+                    rng.choice(
+                        MATERIAL_TEMPLATES[rng.choices(material_types, weights)[0]]
+                    ),
+                    round(rng.uniform(0.1, 5.0), 3),
+                    rng.randrange(name_diversity),
+                )
+                for i in range(material_count)
+            }
+        elements.append(element)
+
+    root = Base()
+    root.id = "root"
+    root.version = 3
+    root.elements = _nest(elements, depth)
+    return root
+
+
+def _nest(elements: List[Base], depth: int) -> List[Base]:
+    """Group elements into level collections, then into depth - 2 more layers."""
+    if depth <= 1:
+        return elements
+
+    by_level: Dict[str, List[Base]] = {}
+    for element in elements:
+        by_level.setdefault(element.level, []).append(element)
+
+    collections = []
+    for level, level_elements in by_level.items():
+        children = level_elements
+        for layer in range(depth - 2):
+            group = Base()
+            group.id = f"{level}-group-{layer}"
+            group.name = f"Group {layer}"
+            group.elements = children
+            children = [group]
+        collection = Base()
+        collection.id = f"{level}-collection"
+        collection.name = level
+        collection.elements = children
+        collections.append(collection)
+    return collections
@@ -0,0 +1,150 @@
+"""
+Throughput and peak memory of the analysis pipeline on synthetic models.
+
+Needs pytest-benchmark. Models of 1k elements run by default, larger ones
+are selected with BENCHMARK_SIZES, e.g.:
+
+    BENCHMARK_SIZES=1000,100000,1000000 pytest tests/benchmarks --benchmark-only
+
+Each benchmark reports elements_per_second and peak_mb in its extra info,
+shown with --benchmark-columns or saved with --benchmark-json.
+"""
+import os
+import tempfile
+import tracemalloc
+from typing import Callable
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.domain.carbon.databases.enums import SteelDatabase, TimberDatabase
+from src.domain.carbon.emission_factor_registry import EmissionFactorRegistry
+from src.services.pdf_report import DEFAULT_REPORT_ROW_LIMIT, write_pdf_report
+from src.services.result_consumers import PdfRowBuilder
+from tests.benchmarks.synthetic_model import generate_model
+from tests.test_analyzer import build_analyzer
+
+SIZES = [int(size) for size in os.environ.get("BENCHMARK_SIZES", "1000").split(",")]
+
+
+def _report(benchmark, count: int, run: Callable) -> None:
+    """Add throughput and the peak traced memory of one more run."""
+    # No stats are collected under --benchmark-disable
+    if benchmark.stats is None:
+        return
+    benchmark.extra_info["elements"] = count
+    benchmark.extra_info["elements_per_second"] = count / benchmark.stats.stats.mean
+    tracemalloc.start()
+    run()
+    benchmark.extra_info["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size}")
+def model(request):
+    """A synthetic model of each benchmarked size"""
+    return generate_model(request.param, depth=3, name_diversity=5)
+
+
+@pytest.fixture(scope="module")
+def prepared(model):
+    """The elements, raw materials and processed elements of a model"""
+    analyzer = build_analyzer()
+    elements = list(analyzer.iterate_elements(model))
+    raw_materials = [
+        material
+        for element in elements
+        for material in (
+            getattr(element, "properties", {}).get("Material Quantities") or {}
+        ).values()
+    ]
+    processed = []
+    for element in elements:
+        try:
+            processed_element = analyzer.element_processor.process_element(element)
+        except Exception:
+            continue
+        if processed_element is not None:
+            processed.append(processed_element)
+    return {"elements": elements, "materials": raw_materials, "processed": processed}
+
+
+class TestPipelineBenchmarks:
+    """Benchmarks of the analysis pipeline stages"""
+
+    def test_iterate_elements(self, benchmark, model, prepared):
+        """Benchmark the traversal of the model"""
+        analyzer = build_analyzer()
+
+        def run():
+            return sum(1 for _ in analyzer.iterate_elements(model))
+
+        assert benchmark(run) == len(prepared["elements"])
+        _report(benchmark, len(prepared["elements"]), run)
+
+    def test_process_material(self, benchmark, prepared):
+        """Benchmark classifying every raw material"""
+        materials = prepared["materials"]
+
+        def run():
+            # A fresh processor per round, so the memo starts empty
+            processor = build_analyzer().material_processor
+            for material in materials:
+                try:
+                    processor.process_material(material)
+                except ValueError:
+                    pass
+
+        benchmark(run)
+        _report(benchmark, len(materials), run)
+
+    def test_registry_lookups(self, benchmark, prepared):
+        """Benchmark timber and steel factor lookups by material name"""
+        names = [material["materialName"] for material in prepared["materials"]]
+        timber = TimberDatabase.Athena2021.value
+        steel = SteelDatabase.Type350MPa.value
+
+        def run():
+            # A fresh registry per round, so its caches start empty
+            registry = EmissionFactorRegistry()
+            for name in names:
+                registry.get_timber_factor(name, timber)
+                registry.get_steel_factor(name, steel)
+
+        benchmark(run)
+        _report(benchmark, len(names), run)
+
+    def test_calculate_carbon(self, benchmark, prepared):
+        """Benchmark the carbon of every processed element"""
+        processed = prepared["processed"]
+        calculator = build_analyzer().carbon_calculator
+
+        def run():
+            for element in processed:
+                calculator.calculate_carbon(element)
+
+        benchmark(run)
+        _report(benchmark, len(processed), run)
+
+    def test_analyze_model(self, benchmark, model, prepared):
+        """Benchmark a full analysis of the model"""
+
+        def run():
+            return build_analyzer().analyze_model(model)
+
+        results = benchmark.pedantic(run, rounds=3, iterations=1)
+        assert results["processed_elements"]
+        _report(benchmark, len(prepared["elements"]), run)
+
+    def test_pdf_stage(self, benchmark, model, prepared):
+        """Benchmark writing the report of the model"""
+        pdf_rows = PdfRowBuilder(max_rows=DEFAULT_REPORT_ROW_LIMIT)
+        build_analyzer().analyze_model(model, consumers=[pdf_rows])
+
+        def run():
+            with tempfile.TemporaryDirectory() as directory:
+                write_pdf_report(os.path.join(directory, "report.pdf"), pdf_rows.rows)
+
+        benchmark.pedantic(run, rounds=1, iterations=1)
+        _report(benchmark, len(pdf_rows.rows) - 1, run)
@@ -0,0 +1,213 @@
+import pytest
+from specklepy.objects import Base
+
+from main import DEFAULT_BATCH_SIZE, FunctionInputs, RevitCarbonAnalyzer
+from src.domain.carbon.databases.enums import (
+    ConcreteDatabase,
+    SteelDatabase,
+    TimberDatabase,
+)
+from src.infrastructure.logging import Logging
+from src.services.carbon_calculator import CarbonCalculator
+from src.services.element_processor import ElementProcessor
+from src.services.material_processor import MaterialProcessor
+from src.services.result_consumers import (
+    AttachmentPayloadBuilder,
+    PdfRowBuilder,
+    SummaryCounter,
+)
+
+REINFORCEMENT_RATES = {
+    "Grade Beam": 100.0,
+    "Column": 450.0,
+    "Shear Walls": 150.0,
+    "Concrete Slabs": 120.0,
+    "Beams": 220.0,
+}
+
+
+class _AttributeProperties(dict):
+    """Properties dict that also exposes elementId as an attribute."""
+
+    @property
+    def elementId(self):
+        return self["elementId"]
+
+
+def _material(name, volume, structural_asset=None, density=None, strength=None):
+    material = {"materialName": name, "volume": {"value": volume}}
+    if structural_asset is not None:
+        material["structuralAsset"] = structural_asset
+    if density is not None:
+        material["density"] = {"value": density}
+    if strength is not None:
+        material["compressiveStrength"] = {"value": strength}
+    return material
+
+
+def _element(element_id, name, materials=None, element_id_property=None):
+    element = Base()
+    element.id = element_id
+    element.name = name
+    element.level = "Level 1"
+    element.properties = {}
+    if element_id_property is not None:
+        element.properties = _AttributeProperties(elementId=element_id_property)
+    if materials is not None:
+        element.properties["Material Quantities"] = {
+            str(i): m for i, m in enumerate(materials)
+        }
+    return element
+
+
+def build_model():
+    """Create a small model covering every result status."""
+    elements = [
+        _element(
+            "slab",
+            "Floor",
+            [_material("Concrete", 2.0, "Concrete", 2400, 32000)],
+            element_id_property="100",
+        ),
+        _element("beam", "Structural Framing", [_material("Steel", 0.5, "350W", 7850)]),
+        _element(
+            "panel",
+            "CLT Wall",
+            [_material("CLT Panel", 3.0, "CLT"), _material("Timber Stud", 1.0, "Stud")],
+        ),
+        _element("unknown", "Wall", [_material("Gypsum", 1.0)]),
+        _element("no-materials", "Wall"),
+    ]
+    grid = Base()
+    grid.id = "grid"
+    grid.family = "Grid"
+    elements.append(grid)
+
+    root = Base()
+    root.id = "root"
+    root.elements = elements
+    return root
+
+
+def build_analyzer(batch_size=DEFAULT_BATCH_SIZE):
+    """Create an analyzer wired like automate_function does."""
+    logger = Logging()
+    material_processor = MaterialProcessor()
+    return RevitCarbonAnalyzer(
+        material_processor=material_processor,
+        element_processor=ElementProcessor(
+            material_processor=material_processor, logger=logger
+        ),
+        carbon_calculator=CarbonCalculator(
+            steel_database=SteelDatabase.Type350MPa.value,
+            timber_database=TimberDatabase.Athena2021.value,
+            concrete_database=ConcreteDatabase.GulLowAir.value,
+            country="CAN",
+            custom_reinforcement_rates=REINFORCEMENT_RATES,
+            logger=logger,
+        ),
+        logger=logger,
+        batch_size=batch_size,
+    )
+
+
+class TestAnalyzer:
+    """Test suite for RevitCarbonAnalyzer.analyze_model"""
+
+    @pytest.fixture
+    def results_and_consumers(self):
+        """Analyze the test model with every consumer attached"""
+        consumers = [PdfRowBuilder(), AttachmentPayloadBuilder(), SummaryCounter()]
+        results = build_analyzer().analyze_model(build_model(), consumers=consumers)
+        return results, consumers
+
+    def test_statuses(self, results_and_consumers):
+        """Test that elements end up in the expected result lists"""
+        results, _ = results_and_consumers
+        assert [e["id"] for e in results["processed_elements"]] == ["slab", "beam"]
+        assert [e["id"] for e in results["skipped_elements"]] == ["grid"]
+        assert [e["id"] for e in results["warning_elements"]] == [
+            "panel",
+            "no-materials",
+            "root",
+        ]
+        assert [e["id"] for e in results["errors"]] == ["unknown"]
+        assert results["missing_factors"]["timber"] == ["Stud"]
+
+    def test_consumers_match_results(self, results_and_consumers):
+        """Test that the single-pass consumers agree with the results lists"""
+        results, (pdf_rows, payload, _) = results_and_consumers
+        for bucket in ("processed_elements", "skipped_elements", "warning_elements"):
+            assert payload.object_ids[bucket] == [e["id"] for e in results[bucket]]
+        assert payload.gradient_values == {
+            e["id"]: {"gradientValue": e["total_carbon"]}
+            for e in results["processed_elements"]
+        }
+        assert results["success_count"] == 2
+        assert results["error_count"] == 1
+
+        assert pdf_rows.rows[0] == PdfRowBuilder.HEADER
+        assert [row[:2] for row in pdf_rows.rows[1:]] == [["100", "Concrete"]]
+
+    def test_batch_matches_element_by_element(self):
+        """Test that the batch engine produces the same results dict"""
+        batch_model, single_model = build_model(), build_model()
+        batched = build_analyzer().analyze_model(batch_model)
+        single = build_analyzer(batch_size=1).analyze_model(single_model)
+        assert batched == single
+        assert (
+            batch_model.elements[0].properties["Embodied Carbon Calculation"]
+            == single_model.elements[0].properties["Embodied Carbon Calculation"]
+        )
+
+    def test_parallel_matches_serial(self):
+        """Test that parallel analysis merges into the same results as serial"""
+        serial_model, parallel_model = build_model(), build_model()
+        serial_model.elements = serial_model.elements * 20
+        parallel_model.elements = parallel_model.elements * 20
+
+        serial = build_analyzer().analyze_model(serial_model)
+        parallel = build_analyzer().analyze_model(
+            parallel_model, workers=2, parallel_threshold=1
+        )
+        assert parallel == serial
+        assert (
+            parallel_model.elements[0].properties["Embodied Carbon Calculation"]
+            == serial_model.elements[0].properties["Embodied Carbon Calculation"]
+        )
+
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_parallel_log_summaries_match_serial(self, buffered):
+        """Test that events logged by workers are merged into the run's logger"""
+        summaries = []
+        for workers in (1, 2):
+            model = build_model()
+            model.elements = model.elements * 20
+            analyzer = build_analyzer()
+            analyzer.logger = analyzer.element_processor.logger = Logging(
+                buffered=buffered
+            )
+            analyzer.analyze_model(model, workers=workers, parallel_threshold=1)
+            summaries.append(analyzer.logger)
+        serial, parallel = summaries
+
+        counts = {
+            level: {category: summary["count"] for category, summary in c.items()}
+            for level, c in serial.get_category_summary().items()
+        }
+        assert counts["warning"]
+        assert counts == {
+            level: {category: summary["count"] for category, summary in c.items()}
+            for level, c in parallel.get_category_summary().items()
+        }
+        assert {
+            category: set(ids)
+            for category, ids in parallel.get_warnings_summary().items()
+        } == {
+            category: set(ids)
+            for category, ids in serial.get_warnings_summary().items()
+        }
+
+    def test_default_inputs_build(self):
+        """Test that the default function inputs are valid"""
+        assert FunctionInputs().country == "CAN"
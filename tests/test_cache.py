@@ -0,0 +1,63 @@
+import pytest
+
+from src.domain.carbon.databases.enums import TimberDatabase
+from src.domain.carbon.emission_factor_registry import EmissionFactorRegistry
+from src.infrastructure.cache import BoundedCache, EvictionPolicy
+
+
+class TestBoundedCache:
+    """Test suite for BoundedCache"""
+
+    def test_negative_entries_are_cached(self):
+        """Test that None results are computed once"""
+        cache = BoundedCache()
+        calls = []
+        for _ in range(3):
+            assert cache.get_or_compute("missing", lambda: calls.append(1)) is None
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.parametrize(
+        "policy, survivor", [(EvictionPolicy.LRU, "a"), (EvictionPolicy.FIFO, "b")]
+    )
+    def test_eviction_policy(self, policy, survivor):
+        """Test which entry survives once the cache is full"""
+        cache = BoundedCache(maxsize=2, policy=policy)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert survivor in cache and "c" in cache
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalid_size(self):
+        """Test that a cache must hold at least one entry"""
+        with pytest.raises(ValueError, match="at least 1"):
+            BoundedCache(maxsize=0)
+
+
+class TestRegistryCaches:
+    """Test suite for the lookup caches of EmissionFactorRegistry"""
+
+    def test_caches_are_per_registry(self):
+        """Test that registries don't share cached lookups"""
+        first = EmissionFactorRegistry()
+        second = EmissionFactorRegistry(cache_size=1)
+        database = TimberDatabase.Athena2021.value
+
+        first.get_timber_factor("CLT", database)
+        first.get_timber_factor("CLT", database)
+        second.get_timber_factor("CLT", database)
+        second.get_timber_factor("Unknown", database)
+        assert second.get_timber_factor("Unknown", database) is None
+
+        assert first.stats()["timber"]["hits"] == 1
+        assert second.stats()["timber"] == {
+            "hits": 1,
+            "misses": 2,
+            "evictions": 1,
+            "size": 1,
+            "maxsize": 1,
+        }
@@ -0,0 +1,64 @@
+import pickle
+
+from src.domain.types import ElementCategory
+from src.services.calculation_plan import PSI_PER_MPA
+from src.services.carbon_calculator import CarbonCalculator
+from tests.test_carbon_batch import _calculator, _random_elements
+
+
+class TestCalculationPlan:
+    """Test suite for the compiled calculation plan"""
+
+    def test_concrete_categories(self):
+        """Test that each element category resolves its concrete type once"""
+        plan = _calculator("CAN").plan
+
+        column = plan.concrete_type(ElementCategory.COLUMN)
+        assert column.element_type == "Column"
+        assert column.reinforcement_rate == 450.0
+        assert column.rebar_factor is plan.rebar_factor
+        assert column.factors == tuple(
+            plan.concrete_table.get_factor_by_strength_and_element(strength, "Column")
+            for strength in plan.concrete_table.strength_labels
+        )
+        assert plan.concrete_type(None).element_type == "Beam"
+
+    def test_strength_units(self):
+        """Test that only US plans convert large strengths from PSI"""
+        assert _calculator("CAN").plan.strength_mpa(4000.0) == 4000.0
+        assert _calculator("USA").plan.strength_mpa(4000.0) == 4000.0 / PSI_PER_MPA
+        assert _calculator("USA").plan.strength_mpa(30.0) == 30.0
+
+    def test_timber_and_steel_tables(self):
+        """Test that factors are looked up in the resolved databases"""
+        plan = _calculator("CAN").plan
+
+        assert plan.timber_table.get_factor("CLT") is not None
+        assert plan.timber_factor("cross laminated timber") is plan.timber_factor("CLT")
+        assert plan.steel_factor("350W") is plan.steel_table.get_factor("Hot Rolled")
+        assert plan.timber_factor("Unknown") is None
+
+    def test_plan_is_picklable(self):
+        """Test that a plan is sent as its settings and compiled again"""
+        plan = _calculator("USA", interpolate_concrete_strength=True).plan
+        received = pickle.loads(pickle.dumps(plan))
+
+        assert received.settings == plan.settings
+        assert received.timber_table is plan.timber_table
+        assert received.steel_table is plan.steel_table
+        assert received.concrete_table is plan.concrete_table
+        assert received.concrete_types == plan.concrete_types
+        assert received.psi_per_mpa == plan.psi_per_mpa
+
+    def test_calculator_from_plan(self):
+        """Test that a calculator from a received plan calculates the same"""
+        calculator = _calculator("USA")
+        received = CarbonCalculator.from_plan(
+            pickle.loads(pickle.dumps(calculator.plan))
+        )
+
+        for element in _random_elements(4, count=100):
+            assert received.calculate_carbon(element) == calculator.calculate_carbon(
+                element
+            )
+        assert received.get_missing_factors() == calculator.get_missing_factors()
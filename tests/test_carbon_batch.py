@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from src.domain.carbon.databases.enums import (
+    ConcreteDatabase,
+    SteelDatabase,
+    TimberDatabase,
+)
+from src.domain.types import (
+    BuildingElement,
+    ElementCategory,
+    Material,
+    MaterialProperties,
+    MaterialType,
+)
+from src.services.carbon_calculator import CarbonCalculator
+
+TIMBER_NAMES = ["CLT", "Glulam", "GL24h", "LVL", "Stud", "plywood", None]
+STEEL_GRADES = ["350W", "Hot Rolled", "HSS", "default_steel", "Unknown", None]
+STRENGTHS = [25.0, 32.5, 35000000.0, 4000.0, 27.5, 0.0, None, 30]
+
+
+def _random_material(rng):
+    material_type = rng.choice(list(MaterialType))
+    volume = rng.choice([rng.uniform(0.01, 20.0), 0, None])
+    if material_type == MaterialType.WOOD:
+        return Material(
+            type=material_type,
+            properties=MaterialProperties(
+                name=f"Timber {rng.randint(0, 3)}",
+                volume=volume,
+                structural_asset=rng.choice(TIMBER_NAMES),
+            ),
+        )
+    if material_type == MaterialType.METAL:
+        return Material(
+            type=material_type,
+            properties=MaterialProperties(
+                name=f"Steel {rng.randint(0, 3)}", volume=1.0
+            ),
+            grade=rng.choice(STEEL_GRADES),
+            mass=rng.choice([rng.uniform(1.0, 5000.0), None]),
+        )
+    return Material(
+        type=material_type,
+        properties=MaterialProperties(
+            name=f"Concrete {rng.randint(0, 3)}",
+            volume=volume,
+            compressive_strength=rng.choice(STRENGTHS),
+        ),
+    )
+
+
+def _random_elements(seed, count=300):
+    rng = random.Random(seed)
+    return [
+        BuildingElement(
+            id=str(i),
+            level="Level 1",
+            category=rng.choice(list(ElementCategory)),
+            materials=[_random_material(rng) for _ in range(rng.randint(0, 4))],
+        )
+        for i in range(count)
+    ]
+
+
+def _calculator(country, interpolate_concrete_strength=False):
+    return CarbonCalculator(
+        steel_database=SteelDatabase.Type350MPa.value,
+        timber_database=TimberDatabase.Athena2021.value,
+        concrete_database=ConcreteDatabase.GuHighAir.value,
+        country=country,
+        custom_reinforcement_rates={"Column": 450.0, "Beams": 220.0},
+        interpolate_concrete_strength=interpolate_concrete_strength,
+    )
+
+
+class TestCarbonBatch:
+    """Test suite for the columnar batch carbon engine"""
+
+    @pytest.mark.parametrize("interpolate", [False, True])
+    @pytest.mark.parametrize("country", ["CAN", "USA"])
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_batch_matches_per_element_calculation(self, country, seed, interpolate):
+        """Test that batch results equal calculate_carbon for every element"""
+        elements = _random_elements(seed)
+        scalar_calculator = _calculator(country, interpolate)
+        batch_calculator = _calculator(country, interpolate)
+
+        expected = [scalar_calculator.calculate_carbon(e) for e in elements]
+        batch = batch_calculator.calculate_batch(elements)
+
+        assert len(batch) == len(elements)
+        for index, (results, errors) in enumerate(expected):
+            batch_results, batch_errors = batch.element_results(index)
+            assert list(batch_results) == list(results)
+            assert batch_results == results
+            assert batch_errors == errors
+        assert (
+            batch_calculator.get_missing_factors()
+            == scalar_calculator.get_missing_factors()
+        )
+
+    def test_empty_batch(self):
+        """Test a batch without any materials"""
+        batch = _calculator("CAN").calculate_batch([])
+        assert len(batch) == 0
@@ -0,0 +1,78 @@
+from src.domain.types import (
+    BuildingElement,
+    ElementCategory,
+    Material,
+    MaterialProperties,
+    MaterialType,
+)
+from src.services.carbon_calculator import CalculationStatus
+from tests.test_carbon_batch import _calculator
+
+
+def _timber(name):
+    return Material(
+        type=MaterialType.WOOD,
+        properties=MaterialProperties(name=name, volume=2.0, structural_asset=name),
+    )
+
+
+def _concrete(strength):
+    return Material(
+        type=MaterialType.CONCRETE,
+        properties=MaterialProperties(
+            name="Concrete", volume=2.0, compressive_strength=strength
+        ),
+    )
+
+
+class TestCarbonCalculator:
+    """Test suite for the status-returning material calculation"""
+
+    def test_calculated_material(self):
+        """Test that a known factor gives an OK outcome with its result"""
+        outcome = _calculator("CAN").calculate_material(_timber("CLT"))
+        assert outcome.status is CalculationStatus.OK
+        assert outcome.result.total_carbon == outcome.result.factor * 2.0
+
+    def test_missing_factor_is_returned_not_raised(self):
+        """Test that a lookup miss returns its kind and key, shared across misses"""
+        calculator = _calculator("CAN")
+        outcome = calculator.calculate_material(_timber("Bamboo"))
+        assert outcome.status is CalculationStatus.MISSING_FACTOR
+        assert (outcome.factor_kind, outcome.factor_key) == ("timber", "Bamboo")
+        assert outcome.result is None
+        assert calculator.calculate_material(_timber("Bamboo")) is outcome
+
+    def test_missing_strength(self):
+        """Test that concrete without a strength is a missing input"""
+        outcome = _calculator("CAN").calculate_material(
+            _concrete(None), ElementCategory.SLAB
+        )
+        assert outcome.status is CalculationStatus.MISSING_INPUT
+        assert outcome.factor_kind is None
+
+    def test_calculate_carbon_tracks_misses(self):
+        """Test that misses become errors and missing factors of the element"""
+        calculator = _calculator("CAN")
+        element = BuildingElement(
+            id="1",
+            level="Level 1",
+            category=ElementCategory.WALL,
+            materials=[_timber("CLT"), _timber("Bamboo"), _concrete(None)],
+        )
+
+        results, errors = calculator.calculate_carbon(element)
+
+        assert list(results) == ["CLT"]
+        assert errors == [
+            {
+                "material": "Bamboo",
+                "error": "No emission factor found for wood type: Bamboo",
+            },
+            {
+                "material": "Concrete",
+                "error": "Compressive strength required for concrete carbon "
+                "calculation",
+            },
+        ]
+        assert calculator.get_missing_factors() == (["Bamboo"], [], [])
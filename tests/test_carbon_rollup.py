@@ -0,0 +1,86 @@
+import pytest
+
+from src.domain.types import CarbonResult, ElementCategory
+from src.services.carbon_rollup import CarbonRollup, RollupKey
+from src.services.pdf_report import rollup_sections, write_pdf_report
+from src.services.result_consumers import PdfRowBuilder
+from tests.test_analyzer import build_analyzer, build_model
+
+
+def _result(level, category, materials, status="processed"):
+    return {
+        "status": status,
+        "level": level,
+        "category": category,
+        "carbon_results": {
+            name: CarbonResult(
+                factor=1.0,
+                total_carbon=carbon,
+                category=material_type,
+                quantity=quantity,
+                database="Test",
+            )
+            for name, material_type, quantity, carbon in materials
+        },
+    }
+
+
+@pytest.fixture
+def rollup():
+    """Roll up a few elements spanning two levels and material types"""
+    rollup = CarbonRollup()
+    for element_result in [
+        _result(
+            "Level 1",
+            ElementCategory.SLAB,
+            [("Concrete", "Concrete", 2.0, 10.0), ("Deck", "Metal", 50.0, 5.0)],
+        ),
+        _result("Level 1", ElementCategory.BEAM, [("Steel", "Metal", 100.0, 20.0)]),
+        _result("Level 2", ElementCategory.SLAB, [("CLT", "Wood", 3.0, 1.0)]),
+        _result(
+            "Level 2", ElementCategory.WALL, [("CLT", "Wood", 1.0, 7.0)], "warning"
+        ),
+    ]:
+        rollup.consume(None, element_result)
+    return rollup
+
+
+class TestCarbonRollup:
+    """Test suite for the level x category x material rollup"""
+
+    def test_groups(self, rollup):
+        """Test the totals of the finest groups, without warning elements"""
+        assert len(rollup.groups) == 4
+        totals = rollup.groups[RollupKey("Level 1", "Slabs", "Metal", "Test")]
+        assert (totals.elements, totals.mass, totals.total_carbon) == (1, 50.0, 5.0)
+        assert rollup.total().total_carbon == 36.0
+
+    def test_coarser_groups(self, rollup):
+        """Test that elements are counted once per level but per material type"""
+        by_level = rollup.by("level")
+        assert list(by_level) == [("Level 1",), ("Level 2",)]
+        assert by_level[("Level 1",)].elements == 2
+        assert by_level[("Level 1",)].materials == 3
+        assert by_level[("Level 1",)].total_carbon == 35.0
+        assert rollup.by("material_type")[("Metal",)].elements == 2
+
+    def test_unknown_field(self, rollup):
+        """Test that only rollup fields can be grouped by"""
+        with pytest.raises(ValueError, match="material"):
+            rollup.by("level", "material")
+
+    def test_total_matches_run(self):
+        """Test that the rollup of a run adds up to its total carbon"""
+        rollup = CarbonRollup()
+        results = build_analyzer().analyze_model(build_model(), consumers=[rollup])
+        assert results["rollup"] is rollup
+        assert rollup.total().total_carbon == pytest.approx(results["total_carbon"])
+        assert rollup.total().elements == len(results["processed_elements"])
+
+    def test_report_sections(self, rollup, tmp_path):
+        """Test that the rollup tables are rendered in the report"""
+        sections = rollup_sections(rollup)
+        assert [len(rows) for _, rows in sections] == [3, 4, 5]
+        path = tmp_path / "report.pdf"
+        write_pdf_report(str(path), [list(PdfRowBuilder.HEADER)], sections=sections)
+        assert path.read_bytes().count(b"/Type /Page\n") == 1
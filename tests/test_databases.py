@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from src.domain.carbon.databases.base import EmissionFactorDatabase
+from src.domain.carbon.databases.database_factory import DatabaseFactory
+from src.domain.carbon.databases.enums import (
+    ConcreteDatabase,
+    SteelDatabase,
+    TimberDatabase,
+)
+from src.domain.carbon.schema import EmissionFactor
+
+DATABASES = [
+    DatabaseFactory.create_timber_database(db.value) for db in TimberDatabase
+] + [DatabaseFactory.create_steel_database(db.value) for db in SteelDatabase]
+
+
+def _legacy_get_factor(database, material_name):
+    """The linear scan get_factor used before the index."""
+    material_name = material_name.lower()
+    for name, factor in database._factors.items():
+        if name.lower() == material_name:
+            return factor
+    return None
+
+
+def _factor(value):
+    return EmissionFactor(value=value, unit="kgCO₂e/m³", database="Test")
+
+
+class _TestDatabase(EmissionFactorDatabase):
+    def __init__(self):
+        super().__init__()
+        self._factors = {
+            "Cross Laminated Timber": _factor(1),
+            "CLT": _factor(2),
+            "Glulam": _factor(3),
+            "GLULAM": _factor(4),
+        }
+
+
+class TestEmissionFactorDatabase:
+    """Test suite for the normalized factor index of the databases"""
+
+    @pytest.mark.parametrize("database", DATABASES, ids=type)
+    def test_index_matches_linear_scan(self, database):
+        """Test that every name resolves to the factor the old scan returned"""
+        names = list(database._factors)
+        queries = names + [n.upper() for n in names] + ["Unknown", ""]
+        for query in queries:
+            assert database.get_factor(query) is _legacy_get_factor(database, query)
+
+    def test_whitespace_is_normalized(self):
+        """Test that surrounding and repeated whitespace is ignored"""
+        database = _TestDatabase()
+        factor = database.get_factor("  cross   laminated\ttimber ")
+        assert factor.value == 1
+
+    def test_first_duplicate_wins(self):
+        """Test that the first of several names normalizing alike wins"""
+        database = _TestDatabase()
+        assert database.get_factor("clt").value == 2
+        assert database.get_factor("glulam").value == 3
+
+    def test_factors_are_frozen_once_indexed(self):
+        """Test that factors can't change behind the index"""
+        database = _TestDatabase()
+        database.get_factor("CLT")
+        with pytest.raises(TypeError):
+            database._factors["LVL"] = _factor(5)
+
+
+class TestDatabaseFactory:
+    """Test suite for the shared database handles"""
+
+    def test_databases_are_built_once(self):
+        """Test that every create call returns the same compiled handle"""
+        name = TimberDatabase.Athena2021.value
+        assert DatabaseFactory.create_timber_database(
+            name
+        ) is DatabaseFactory.create_timber_database(name)
+        concrete = DatabaseFactory.create_concrete_database(
+            ConcreteDatabase.GulLowAir.value
+        )
+        assert concrete is DatabaseFactory.create_concrete_database(
+            ConcreteDatabase.GulLowAir.value
+        )
+        assert concrete.get_factor_by_strength_and_element("35", "Beam").value == 250
+
+    def test_factors_are_immutable(self):
+        """Test that shared factors can't be changed by one user"""
+        factor = DatabaseFactory.create_steel_database(
+            SteelDatabase.Type350MPa.value
+        ).get_factor("HSS")
+        with pytest.raises(AttributeError):
+            factor.value = 0
+
+
+class TestConcreteFactorTensor:
+    """Test suite for the integer indexed concrete factor table"""
+
+    def _database(self):
+        return DatabaseFactory.create_concrete_database(
+            ConcreteDatabase.GulLowAir.value
+        )
+
+    def test_table_matches_factors(self):
+        """Test that every factor of the database is in its table"""
+        database = self._database()
+        beam = database.element_type_indices["Beam"]
+        for index, strength in enumerate(database.strength_labels):
+            factor = database.get_factor_by_strength_and_element(strength, "Beam")
+            assert database.factor_at(index, beam) is factor
+            assert database.factor_table[index, beam] == factor.value
+
+    def test_snapped_lookups(self):
+        """Test that strengths snap to the nearest bin, the lower one on ties"""
+        database = self._database()
+        strengths = np.array([10.0, 27.5, 33.0, 60.0])
+        assert database.strength_indices(strengths).tolist() == [0, 0, 2, 5]
+        assert [database.strength_index(s) for s in strengths] == [0, 0, 2, 5]
+
+    def test_interpolated_lookups(self):
+        """Test that interpolation is linear between bins and clamped outside"""
+        database = self._database()
+        beam = database.element_type_indices["Beam"]
+        strengths = np.array([20.0, 27.5, 35.0, 60.0])
+        expected = [188.0, 204.0, 250.0, 320.0]
+        values = database.factor_values(strengths, np.full(4, beam), interpolate=True)
+        assert values.tolist() == expected
+        assert [database.interpolated_value(s, beam) for s in strengths] == expected
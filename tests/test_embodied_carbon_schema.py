@@ -0,0 +1,100 @@
+import json
+
+from specklepy.api import operations
+from specklepy.logging import metrics
+from specklepy.objects import Base
+from specklepy.transports.memory import MemoryTransport
+
+from src.domain.types import CarbonResult, ConcreteCarbonResult
+from src.services.embodied_carbon_schema import (
+    CompactSchema,
+    VerboseSchema,
+    parse_embodied_carbon,
+)
+
+
+def _results(total_carbon=100.0):
+    return {
+        "CLT Panel": CarbonResult(
+            factor=120.0,
+            total_carbon=total_carbon,
+            category="Wood",
+            quantity=total_carbon / 120.0,
+            database="Athena 2021",
+        ),
+        "Concrete": ConcreteCarbonResult(
+            factor=250.0,
+            total_carbon=2 * total_carbon,
+            category="Concrete",
+            quantity=1.5,
+            database="GUL Cement, Low Air",
+            concrete_volume=1.5,
+            concrete_carbon=total_carbon,
+            reinforcement_mass=150.0,
+            reinforcement_rate=100.0,
+            reinforcement_factor=0.8,
+            reinforcement_carbon=total_carbon,
+        ),
+    }
+
+
+def _element(block):
+    element = Base()
+    element.properties = {"Embodied Carbon Calculation": block}
+    return element
+
+
+class TestEmbodiedCarbonSchema:
+    """Test suite for the layouts of the Embodied Carbon Calculation property"""
+
+    def test_verbose_roundtrip(self):
+        """Test that the verbose property parses back to its results"""
+        block = VerboseSchema().build(_results())
+        assert block["CLT Panel"]["embodiedCarbonFactor"]["units"] == "kgCO₂e/m³"
+        assert parse_embodied_carbon(block) == _results()
+
+    def test_compact_roundtrip_through_serialization(self):
+        """Test that the compact property survives a send and receive"""
+        metrics.disable()
+        schema = CompactSchema()
+        root = Base()
+        root.elements = [_element(schema.build(_results(v))) for v in (1.0, 2.0)]
+
+        received = operations.deserialize(operations.serialize(root))
+        for value, element in zip((1.0, 2.0), received.elements):
+            block = element.properties["Embodied Carbon Calculation"]
+            assert parse_embodied_carbon(block) == _results(value)
+
+    def test_compact_definitions_are_shared(self):
+        """Test that elements with equal factors reference one definition"""
+        metrics.disable()
+        schema = CompactSchema()
+        first = schema.build(_results(1.0))
+        second = schema.build(_results(2.0))
+        assert first["Concrete"]["@definition"] is second["Concrete"]["@definition"]
+        assert first["Concrete"]["@definition"] is not first["CLT Panel"]["@definition"]
+
+        root = Base()
+        root.elements = [_element(block) for block in (first, second)]
+        transport = MemoryTransport()
+        operations.send(root, [transport], use_default_cache=False)
+        definitions = [
+            obj
+            for obj in map(json.loads, transport.objects.values())
+            if "embodiedCarbonFactor" in obj
+        ]
+        # One definition per material, however many elements reference it
+        assert len(definitions) == 2
+
+    def test_compact_property_is_smaller(self):
+        """Test that the compact property uploads less than the verbose one"""
+        metrics.disable()
+
+        def sent_size(schema):
+            root = Base()
+            root.elements = [_element(schema.build(_results(v))) for v in range(50)]
+            transport = MemoryTransport()
+            operations.send(root, [transport], use_default_cache=False)
+            return sum(map(len, transport.objects.values()))
+
+        assert sent_size(CompactSchema()) < 0.8 * sent_size(VerboseSchema())
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Budget for the self time of the project's own modules, in milliseconds
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 250))
+
+# Modules that must only be imported once the run needs them
+DEFERRED_MODULES = [
+    "reportlab",
+    "src.domain.carbon.databases.timber",
+    "src.domain.carbon.databases.steel",
+    "src.domain.carbon.databases.concrete",
+]
+
+
+def _import_times(module: str):
+    """Import a module in a fresh interpreter and return its -X importtime rows."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+@pytest.fixture(scope="module")
+def rows():
+    """Import main once and collect the per-module import times"""
+    rows = _import_times("main")
+    print("\nSlowest imports of main (cumulative ms):")
+    for name, _, cumulative_us in sorted(rows, key=lambda r: -r[2])[:15]:
+        print(f"  {cumulative_us / 1000:8.1f}  {name}")
+    return rows
+
+
+class TestImportTime:
+    """Test suite for the cold start import cost of main"""
+
+    def test_heavy_modules_are_deferred(self, rows):
+        """Test that reportlab and the databases aren't imported with main"""
+        imported = {name for name, _, _ in rows}
+        for module in DEFERRED_MODULES:
+            assert not any(
+                name == module or name.startswith(f"{module}.") for name in imported
+            ), module
+
+    def test_project_modules_within_budget(self, rows):
+        """Test the self time of the project's own modules against the budget"""
+        project_us = sum(
+            self_us
+            for name, self_us, _ in rows
+            if name == "main" or name.startswith("src.")
+        )
+        assert project_us / 1000 <= IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,199 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import requests
+from specklepy.api import operations
+from specklepy.logging import metrics
+from specklepy.transports.memory import MemoryTransport
+
+from src.services import incremental_index
+from src.services.incremental_index import (
+    RUN_RECORD_KEY,
+    IncrementalIndex,
+    RunRecordBuilder,
+    embodied_carbon_block,
+    settings_key,
+)
+from src.services.overlay_output import OverlayBuilder
+from src.services.result_consumers import AttachmentPayloadBuilder, PdfRowBuilder
+from tests.test_analyzer import build_analyzer, build_model
+
+SETTINGS_KEY = settings_key({"country": "CAN"})
+
+
+def _analyze(model, previous=None):
+    analyzer = build_analyzer()
+    consumers = [PdfRowBuilder(), AttachmentPayloadBuilder(), RunRecordBuilder()]
+    results = analyzer.analyze_model(model, consumers=consumers, previous=previous)
+    return analyzer, results, consumers
+
+
+def _previous_output():
+    """Analyze the test model and return its output as received from the server."""
+    metrics.disable()
+    model = build_model()
+    _, _, (_, _, run_record) = _analyze(model)
+    run_record.attach_to(model, SETTINGS_KEY)
+    return operations.deserialize(operations.serialize(model))
+
+
+class TestIncrementalIndex:
+    """Test suite for reusing the results of a previous output version"""
+
+    @pytest.fixture
+    def index(self):
+        """Create an index from the previous output of the test model"""
+        return IncrementalIndex.from_output_root(_previous_output(), SETTINGS_KEY)
+
+    def test_only_processed_elements_are_reusable(self, index):
+        """Test that the index is keyed on source ids of processed elements"""
+        assert len(index) == 2
+        assert "slab" in index and "beam" in index
+        assert "panel" not in index
+
+    def test_record_stores_each_distinct_block_once(self):
+        """Test that elements point to blocks by hash rather than copy them"""
+        model = build_model()
+        model.elements[1].properties = dict(model.elements[0].properties)
+        _, _, (_, _, run_record) = _analyze(model)
+
+        slab, beam = run_record.elements
+        assert "block" not in slab
+        assert slab["hash"] == beam["hash"]
+        assert list(run_record.blocks) == [slab["hash"]]
+
+    def test_run_record_is_received_alone(self):
+        """Test that the record is a detached child holding the blocks it reuses"""
+        metrics.disable()
+        model = build_model()
+        _, _, (_, _, run_record) = _analyze(model)
+        run_record.attach_to(model, SETTINGS_KEY)
+        transport = MemoryTransport()
+        root_id = operations.send(model, [transport], use_default_cache=False)
+
+        reference = json.loads(transport.objects[root_id])[RUN_RECORD_KEY]
+        record = operations.deserialize(
+            transport.objects[reference["referencedId"]], read_transport=transport
+        )
+        index = IncrementalIndex.from_run_record(record, SETTINGS_KEY)
+        assert len(index) == 2
+        assert index.reuse(model.elements[0])["total_carbon"] > 0
+
+    def test_other_settings_are_not_reused(self):
+        """Test that results computed with other settings are ignored"""
+        other_key = settings_key({"country": "USA"})
+        assert not IncrementalIndex.from_output_root(_previous_output(), other_key)
+
+    def test_incremental_run_matches_full_run(self, index):
+        """Test that reusing results gives the same totals and attachments"""
+        model = build_model()
+        # The beam changed since the previous run, so its id changed too
+        model.elements[1].id = "beam-2"
+        full_model = build_model()
+        full_model.elements[1].id = "beam-2"
+
+        analyzer, results, consumers = _analyze(model, previous=index)
+        full_analyzer, full_results, full_consumers = _analyze(full_model)
+
+        assert results["total_carbon"] == full_results["total_carbon"]
+        assert results["processed_elements"] == full_results["processed_elements"]
+        assert consumers[0].rows == full_consumers[0].rows
+        assert consumers[1].object_ids == full_consumers[1].object_ids
+        assert consumers[1].gradient_values == full_consumers[1].gradient_values
+        assert consumers[2].elements == full_consumers[2].elements
+        for element, full_element in zip(model.elements, full_model.elements):
+            assert embodied_carbon_block(element) == embodied_carbon_block(full_element)
+
+        # Only the slab was reused, so one material less was processed
+        stats = analyzer.material_processor.stats()
+        full_stats = full_analyzer.material_processor.stats()
+        assert stats["hits"] + stats["misses"] == (
+            full_stats["hits"] + full_stats["misses"] - 1
+        )
+
+
+class FakeClient:
+    """Client whose output model has the given versions"""
+
+    def __init__(self, *referenced_objects):
+        self.branch = self
+        self.commits = SimpleNamespace(
+            items=[SimpleNamespace(referencedObject=o) for o in referenced_objects]
+        )
+
+    def get(self, project_id, model_name, commits_limit):
+        return self
+
+
+class TestPreviousVersion:
+    """Test suite for loading the index from the previous output version"""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        """Serve the objects sent to a memory transport as a project would"""
+        metrics.disable()
+        server = MemoryTransport()
+        monkeypatch.setattr(
+            incremental_index, "ServerTransport", lambda stream_id, client: server
+        )
+        monkeypatch.setattr(
+            incremental_index,
+            "fetch_single_object",
+            lambda transport, object_id: json.loads(transport.objects[object_id]),
+        )
+        monkeypatch.setattr(
+            operations,
+            "receive",
+            lambda object_id, transport: operations.deserialize(
+                transport.objects[object_id], read_transport=transport
+            ),
+        )
+        return server
+
+    def _load(self, client):
+        return IncrementalIndex.from_previous_version(
+            client, "project", "model_embodied_carbon", SETTINGS_KEY
+        )
+
+    def test_no_previous_version(self, server):
+        """Test that a model without versions gives an empty index"""
+        assert not self._load(FakeClient())
+
+    def test_version_without_run_record(self, server):
+        """Test that a version of a run without a record gives an empty index"""
+        root_id = operations.send(build_model(), [server], use_default_cache=False)
+        assert not self._load(FakeClient(root_id))
+
+    def test_run_record_is_reused(self, server):
+        """Test that the record of the previous version is received and indexed"""
+        model = build_model()
+        _, _, (_, _, run_record) = _analyze(model)
+        run_record.attach_to(model, SETTINGS_KEY)
+        root_id = operations.send(model, [server], use_default_cache=False)
+
+        index = self._load(FakeClient(root_id))
+        assert len(index) == 2
+        assert index.reuse(build_model().elements[0])["total_carbon"] > 0
+
+    def test_overlay_run_record_is_reused(self, server):
+        """Test that the blocks of an overlay record are read from its objects"""
+        model = build_model()
+        overlay, run_record = OverlayBuilder(), RunRecordBuilder(keep_blocks=False)
+        build_analyzer().analyze_model(model, consumers=[overlay, run_record])
+        root = overlay.build("model_embodied_carbon")
+        run_record.attach_to(root, SETTINGS_KEY)
+        root_id = operations.send(root, [server], use_default_cache=False)
+
+        index = self._load(FakeClient(root_id))
+        assert len(index) == 2
+        assert index.reuse(build_model().elements[0])["total_carbon"] > 0
+
+    def test_server_errors_give_an_empty_index(self, server, monkeypatch):
+        """Test that a failing request falls back to a full run"""
+
+        def fail(transport, object_id):
+            raise requests.HTTPError("500 Server Error")
+
+        monkeypatch.setattr(incremental_index, "fetch_single_object", fail)
+        assert not self._load(FakeClient("root"))
@@ -0,0 +1,196 @@
+import json
+
+import pytest
+
+from main import RevitCarbonAnalyzer
+from src.domain.carbon.databases.enums import (
+    ConcreteDatabase,
+    SteelDatabase,
+    TimberDatabase,
+)
+from src.infrastructure.logging import Logging
+from tests.test_analyzer import REINFORCEMENT_RATES, build_analyzer, build_model
+
+
+class TestTimingSpans:
+    """Test suite for the timing spans of Logging"""
+
+    def test_disabled_spans_record_nothing(self):
+        """Test that spans are shared no-ops until timing is enabled"""
+        logger = Logging()
+        assert logger.span("a") is logger.sampled_span("b")
+        with logger.span("a"):
+            pass
+        items = [1, 2]
+        assert logger.timed_iteration(items, "c") is items
+        assert logger.get_timing_summary() == {}
+
+    def test_sampled_spans_estimate_the_total(self):
+        """Test that sampled spans count every call but time one in N"""
+        logger = Logging()
+        logger.enable_timing(sample_every=10)
+        for _ in range(100):
+            with logger.sampled_span("element"):
+                pass
+        with logger.span("stage"):
+            pass
+
+        summary = logger.get_timing_summary()
+        assert list(summary) == ["element", "stage"]
+        assert (summary["element"]["calls"], summary["element"]["timed"]) == (100, 10)
+        assert summary["element"]["total_s"] == pytest.approx(
+            summary["element"]["mean_ms"] * 100 / 1000, abs=1e-5
+        )
+        assert (summary["stage"]["calls"], summary["stage"]["timed"]) == (1, 1)
+
+    def test_invalid_sample_rate(self):
+        """Test that at least every call can be sampled"""
+        with pytest.raises(ValueError, match="at least 1"):
+            Logging().enable_timing(sample_every=0)
+
+    def test_analysis_spans(self, tmp_path):
+        """Test that an analysis records its hot spans and writes a summary"""
+        analyzer = build_analyzer()
+        analyzer.logger.enable_timing(sample_every=1)
+        analyzer.analyze_model(build_model())
+
+        summary = analyzer.logger.get_timing_summary()
+        assert summary["prepare_element"]["calls"] == 7
+        # The slab, beam, panel and unknown elements reach the calculation
+        assert summary["calculate_element"]["calls"] == 4
+        # The steel and both timber lookups, the concrete of the batch, and
+        # the timber stud without a factor again on its fallback path
+        assert summary["factor_lookup"]["calls"] == 5
+        assert summary["iterate_elements"]["timed"] > 7
+        assert summary["consume_result"]["calls"] == 7
+
+        path = tmp_path / "timings.json"
+        analyzer.logger.log_timing_summary(str(path))
+        assert json.loads(path.read_text()) == summary
+
+
+class TestBufferedLogging:
+    """Test suite for buffered, aggregated logging"""
+
+    def test_unbuffered_summaries_keep_every_object(self):
+        """Test that the default mode still lists every distinct object"""
+        logger = Logging()
+        for index in range(50):
+            logger.log_warning(f"element-{index}", "Material Processing")
+        logger.log_warning("element-0", "Material Processing")
+
+        (ids,) = logger.get_warnings_summary().values()
+        assert len(ids) == 50
+        summary = logger.get_category_summary()["warning"]["Material Processing"]
+        assert summary["count"] == 51
+        assert len(summary["sample_ids"]) == 20
+        assert summary["sample_messages"] == []
+
+    def test_buffered_logging_counts_and_samples(self, monkeypatch):
+        """Test that buffered logging counts every event and keeps a sample"""
+        logger = Logging(buffered=True, sample_size=5)
+        emitted = []
+        monkeypatch.setattr(logger, "_emit", lambda *args, **kw: emitted.append(args))
+        for index in range(1000):
+            logger.log_error(f"element-{index}", "Element Processing", f"bad {index}")
+        logger.log_info("element-0", "Cache")
+
+        assert emitted == []
+        summary = logger.get_category_summary()
+        errors = summary["error"]["Element Processing"]
+        assert errors["count"] == 1000
+        assert len(errors["sample_ids"]) == len(errors["sample_messages"]) == 5
+        # The reservoir keeps later events too, not only the first ones
+        assert any(int(i.split("-")[1]) >= 5 for i in errors["sample_ids"])
+        assert logger.get_errors_summary() == {
+            "Element Processing": errors["sample_ids"]
+        }
+        assert summary["info"]["Cache"]["sample_messages"] == ["Information logged"]
+
+        logger.log_category_summary()
+        assert [args[:2] for args in emitted] == [
+            ("error", "Log summary"),
+            ("info", "Log summary"),
+        ]
+
+    def test_merged_events_keep_a_bounded_sample(self):
+        """Test that merging the events of another logger adds up its counts"""
+        logger, worker = Logging(buffered=True, sample_size=5), Logging(
+            buffered=True, sample_size=5
+        )
+        for index in range(30):
+            logger.log_warning(f"a-{index}", "Material Processing")
+            worker.log_warning(f"b-{index}", "Material Processing")
+        worker.log_error("b", "Element Processing")
+        logger.merge_events(worker.take_events())
+
+        summary = logger.get_category_summary()
+        warnings = summary["warning"]["Material Processing"]
+        assert warnings["count"] == 60
+        assert len(warnings["sample_ids"]) == 5
+        assert summary["error"]["Element Processing"]["sample_ids"] == ["b"]
+        assert worker.get_category_summary() == {}
+
+    def test_background_sink_emits_every_event(self, monkeypatch):
+        """Test that the background sink writes the queued events on close"""
+        logger = Logging(buffered=True, background_sink=True)
+        emitted = []
+        monkeypatch.setattr(logger, "_emit", lambda *args, **kw: emitted.append(kw))
+        for index in range(100):
+            logger.log_warning(f"element-{index}", "Material Processing")
+        logger.close()
+
+        assert [kw["object_id"] for kw in emitted] == [
+            f"element-{index}" for index in range(100)
+        ]
+        assert logger.dropped_events == 0
+
+    def test_background_sink_drops_when_full(self):
+        """Test that a full sink queue drops events instead of blocking"""
+        logger = Logging(buffered=True, background_sink=True, sink_queue_size=1)
+        logger.close()
+        # Without its thread, the sink queue fills after one event
+        logger.log_warning("a", "Material Processing")
+        logger.log_warning("b", "Material Processing")
+
+        assert logger.dropped_events == 1
+        summary = logger.get_category_summary()["warning"]["Material Processing"]
+        assert summary["count"] == 2
+
+    def test_buffered_analysis_summaries(self):
+        """Test that an analysis logging into a buffered logger stays summarized"""
+        analyzer = build_analyzer()
+        analyzer.logger = analyzer.element_processor.logger = Logging(buffered=True)
+        analyzer.analyze_model(build_model())
+
+        summary = analyzer.logger.get_category_summary()
+        assert summary["warning"]["Material Processing"]["count"] >= 1
+        assert analyzer.logger.get_warnings_summary()["Material Processing"]
+
+    def test_analysis_with_background_writer(self, monkeypatch):
+        """Test that an analyzer's background writer emits every event on close"""
+        analyzer = RevitCarbonAnalyzer.from_settings(
+            {
+                "steel_database": SteelDatabase.Type350MPa.value,
+                "timber_database": TimberDatabase.Athena2021.value,
+                "concrete_database": ConcreteDatabase.GulLowAir.value,
+                "country": "CAN",
+                "custom_reinforcement_rates": REINFORCEMENT_RATES,
+            },
+            buffered_logging=True,
+            background_log_writer=True,
+        )
+        emitted = []
+        monkeypatch.setattr(
+            analyzer.logger, "_emit", lambda *args, **kw: emitted.append(kw)
+        )
+        analyzer.analyze_model(build_model())
+        analyzer.logger.close()
+
+        counts = analyzer.logger.get_category_summary()
+        assert len(emitted) == sum(
+            summary["count"]
+            for categories in counts.values()
+            for summary in categories.values()
+        )
+        assert analyzer.logger.dropped_events == 0
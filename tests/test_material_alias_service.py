@@ -0,0 +1,92 @@
+import random
+from typing import Dict, List
+
+import pytest
+
+from src.domain.carbon.material_alias_service import MaterialAliasService
+
+
+def _legacy_normalize(name: str, aliases: Dict[str, List[str]]) -> str:
+    """The nested-loop normalization used before the compiled matcher."""
+    name = name.lower().strip()
+
+    if any(
+        steel_name in name
+        for steel_name in [
+            "345 mpa",
+            "350w",
+            "steel 345",
+            "default_steel",
+            "Steel ASTM A500B-42",
+        ]
+    ):
+        return "Hot Rolled"
+
+    for standard_name in aliases.keys():
+        if standard_name.lower() == name:
+            return standard_name
+
+    for standard_name in aliases.keys():
+        if standard_name.lower() in name:
+            return standard_name
+
+    for standard_name, variations in aliases.items():
+        for variation in variations:
+            if variation.lower() == name or variation.lower() in name:
+                return standard_name
+
+    return name
+
+
+def _names(aliases: Dict[str, List[str]], seed: int = 7) -> List[str]:
+    """Material names built from every alias table entry, alone and combined."""
+    words = list(aliases)
+    words += [v for variations in aliases.values() for v in variations]
+    words += ["350W", "Steel 345", "default_steel", "FE_", "Unknown", "(1)", " "]
+    rng = random.Random(seed)
+    names = [w for w in words] + [w.upper() for w in words]
+    for _ in range(500):
+        parts = rng.sample(words, rng.randint(1, 3))
+        names.append(rng.choice([" ", "", "-", " - "]).join(parts))
+    return names
+
+
+class TestMaterialAliasService:
+    """Test suite for the compiled alias matcher"""
+
+    @pytest.fixture
+    def service(self):
+        """Create and return an alias service instance"""
+        return MaterialAliasService()
+
+    @pytest.mark.parametrize(
+        "table, normalize",
+        [
+            ("_timber_aliases", "normalize_timber_name"),
+            ("_steel_aliases", "normalize_steel_name"),
+            ("_concrete_aliases", "normalize_concrete_name"),
+        ],
+    )
+    def test_matches_legacy_normalization(self, service, table, normalize):
+        """Test that the matcher resolves names exactly like the old loops"""
+        aliases = getattr(service, table)
+        for name in _names({**service._timber_aliases, **service._steel_aliases}):
+            if "steel astm a500b-42" in name.lower():
+                continue
+            assert getattr(service, normalize)(name) == _legacy_normalize(
+                name, aliases
+            ), name
+
+    def test_priority_order(self, service):
+        """Test that earlier rules win regardless of position in the name"""
+        # Standard name substrings beat variations appearing earlier
+        assert service.normalize_timber_name("osb clt") == "clt"
+        # Standard names are matched case-insensitively and returned as listed
+        assert service.normalize_timber_name("  Softwood Lumber ") == "softwood lumber"
+        # Hot Rolled names beat everything
+        assert service.normalize_timber_name("CLT 350W") == "Hot Rolled"
+
+    def test_mixed_case_special_name_matches(self, service):
+        """Test that the ASTM A500B-42 special case now matches"""
+        assert service.normalize_timber_name("Steel ASTM A500B-42") == "Hot Rolled"
+        assert service.normalize_steel_name("steel astm a500b-42 hss") == "Hot Rolled"
@@ -0,0 +1,58 @@
+import pytest
+
+from src.domain.types import MaterialType
+from src.services.material_processor import MaterialProcessor
+
+
+def _raw_material(name, volume, structural_asset=None, density=None, strength=None):
+    material = {"materialName": name, "volume": {"value": volume}}
+    if structural_asset is not None:
+        material["structuralAsset"] = structural_asset
+    if density is not None:
+        material["density"] = {"value": density}
+    if strength is not None:
+        material["compressiveStrength"] = {"value": strength}
+    return material
+
+
+class TestMaterialProcessor:
+    """Test suite for MaterialProcessor and its classification memo"""
+
+    @pytest.fixture
+    def processor(self):
+        """Create and return a processor instance"""
+        return MaterialProcessor()
+
+    def test_only_volume_varies_per_entry(self, processor):
+        """Test that repeated materials reuse the classification"""
+        first = processor.process_material(
+            _raw_material("Steel Beam", 2.0, "350W", density=7850.0)
+        )
+        second = processor.process_material(
+            _raw_material("Steel Beam", 3.0, "350W", density=7850.0)
+        )
+
+        assert first.type == second.type == MaterialType.METAL
+        assert first.grade == second.grade == "350W"
+        assert first.mass == 2.0 * 7850.0
+        assert second.mass == 3.0 * 7850.0
+        assert second.properties.volume == 3.0
+        assert processor.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_identity_fields_split_signatures(self, processor):
+        """Test that a structural asset changes the classification"""
+        high_grade = processor.process_material(
+            _raw_material("Concrete", 1.0, "Concrete", strength=35000.0)
+        )
+        low_grade = processor.process_material(_raw_material("Concrete", 1.0))
+
+        assert high_grade.grade == str(35000.0 * 0.001)
+        assert low_grade.grade == MaterialProcessor.DEFAULT_CONCRETE_GRADE
+        assert processor.stats()["misses"] == 2
+
+    def test_failed_classification_is_memoized(self, processor):
+        """Test that unknown materials keep raising from the memo"""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Unknown material type: Gypsum"):
+                processor.process_material(_raw_material("Gypsum", 1.0))
+        assert processor.stats() == {"hits": 1, "misses": 1, "size": 1}
@@ -0,0 +1,105 @@
+from specklepy.api import operations
+from specklepy.logging import metrics
+from specklepy.objects import Base
+from specklepy.transports.memory import MemoryTransport
+
+from src.services.carbon_rollup import CarbonRollup
+from src.services.incremental_index import (
+    IncrementalIndex,
+    RunRecordBuilder,
+    embodied_carbon_block,
+    settings_key,
+)
+from src.services.model_traversal import ModelTraversal
+from src.services.overlay_output import OverlayBuilder
+from tests.test_analyzer import build_analyzer, build_model
+
+SETTINGS_KEY = settings_key({"country": "CAN"})
+
+
+def _run(model, keep_blocks=False):
+    overlay, rollup = OverlayBuilder(), CarbonRollup()
+    run_record = RunRecordBuilder(keep_blocks=keep_blocks)
+    build_analyzer().analyze_model(model, consumers=[overlay, run_record, rollup])
+    return overlay, run_record, rollup
+
+
+def _sent_size(root):
+    transport = MemoryTransport()
+    operations.send(root, [transport], use_default_cache=False)
+    return sum(map(len, transport.objects.values()))
+
+
+class TestOverlayOutput:
+    """Test suite for the results-only overlay version"""
+
+    def test_overlay_references_source_elements(self):
+        """Test that each calculated element has one overlay object"""
+        model = build_model()
+        model.elements[0].applicationId = "revit-slab"
+        overlay, run_record, _ = _run(model)
+
+        assert len(overlay.elements) == 3
+        # Only the processed slab and beam are recorded for reuse
+        assert len(run_record.elements) == 2
+        slab = overlay.elements[0]
+        assert (slab.sourceId, slab.applicationId) == ("slab", "revit-slab")
+        assert embodied_carbon_block(slab) is embodied_carbon_block(model.elements[0])
+
+    def test_rollup_collections(self):
+        """Test that the rollups are added as collections of group totals"""
+        overlay, _, rollup = _run(build_model())
+        root = overlay.build("model_embodied_carbon", rollup)
+
+        elements, rollups = root["@elements"]
+        assert elements["@elements"] == overlay.elements
+        by_level = rollups["@elements"][0]
+        assert by_level.name == "By Level"
+        (level,) = by_level["@elements"]
+        assert level.level == "Level 1"
+        assert level.totalCarbon == rollup.total().total_carbon
+        # Only the overlay objects carry carbon blocks
+        blocks = [embodied_carbon_block(e) for e in ModelTraversal().iterate(root)]
+        assert sum(block is not None for block in blocks) == 3
+
+    def test_overlay_feeds_incremental_runs(self):
+        """Test that a received overlay indexes the same results as the model"""
+        metrics.disable()
+        model = build_model()
+        overlay, run_record, rollup = _run(model)
+        root = overlay.build("model_embodied_carbon", rollup)
+        run_record.attach_to(root, SETTINGS_KEY)
+        full_model = build_model()
+        _, full_run_record, _ = _run(full_model, keep_blocks=True)
+        full_run_record.attach_to(full_model, SETTINGS_KEY)
+
+        received = operations.deserialize(operations.serialize(root))
+        index = IncrementalIndex.from_output_root(received, SETTINGS_KEY)
+        full_index = IncrementalIndex.from_output_root(full_model, SETTINGS_KEY)
+        assert len(index) == len(full_index) == 2
+        assert index.reuse(model.elements[0]) == full_index.reuse(model.elements[0])
+
+    def test_overlay_run_record_holds_no_blocks(self):
+        """Test that the record of an overlay points to the blocks it uploads"""
+        metrics.disable()
+        overlay, run_record, rollup = _run(build_model())
+        root = overlay.build("model_embodied_carbon", rollup)
+        size = _sent_size(root)
+        run_record.attach_to(root, SETTINGS_KEY)
+
+        assert not run_record.blocks
+        assert all("block" not in entry for entry in run_record.elements)
+        assert _sent_size(root) - size < 1000
+
+    def test_overlay_is_independent_of_geometry(self):
+        """Test that the overlay upload doesn't grow with element geometry"""
+        metrics.disable()
+        model = build_model()
+        for offset, element in enumerate(model.elements):
+            mesh = Base()
+            mesh.vertices = [float(offset + i) for i in range(3000)]
+            element["@displayValue"] = [mesh]
+        overlay, _, rollup = _run(model)
+
+        overlay_size = _sent_size(overlay.build("model_embodied_carbon", rollup))
+        assert overlay_size * 10 < _sent_size(model)
@@ -0,0 +1,56 @@
+from specklepy.objects import Base
+
+from src.domain.types import CarbonResult
+from src.services.pdf_report import summary_rows, write_pdf_report
+from src.services.result_consumers import PdfRowBuilder
+
+HEADER = list(PdfRowBuilder.HEADER)
+
+
+def _page_count(path) -> int:
+    return path.read_bytes().count(b"/Type /Page\n")
+
+
+def _element(element_id):
+    element = Base()
+    element.properties = Base()
+    element.properties.elementId = element_id
+    return element
+
+
+class TestPdfReport:
+    """Test suite for the PDF report"""
+
+    def test_one_table_per_page(self, tmp_path):
+        """Test that every page holds one table of element rows"""
+        path = tmp_path / "report.pdf"
+        rows = [HEADER] + [[str(i), "Concrete", "1.00 kgCO₂e"] for i in range(340)]
+        write_pdf_report(str(path), rows, rows_per_table=34)
+        assert _page_count(path) == 10
+
+    def test_summary_only_report(self, tmp_path):
+        """Test that a report without element rows is a single summary page"""
+        path = tmp_path / "report.pdf"
+        results = {
+            "success_count": 3,
+            "skipped_count": 1,
+            "warning_count": 0,
+            "error_count": 0,
+            "total_carbon": 12.5,
+        }
+        write_pdf_report(
+            str(path), [HEADER], summary=summary_rows(results), omitted_rows=3
+        )
+        assert _page_count(path) == 1
+
+    def test_row_limit(self):
+        """Test that rows past the limit are only counted"""
+        builder = PdfRowBuilder(max_rows=2)
+        result = CarbonResult(factor=1.0, total_carbon=1.0, category="Wood")
+        for element_id in "abc":
+            builder.consume(
+                _element(element_id),
+                {"carbon_results": {"CLT": result, "Stud": result}},
+            )
+        assert [row[:2] for row in builder.rows[1:]] == [["a", "CLT"], ["a", "Stud"]]
+        assert builder.omitted_rows == 4
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from main import FunctionInputs, NEXT_GEN_REQUIRED_MESSAGE, automate_function
+
+
+class _FakeContext:
+    """Automation context that fails the test if the model is downloaded."""
+
+    def __init__(self, source_application):
+        payload = SimpleNamespace(version_id="version")
+        self.automation_run_data = SimpleNamespace(
+            project_id="project", triggers=[SimpleNamespace(payload=payload)]
+        )
+        commit = SimpleNamespace(
+            sourceApplication=source_application,
+            referencedObject="root",
+            branchName="main",
+        )
+        self.speckle_client = SimpleNamespace(
+            commit=SimpleNamespace(get=lambda project_id, version_id: commit)
+        )
+        self.failures = []
+
+    def receive_version(self):
+        raise AssertionError("The model must not be received")
+
+    def mark_run_failed(self, message):
+        self.failures.append(message)
+
+
+class TestPreflight:
+    """Test suite for rejecting runs before the model is received"""
+
+    def test_non_revit_source_is_rejected(self):
+        """Test that the source application is checked from the metadata"""
+        context = _FakeContext("Rhino7")
+        automate_function(context, FunctionInputs())
+        assert context.failures == ["Model must be from Revit"]
+
+    def test_v2_root_is_rejected(self, monkeypatch):
+        """Test that the connector version is checked from the root object"""
+        fetched = []
+
+        def fetch_root_object(automate_context, object_id):
+            fetched.append(object_id)
+            return {"id": object_id, "version": 2}
+
+        monkeypatch.setattr(main, "_fetch_root_object", fetch_root_object)
+        context = _FakeContext("Revit2024")
+        automate_function(context, FunctionInputs())
+        assert fetched == ["root"]
+        assert context.failures == [NEXT_GEN_REQUIRED_MESSAGE]
+
+    @pytest.mark.parametrize("root", [{"version": 3}, SimpleNamespace(version=3)])
+    def test_v3_root_is_valid(self, root):
+        """Test that raw and received v3 roots are both accepted"""
+        assert main._validate_next_gen(root)
@@ -0,0 +1,96 @@
+import pytest
+
+from src.services.result_attachments import AttachmentDispatcher
+from src.services.result_consumers import AttachmentPayloadBuilder
+from tests.test_analyzer import build_analyzer, build_model
+
+
+class _FakeContext:
+    """Records the result cases an AutomationContext would report."""
+
+    def __init__(self):
+        self.cases = []
+
+    def _attach(self, level, category, object_ids, message=None, metadata=None):
+        if not object_ids:
+            raise ValueError("Need at least one object_id")
+        self.cases.append((level, category, list(object_ids), metadata))
+
+    def attach_success_to_objects(self, **kwargs):
+        self._attach("success", **kwargs)
+
+    def attach_info_to_objects(self, **kwargs):
+        self._attach("info", **kwargs)
+
+    def attach_warning_to_objects(self, **kwargs):
+        self._attach("warning", **kwargs)
+
+    def attach_error_to_objects(self, **kwargs):
+        self._attach("error", **kwargs)
+
+    def ids(self, level):
+        return [i for case in self.cases if case[0] == level for i in case[2]]
+
+
+def _payload(processed=0, errors=0):
+    payload = AttachmentPayloadBuilder()
+    for i in range(processed):
+        payload.consume(
+            None, {"id": f"p{i:04d}", "status": "processed", "total_carbon": i / 3}
+        )
+    for i in range(errors):
+        payload.consume(None, {"id": f"e{i:04d}", "status": "error"})
+    return payload
+
+
+class TestAttachmentDispatcher:
+    """Test suite for attaching element ids to the run"""
+
+    def test_model_results(self):
+        """Test that every bucket of an analyzed model is attached once"""
+        payload = AttachmentPayloadBuilder()
+        build_analyzer().analyze_model(build_model(), consumers=[payload])
+        context = _FakeContext()
+
+        assert AttachmentDispatcher().dispatch(context, payload) == 4
+        for level, bucket in [
+            ("success", "processed_elements"),
+            ("info", "skipped_elements"),
+            ("warning", "warning_elements"),
+            ("error", "errors"),
+        ]:
+            assert context.ids(level) == payload.object_ids[bucket]
+
+        (success,) = [case for case in context.cases if case[0] == "success"]
+        assert success[3]["gradient"] is True
+        gradient_values = success[3]["gradientValues"]
+        assert gradient_values.keys() == payload.gradient_values.keys()
+        for object_id, value in payload.gradient_values.items():
+            assert gradient_values[object_id]["gradientValue"] == pytest.approx(
+                value["gradientValue"], rel=1e-6
+            )
+
+    def test_one_case_per_bucket(self):
+        """Test that large buckets are attached as a single case each, in order"""
+        payload = _payload(processed=1000, errors=500)
+        context = _FakeContext()
+
+        assert AttachmentDispatcher().dispatch(context, payload) == 2
+        assert [case[0] for case in context.cases] == ["success", "error"]
+        assert context.ids("success") == payload.object_ids["processed_elements"]
+        assert context.ids("error") == payload.object_ids["errors"]
+        metadata = context.cases[0][3]
+        assert list(metadata["gradientValues"]) == context.ids("success")
+
+    def test_gradient_values_are_compact(self):
+        """Test that gradient values are rounded to a few significant digits"""
+        context = _FakeContext()
+        AttachmentDispatcher().dispatch(context, _payload(processed=3))
+        values = context.cases[0][3]["gradientValues"]
+        assert values["p0002"] == {"gradientValue": 0.666667}
+
+    def test_nothing_to_attach(self):
+        """Test that empty buckets aren't attached"""
+        context = _FakeContext()
+        assert AttachmentDispatcher().dispatch(context, _payload()) == 0
+        assert context.cases == []
@@ -0,0 +1,106 @@
+import csv
+import json
+import os
+
+import pytest
+
+from src.infrastructure.logging import Logging
+from src.services import results_artifact
+from src.services.results_artifact import (
+    ARTIFACT_COLUMNS,
+    ResultsArtifactWriter,
+    ResultsFormat,
+    parquet_available,
+)
+from src.services.result_consumers import ResultConsumer
+from tests.test_analyzer import build_analyzer, build_model
+
+
+class FailingConsumer(ResultConsumer):
+    """Fails the analysis once the first element was consumed"""
+
+    def consume(self, element, element_result):
+        raise RuntimeError("analysis failed")
+
+
+def _write(tmp_path, results_format):
+    writer = ResultsArtifactWriter(str(tmp_path / "results"), results_format)
+    build_analyzer().analyze_model(build_model(), consumers=[writer])
+    return writer
+
+
+class TestResultsArtifactWriter:
+    """Test suite for the per-material results artifact"""
+
+    def test_jsonl(self, tmp_path):
+        """Test that every calculated material is written as a JSON line"""
+        writer = _write(tmp_path, ResultsFormat.JSONL)
+        with open(writer.file_name, encoding="utf-8") as file:
+            rows = [json.loads(line) for line in file]
+
+        assert writer.file_name.endswith("results.jsonl")
+        assert len(rows) == writer.row_count
+        slab = next(row for row in rows if row["material"] == "Concrete")
+        assert list(slab) == ARTIFACT_COLUMNS
+        assert slab["status"] == "processed"
+        assert slab["category"] == "Slabs"
+        assert slab["quantity_units"] == "m³"
+        assert slab["concrete_volume"] == 2.0
+        # Warning elements keep the materials that could be calculated
+        assert {row["status"] for row in rows} == {"processed", "warning"}
+
+    def test_csv(self, tmp_path):
+        """Test that the CSV artifact has a header and one row per material"""
+        writer = _write(tmp_path, ResultsFormat.CSV)
+        with open(writer.file_name, encoding="utf-8", newline="") as file:
+            rows = list(csv.DictReader(file))
+
+        assert len(rows) == writer.row_count
+        assert rows[0].keys() == set(ARTIFACT_COLUMNS)
+
+    def test_parquet(self, tmp_path):
+        """Test the Parquet artifact, or its CSV fallback without pyarrow"""
+        writer = _write(tmp_path, ResultsFormat.PARQUET)
+        if not parquet_available():
+            assert writer.results_format == ResultsFormat.CSV
+            return
+
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pq.read_table(writer.file_name)
+        assert table.column_names == ARTIFACT_COLUMNS
+        assert table.num_rows == writer.row_count
+
+    def test_parquet_fallback_is_logged(self, tmp_path, monkeypatch):
+        """Test that falling back to CSV without pyarrow is reported"""
+        monkeypatch.setattr(results_artifact, "parquet_available", lambda: False)
+        logger = Logging()
+        writer = ResultsArtifactWriter(
+            str(tmp_path / "results"), ResultsFormat.PARQUET, logger
+        )
+
+        assert writer.results_format == ResultsFormat.CSV
+        assert writer.file_name.endswith("results.csv")
+        assert logger.get_warnings_summary() == {
+            "Results Artifact": [str(tmp_path / "results")]
+        }
+
+    def test_file_is_opened_on_the_first_row(self, tmp_path):
+        """Test that nothing is written before the traversal produces rows"""
+        writer = ResultsArtifactWriter(str(tmp_path / "results"), ResultsFormat.CSV)
+        assert not os.path.exists(writer.file_name)
+
+        writer.finalize({})
+        with open(writer.file_name, encoding="utf-8", newline="") as file:
+            assert next(csv.reader(file)) == ARTIFACT_COLUMNS
+
+    def test_failed_analysis_leaves_no_file(self, tmp_path):
+        """Test that a discarded artifact is closed and removed"""
+        writer = ResultsArtifactWriter(str(tmp_path / "results"), ResultsFormat.JSONL)
+        with pytest.raises(RuntimeError):
+            build_analyzer().analyze_model(
+                build_model(), consumers=[writer, FailingConsumer()]
+            )
+        assert os.path.exists(writer.file_name)
+
+        writer.discard()
+        assert not os.path.exists(writer.file_name)
@@ -0,0 +1,38 @@
+from src.services.model_traversal import ModelTraversal
+from tests.benchmarks.synthetic_model import generate_model
+from tests.test_analyzer import build_analyzer
+
+
+class TestSyntheticModel:
+    """Test suite for the synthetic benchmark models"""
+
+    def test_knobs(self):
+        """Test element count, nesting depth and name diversity"""
+        model = generate_model(500, depth=4, name_diversity=3, seed=1)
+        nodes = list(ModelTraversal().iterate_with_context(model))
+        leaves = [n for n in nodes if n.element.id.startswith("element-")]
+        assert len(leaves) == 500
+        assert {n.depth for n in leaves} == {4}
+
+        names = {
+            material["materialName"]
+            for n in leaves
+            for material in n.element.properties.get("Material Quantities", {}).values()
+        }
+        assert "CLT Panel (2)" in names
+
+    def test_result_shares(self):
+        """Test that the invalid and skipped shares show up in the results"""
+        model = generate_model(1000, invalid_share=0.2, skipped_share=0.1)
+        results = build_analyzer().analyze_model(model)
+        assert 50 < len(results["skipped_elements"]) < 150
+        assert 50 < len(results["errors"]) < 150
+        assert len(results["processed_elements"]) > 500
+
+    def test_deterministic(self):
+        """Test that a seed always generates the same model"""
+        first = generate_model(50, depth=1, seed=3)
+        second = generate_model(50, depth=1, seed=3)
+        assert [e.properties for e in first.elements] == [
+            e.properties for e in second.elements
+        ]
@@ -0,0 +1,75 @@
+import sys
+
+import pytest
+from specklepy.objects import Base
+
+from src.services.model_traversal import ModelTraversal, TraversalOrder
+
+
+def _node(name, children=None, detached=False):
+    base = Base()
+    base.name = name
+    if children is not None:
+        if detached:
+            base["@elements"] = children
+        else:
+            base.elements = children
+    return base
+
+
+def _recursive_iterate(base):
+    """The recursive generator the traversal engine replaced."""
+    elements = getattr(base, "elements", getattr(base, "@elements", None))
+    if elements is not None:
+        for element in elements:
+            yield from _recursive_iterate(element)
+    yield base
+
+
+class TestModelTraversal:
+    """Test suite for the explicit-stack ModelTraversal"""
+
+    @pytest.fixture
+    def model(self):
+        """Create a small nested model"""
+        return _node(
+            "root",
+            [
+                _node("a", [_node("a1"), _node("a2", [])]),
+                _node("b", [_node("b1", [_node("b1x")])], detached=True),
+                _node("c"),
+            ],
+        )
+
+    def test_post_order_matches_recursive_iteration(self, model):
+        """Test that the default order is the one the analyzer always used"""
+        expected = [e.name for e in _recursive_iterate(model)]
+        assert [e.name for e in ModelTraversal().iterate(model)] == expected
+
+    def test_pre_order(self, model):
+        """Test that pre-order yields parents before children"""
+        names = [e.name for e in ModelTraversal(TraversalOrder.PRE).iterate(model)]
+        assert names == ["root", "a", "a1", "a2", "b", "b1", "b1x", "c"]
+
+    def test_depth_and_parent(self, model):
+        """Test that context nodes report depth and parent"""
+        nodes = {
+            n.element.name: n
+            for n in ModelTraversal(TraversalOrder.PRE).iterate_with_context(model)
+        }
+        assert nodes["root"].depth == 0 and nodes["root"].parent is None
+        assert nodes["b1x"].depth == 3
+        assert nodes["b1x"].parent is nodes["b1"].element
+
+    def test_deep_nesting_does_not_hit_recursion_limit(self):
+        """Test trees deeper than the interpreter recursion limit"""
+        depth = sys.getrecursionlimit() + 100
+        root = leaf = _node("0")
+        for i in range(1, depth):
+            child = _node(str(i))
+            leaf.elements = [child]
+            leaf = child
+
+        names = [e.name for e in ModelTraversal().iterate(root)]
+        assert len(names) == depth
+        assert names[0] == str(depth - 1) and names[-1] == "0"
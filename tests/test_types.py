@@ -0,0 +1,40 @@
+from src.domain.types import (
+    BuildingElement,
+    CarbonResult,
+    ConcreteCarbonResult,
+    ElementCategory,
+    intern_string,
+)
+
+
+class TestDomainTypes:
+    """Test suite for the compact domain types"""
+
+    def test_types_are_slotted(self):
+        """Test that instances don't carry a __dict__"""
+        element = BuildingElement(
+            id="1", level="Level 1", category=ElementCategory.SLAB, materials=[]
+        )
+        result = CarbonResult(factor=1.0, total_carbon=2.0, category="Wood")
+        assert not hasattr(element, "__dict__")
+        assert not hasattr(result, "__dict__")
+
+    def test_concrete_fields_read_as_none_on_other_results(self):
+        """Test that all results keep the concrete attribute API"""
+        wood = CarbonResult(factor=1.0, total_carbon=2.0, category="Wood")
+        concrete = ConcreteCarbonResult(
+            factor=1.0, total_carbon=2.0, category="Concrete", concrete_volume=3.0
+        )
+        assert wood.concrete_volume is None
+        assert wood.reinforcement_carbon is None
+        assert concrete.concrete_volume == 3.0
+        assert isinstance(concrete, CarbonResult)
+        assert concrete != CarbonResult(
+            factor=1.0, total_carbon=2.0, category="Concrete"
+        )
+
+    def test_intern_string(self):
+        """Test that equal strings become one object and other values pass"""
+        level = "".join(["Level ", "1"])
+        assert intern_string(level) is intern_string("Level 1")
+        assert intern_string(None) is None